@@ -0,0 +1,150 @@
+"""
+진입 스크립트 시작(import) 시간 벤치마크
+- 진입 스크립트를 새 인터프리터에서 `python -X importtime`으로 import해서 누적 import 시간 측정
+- 반복 실행의 중앙값이 예산을 넘거나, 해당 단계 전에는 로드하면 안 되는 무거운 모듈이
+  시작 시점에 로드되면 종료 코드 1 (회귀 감지용)
+
+사용법:
+    python -m bench.bench_import_time
+    python -m bench.bench_import_time --runs 10 --top 15
+    python -m bench.bench_import_time --budget daily_briefing=200
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 진입 스크립트별 import 시간 예산 (ms, 중앙값 기준)
+# (측정 중앙값 약 175~220ms + 작은 여유, 시간 대부분은 모든 실행에 필요한 requests/urllib3/certifi 로드 약 130ms)
+IMPORT_BUDGETS_MS = {
+    "daily_briefing": 230,
+    "daily_briefing_sanggyun": 230,
+    "get_tigris_and_put_team_cal": 230,
+}
+
+# 시작 시점에 로드되면 안 되는 모듈 (캘린더 조회, Slack 전송, 날씨 전망, 특일/격자 색인 로드 단계에서만 로드)
+DEFERRED_MODULES = [
+    "numpy",
+    "bs4",
+    "pytz",
+    "googleapiclient",
+    "httplib2",
+    "google_auth_oauthlib",
+    "google.oauth2",
+    "slack_sdk",
+    "xml.etree",
+    "pickle",
+]
+
+
+def parse_importtime(output: str) -> list:
+    """
+    `-X importtime` 출력 파싱
+    Args:
+        output: 인터프리터 stderr
+    Returns:
+        [{"module", "self_us", "cumulative_us"}, ...] (import 완료 순서)
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 헤더 줄
+        modules.append({
+            "module": fields[2].strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return modules
+
+
+def measure_import(module: str) -> dict:
+    """
+    새 인터프리터에서 모듈 하나를 import하고 시간 측정
+    Args:
+        module: import할 모듈 이름
+    Returns:
+        {"total_ms": 모듈 누적 import 시간, "modules": parse_importtime 결과}
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    entry = next(m for m in reversed(modules) if m["module"] == module)
+    return {"total_ms": entry["cumulative_us"] / 1000, "modules": modules}
+
+
+def find_deferred(modules: list) -> list:
+    """
+    시작 시점에 로드된 DEFERRED_MODULES 목록
+    Args:
+        modules: parse_importtime 결과
+    Returns:
+        로드된 모듈 이름 리스트
+    """
+    loaded = {m["module"] for m in modules}
+    return [name for name in DEFERRED_MODULES
+            if any(m == name or m.startswith(name + ".") for m in loaded)]
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='진입 스크립트 import 시간 벤치마크')
+    parser.add_argument('--runs', type=int, default=5, help='스크립트별 반복 횟수')
+    parser.add_argument('--module', action='append', help='측정할 모듈 (기본: 예산이 있는 전체)')
+    parser.add_argument('--budget', action='append', metavar='NAME=MS', help='모듈별 예산 변경 (ms)')
+    parser.add_argument('--top', type=int, default=10, help='가장 오래 걸린 import 출력 개수')
+    args = parser.parse_args()
+
+    budgets = dict(IMPORT_BUDGETS_MS)
+    for value in args.budget or []:
+        name, _, ms = value.partition("=")
+        budgets[name] = float(ms)
+    modules = args.module or list(budgets)
+
+    print("=== 진입 스크립트 import 시간 ===\n")
+    print(f"{'module':<26} {'runs':>5} {'p50(ms)':>8} {'max(ms)':>8} {'budget':>8}  결과")
+
+    failed = []
+    slowest = {}
+    for module in modules:
+        totals = []
+        deferred = set()
+        for _ in range(args.runs):
+            measured = measure_import(module)
+            totals.append(measured["total_ms"])
+            deferred.update(find_deferred(measured["modules"]))
+            slowest[module] = measured["modules"]
+        totals.sort()
+        p50 = totals[len(totals) // 2]
+        budget = budgets.get(module)
+
+        problems = []
+        if budget is not None and p50 > budget:
+            problems.append("예산 초과")
+        if deferred:
+            problems.append(f"시작 시 로드: {', '.join(sorted(deferred))}")
+        if problems:
+            failed.append(module)
+        budget_str = f"{budget:g}" if budget is not None else "-"
+        print(f"{module:<26} {args.runs:>5} {p50:>8.1f} {totals[-1]:>8.1f} {budget_str:>8}  "
+              f"{'; '.join(problems) or 'ok'}")
+
+    for module, measured in slowest.items():
+        print(f"\n--- {module}: self 시간 상위 {args.top}개 ---")
+        for m in sorted(measured, key=lambda m: m["self_us"], reverse=True)[:args.top]:
+            print(f"  {m['self_us'] / 1000:>7.1f}ms  {m['module']}")
+
+    if failed:
+        print(f"\nimport 시간 회귀: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+오프라인 파이프라인 벤치마크
+- bench/stub_servers.py의 대체 서버를 띄우고 모든 upstream 주소를 대체 서버로 변경
+- daily_briefing.main, get_tigris_and_put_team_cal.main을 end-to-end로 반복 실행
+- 시나리오별 처리량(runs/s)과 지연시간(p50/p95/max), 단계별 p50/p95 출력
+- --max-p95를 넘으면 종료 코드 1 (회귀 감지용)
+
+사용법:
+    python -m bench.bench_pipeline --runs 10
+    python -m bench.bench_pipeline --runs 20 --latency 0.05 --upstream-latency ollama=1.5
+    python -m bench.bench_pipeline --failure-rate airkorea=0.3 --max-p95 3.0
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import daily_briefing
+import get_tigris_and_put_team_cal as tigris_cal
+import util.air_quality
+import util.cache
+import util.calendar_client
+import util.clients
+import util.snapshot
+import util.todayinfo
+import util.trace
+import util.useless_fact
+import util.weather
+from bench.stub_servers import start_stub_servers
+
+
+def build_stub_calendar_service(url: str):
+    """
+    대체 서버를 가리키는 Google Calendar 서비스 생성 (인증/discovery 네트워크 요청 없음)
+    Args:
+        url: calendar 대체 서버 주소
+    Returns:
+        Google Calendar 서비스 객체
+    """
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.http import BatchHttpRequest
+    service = build_from_document(util.calendar_client.get_discovery_document(), http=httplib2.Http(),
+                                  client_options={"api_endpoint": f"{url}/"})
+    # batch 주소는 discovery 문서의 rootUrl로 만들어지므로 대체 서버로 변경
+    service.new_batch_http_request = lambda callback=None: BatchHttpRequest(
+        callback=callback, batch_uri=f"{url}/batch/calendar/v3")
+    return service
+
+
+def point_to_stubs(servers: dict, work_dir: str):
+    """
+    모든 upstream 주소/경로를 대체 서버와 임시 디렉토리로 변경
+    Args:
+        servers: start_stub_servers 결과
+        work_dir: credential/DB/trace를 둘 임시 디렉토리
+    """
+    util.weather.api_url = f"{servers['kma'].url}/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+    util.weather.ultra_ncst_url = f"{servers['kma'].url}/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+    util.weather.ultra_fcst_url = f"{servers['kma'].url}/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
+    util.air_quality.api_url = (f"{servers['airkorea'].url}"
+                                "/B552584/ArpltnInforInqireSvc/getMsrstnAcctoRltmMesureDnsty")
+    util.air_quality.sido_url = (f"{servers['airkorea'].url}"
+                                 "/B552584/ArpltnInforInqireSvc/getCtprvnRltmMesureDnsty")
+    util.air_quality.station_list_url = f"{servers['airkorea'].url}/B552584/MsrstnInfoInqireSvc/getMsrstnList"
+    util.todayinfo.BASE_URL = f"{servers['special_day'].url}/B090041/openapi/service/SpcdeInfoService"
+    util.useless_fact.BASE_URL = f"{servers['fact'].url}/api/v2/facts"
+    util.trace.TRACE_DIR = os.path.join(work_dir, "traces")
+    util.snapshot.SNAPSHOT_DIR = os.path.join(work_dir, "snapshots")
+    util.cache.CACHE_DIR = os.path.join(work_dir, "cache")
+    daily_briefing.OLLAMA_URL = servers["ollama"].url
+    daily_briefing.ARTIFACT_DIR = os.path.join(work_dir, "artifacts")
+
+    # 프로필별 Slack credential을 대체 서버 주소로 생성
+    daily_briefing.CREDENTIAL_DIR = work_dir
+    credential = {"slack_token": "xoxb-stub", "channel_id": "CSTUB",
+                  "base_url": f"{servers['slack'].url}/api/"}
+    for profile in daily_briefing.load_profiles():
+        for key in ("slack_credential", "slack_credential_test"):
+            if profile.get(key):
+                with open(os.path.join(work_dir, profile[key]), "w") as f:
+                    json.dump(credential, f)
+
+    calendar_url = servers["calendar"].url
+    util.calendar_client.build_service = lambda creds=None: build_stub_calendar_service(calendar_url)
+    util.calendar_client.TOKEN_PATH = os.path.join(work_dir, "token.json")
+    util.clients.reset()
+    tigris_cal.TIGRIS_URL = servers["tigris"].url
+    tigris_cal.SCHEDULES_DB = os.path.join(work_dir, "schedules.db")
+    os.environ.setdefault("TIGRIS_LOGIN_ID", "stub")
+    os.environ.setdefault("TIGRIS_PASSWORD", "stub")
+
+
+def _percentile(values: list, q: float) -> float:
+    """q 분위수 (선형 보간)"""
+    values = sorted(values)
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def run_scenario(name: str, func, runs: int, verbose: bool = False) -> dict:
+    """
+    시나리오를 반복 실행하고 지연시간 측정
+    Args:
+        name: 시나리오 이름
+        func: 인자 없이 호출되는 실행 함수
+        runs: 반복 횟수
+        verbose: 실행 중 출력 표시 여부
+    Returns:
+        {"name", "runs", "errors", "total", "throughput", "p50", "p95", "max"} (초)
+    """
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(runs):
+        run_start = time.perf_counter()
+        try:
+            if verbose:
+                func()
+            else:
+                with redirect_stdout(io.StringIO()):
+                    func()
+        except Exception as e:
+            errors += 1
+            print(f"  [{name}] 실행 실패: {e}")
+        latencies.append(time.perf_counter() - run_start)
+    total = time.perf_counter() - started
+
+    return {
+        "name": name,
+        "runs": runs,
+        "errors": errors,
+        "total": total,
+        "throughput": runs / total if total else 0.0,
+        "p50": _percentile(latencies, 0.5),
+        "p95": _percentile(latencies, 0.95),
+        "max": max(latencies),
+    }
+
+
+def _parse_overrides(values: list) -> dict:
+    """["kma=0.2", "ollama=1.5"] -> {"kma": 0.2, "ollama": 1.5}"""
+    overrides = {}
+    for value in values or []:
+        name, _, number = value.partition("=")
+        overrides[name] = float(number)
+    return overrides
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='오프라인 파이프라인 벤치마크')
+    parser.add_argument('--runs', type=int, default=10, help='시나리오별 반복 횟수')
+    parser.add_argument('--latency', type=float, default=0.02, help='모든 upstream 기본 지연시간 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연시간 무작위 편차 (초)')
+    parser.add_argument('--upstream-latency', action='append', metavar='NAME=SEC',
+                        help='upstream별 지연시간 (kma, airkorea, special_day, fact, ollama, slack, calendar, tigris)')
+    parser.add_argument('--failure-rate', action='append', metavar='NAME=RATE',
+                        help='upstream별 실패 비율 (default=RATE로 전체 지정)')
+    parser.add_argument('--scenario', action='append',
+                        choices=['daily_briefing', 'briefing_prepare', 'briefing_deliver', 'briefing_replay',
+                                 'tigris_sync'],
+                        help='실행할 시나리오 (기본: 전체)')
+    parser.add_argument('--max-p95', type=float, help='시나리오 p95 지연시간 상한 (초, 넘으면 종료 코드 1)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='실행 중 출력 표시')
+    args = parser.parse_args()
+
+    latency = {"default": args.latency, **_parse_overrides(args.upstream_latency)}
+    failure_rate = _parse_overrides(args.failure_rate)
+    scenarios = args.scenario or ['daily_briefing', 'briefing_prepare', 'briefing_deliver', 'briefing_replay',
+                                  'tigris_sync']
+
+    servers = start_stub_servers(latency=latency, failure_rate=failure_rate, jitter=args.jitter)
+    work_dir = tempfile.mkdtemp(prefix="bench_")
+    point_to_stubs(servers, work_dir)
+
+    print("=== 오프라인 파이프라인 벤치마크 ===\n")
+    print(f"반복: {args.runs}회, 지연시간: {latency}, 실패 비율: {failure_rate or '없음'}")
+    print(f"작업 디렉토리: {work_dir}\n")
+
+    def replay_offline():
+        """replay 1회 (특일 캐시가 오래된 상태에서도 upstream 요청이 하나라도 있으면 실패)"""
+        before = {name: server.requests for name, server in servers.items()}
+        refresh_days = util.todayinfo.REFRESH_DAYS
+        util.todayinfo.REFRESH_DAYS = 0
+        try:
+            daily_briefing.main(["--replay", snapshot_date])
+        finally:
+            util.todayinfo.REFRESH_DAYS = refresh_days
+        called = {name: server.requests - before[name] for name, server in servers.items()
+                  if server.requests != before[name]}
+        if called:
+            raise RuntimeError(f"replay 중 upstream 요청: {called}")
+
+    scenario_funcs = {
+        "daily_briefing": lambda: daily_briefing.main(["--force"]),
+        "briefing_prepare": lambda: daily_briefing.main(["--force", "--phase", "prepare"]),
+        "briefing_deliver": lambda: daily_briefing.main(["--force", "--phase", "deliver"]),
+        # 네트워크 없이 생성/Block Kit 변환만 반복 (오늘 스냅샷이 없으면 먼저 한번 실행해서 만듦)
+        "briefing_replay": replay_offline,
+        "tigris_sync": tigris_cal.main,
+    }
+    snapshot_date = time.strftime("%Y-%m-%d")
+    results = []
+    try:
+        if "briefing_replay" in scenarios:
+            try:
+                util.snapshot.load_snapshot(snapshot_date)
+            except FileNotFoundError:
+                with redirect_stdout(io.StringIO()):
+                    daily_briefing.main(["--force"])
+        for name in scenarios:
+            print(f"{name} 실행 중...")
+            results.append(run_scenario(name, scenario_funcs[name], args.runs, args.verbose))
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    print(f"\n{'scenario':<16} {'runs':>5} {'errors':>6} {'runs/s':>8} {'p50(s)':>8} {'p95(s)':>8} {'max(s)':>8}")
+    for r in results:
+        print(f"{r['name']:<16} {r['runs']:>5} {r['errors']:>6} {r['throughput']:>8.2f} "
+              f"{r['p50']:>8.3f} {r['p95']:>8.3f} {r['max']:>8.3f}")
+
+    print(f"\n{'upstream':<12} {'requests':>8} {'failures':>8}")
+    for name, server in servers.items():
+        print(f"{name:<12} {server.requests:>8} {server.failures:>8}")
+
+    if "daily_briefing" in scenarios:
+        stats = util.trace.summarize(args.runs, "daily_briefing")
+        if stats:
+            print("\n=== daily_briefing 단계별 지연시간 ===\n")
+            print(util.trace.format_summary(stats))
+
+    if args.max_p95 is not None:
+        slow = [r["name"] for r in results if r["p95"] > args.max_p95]
+        if slow:
+            print(f"\np95 상한({args.max_p95}s) 초과: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
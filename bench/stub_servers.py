@@ -0,0 +1,441 @@
+"""
+외부 API 대체(stand-in) 서버
+- 기상청 단기예보(getVilageFcst), 에어코리아(측정소별/시도별, 측정소 목록), 특일정보(XML), Useless Fact,
+  Ollama(/api/generate), Slack(chat.postMessage), Google Calendar(events, batch),
+  Tigris(login/schedule/notices)를 로컬 HTTP 서버로 흉내냄
+- 서버별 지연시간(latency, jitter)과 실패 주입(failure_rate) 설정 가능
+"""
+
+import datetime
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubServer:
+    """지연/실패 주입이 가능한 대체 HTTP 서버"""
+
+    def __init__(self, name: str, handler, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, failure_status: int = 503):
+        """
+        초기화
+        Args:
+            name: 서버 이름 (upstream 이름)
+            handler: (method, path, query, body) -> (status, content_type, body) 함수
+            latency: 응답 지연시간 (초)
+            jitter: 지연시간 무작위 편차 (초, 0~jitter 추가)
+            failure_rate: 실패 응답 비율 (0.0~1.0)
+            failure_status: 실패시 응답 HTTP 상태 코드
+        """
+        self.name = name
+        self.handler = handler
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """서버 기본 주소 (끝에 / 없음)"""
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (빈 포트 자동 할당)"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # keep-alive 연결에서 헤더/본문 분할 전송시 Nagle + delayed ACK 지연(~40ms) 방지
+            disable_nagle_algorithm = True
+
+            def _handle(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, content_type, payload = stub.dispatch(method, self.path, body)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name=f"stub-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def dispatch(self, method: str, raw_path: str, body: bytes) -> tuple:
+        """
+        지연/실패 주입 후 handler 호출
+        Returns:
+            (status, content_type, payload bytes)
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if self.failure_rate and random.random() < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            return self.failure_status, "text/plain", b"injected failure"
+
+        parsed = urlparse(raw_path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        try:
+            status, content_type, payload = self.handler(method, parsed.path, query, body)
+        except Exception as e:
+            status, content_type, payload = 500, "text/plain", str(e)
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload, ensure_ascii=False)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return status, content_type, payload
+
+
+JSON = "application/json; charset=utf-8"
+
+
+def _kma_ultra_items(path, base, query, nx, ny):
+    """기상청 초단기실황(getUltraSrtNcst) / 초단기예보(getUltraSrtFcst) items"""
+    # 3의 배수 날짜 오후에는 비 (단기예보 스텁과 같은 규칙)
+    def raining(t):
+        return t.day % 3 == 0 and t.hour in (16, 17, 18)
+
+    if path.endswith("getUltraSrtNcst"):
+        values = {"T1H": "17.3", "RN1": "1.0" if raining(base) else "0", "REH": "60",
+                  "PTY": "1" if raining(base) else "0", "UUU": "1.1", "VVV": "-0.5", "VEC": "290", "WSD": "1.3"}
+        return [{"baseDate": query["base_date"], "baseTime": query["base_time"], "nx": int(nx), "ny": int(ny),
+                 "category": category, "obsrValue": value} for category, value in values.items()]
+
+    items = []
+    for hour in range(1, 7):
+        t = base.replace(minute=0) + datetime.timedelta(hours=hour)
+        fcst = {"baseDate": query["base_date"], "baseTime": query["base_time"],
+                "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H00"), "nx": int(nx), "ny": int(ny)}
+        values = {"T1H": "18", "RN1": "1mm 미만" if raining(t) else "강수없음", "SKY": "4" if raining(t) else "3",
+                  "REH": "60", "PTY": "1" if raining(t) else "0", "LGT": "0", "UUU": "1.1", "VVV": "-0.5",
+                  "VEC": "290", "WSD": "1.3"}
+        items.extend(dict(fcst, category=category, fcstValue=value) for category, value in values.items())
+    return items
+
+
+def kma_handler(method, path, query, body):
+    """기상청 단기예보(getVilageFcst) / 초단기실황·예보(getUltraSrt*) 응답 생성"""
+    base = datetime.datetime.strptime(query["base_date"] + query["base_time"], "%Y%m%d%H%M")
+    nx, ny = query.get("nx", "61"), query.get("ny", "125")
+    if "getUltraSrt" in path:
+        items = _kma_ultra_items(path, base, query, nx, ny)
+        return 200, JSON, {"response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {"dataType": "JSON", "items": {"item": items},
+                     "pageNo": 1, "numOfRows": int(query.get("numOfRows", 10)), "totalCount": len(items)},
+        }}
+
+    items = []
+    for hour in range(1, 73):
+        t = base + datetime.timedelta(hours=hour)
+        fcst = {"baseDate": query["base_date"], "baseTime": query["base_time"],
+                "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H00"),
+                "nx": int(nx), "ny": int(ny)}
+        temp = 15 + 6 * (1 - abs(t.hour - 15) / 12)
+        values = {
+            "TMP": f"{temp:.0f}",
+            "SKY": "1" if t.day % 2 else "3",
+            "PTY": "1" if t.hour in (17, 18) and t.day % 3 == 0 else "0",
+            "POP": "60" if t.hour in (17, 18) and t.day % 3 == 0 else "10",
+            "REH": "55",
+            "PCP": "강수없음",
+            "SNO": "적설없음",
+            "UUU": "1.2",
+            "VVV": "-0.8",
+            "VEC": "300",
+            "WSD": "1.5",
+            "WAV": "0",
+        }
+        if t.hour == 6:
+            values["TMN"] = f"{temp:.1f}"
+        if t.hour == 15:
+            values["TMX"] = f"{temp:.1f}"
+        for category, value in values.items():
+            items.append(dict(fcst, category=category, fcstValue=value))
+
+    rows = int(query.get("numOfRows", 10))
+    page = int(query.get("pageNo", 1))
+    page_items = items[(page - 1) * rows:page * rows]
+    return 200, JSON, {"response": {
+        "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+        "body": {"dataType": "JSON", "items": {"item": page_items},
+                 "pageNo": page, "numOfRows": rows, "totalCount": len(items)},
+    }}
+
+
+# 에어코리아 대체 측정소 (이름, 주소, 위도, 경도)
+AIRKOREA_STATIONS = [
+    ("서초구", "서울 서초구 신반포로15길 16", 37.5045, 126.9945),
+    ("강남구", "서울 강남구 학동로 426", 37.5175, 127.0475),
+    ("중구", "서울 중구 덕수궁길 15", 37.5643, 126.9750),
+    ("수원", "경기 수원시 장안구 경수대로 1067", 37.2956, 127.0121),
+    ("성남", "경기 성남시 분당구 불정로 90", 37.3733, 127.1115),
+    ("좌동", "부산 해운대구 해운대로 1216번길 42", 35.1697, 129.1760),
+    ("광복동", "부산 중구 광복로 55번길 10", 35.0990, 129.0313),
+]
+
+
+def _airkorea_item(station, sido, t, i):
+    """측정소 하나의 측정 item"""
+    return {
+        "stationName": station, "sidoName": sido,
+        "dataTime": t.strftime("%Y-%m-%d %H:%M"),
+        "pm10Value": str(30 + i % 7), "pm10Grade": "2",
+        "pm25Value": str(14 + i % 5), "pm25Grade": "1",
+    }
+
+
+def airkorea_handler(method, path, query, body):
+    """에어코리아 측정소별/시도별 실시간 측정정보, 측정소 목록 응답 생성"""
+    endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+    now = datetime.datetime.now().replace(minute=0, second=0, microsecond=0)
+    if endpoint == "getMsrstnList":
+        items = [{"stationName": name, "addr": addr, "dmX": str(lat), "dmY": str(lon)}
+                 for name, addr, lat, lon in AIRKOREA_STATIONS]
+    elif endpoint == "getCtprvnRltmMesureDnsty":
+        sido = query.get("sidoName", "서울")
+        items = [_airkorea_item(name, sido, now, i)
+                 for i, (name, addr, _, _) in enumerate(AIRKOREA_STATIONS) if addr.split()[0] == sido]
+    else:
+        rows = int(query.get("numOfRows", 1))
+        items = [_airkorea_item(query.get("stationName", "서초구"), query.get("sidoName", "서울"),
+                                now - datetime.timedelta(hours=i), i)
+                 for i in range(rows)]
+    return 200, JSON, {"response": {
+        "header": {"resultCode": "00", "resultMsg": "NORMAL_CODE"},
+        "body": {"items": items, "totalCount": len(items), "pageNo": 1, "numOfRows": len(items)},
+    }}
+
+
+SPECIAL_DAYS = {
+    "getRestDeInfo": [("0101", "1월1일"), ("0301", "삼일절"), ("0505", "어린이날"),
+                      ("0606", "현충일"), ("0815", "광복절"), ("1003", "개천절"),
+                      ("1009", "한글날"), ("1225", "기독탄신일")],
+    "get24DivisionsInfo": [("0105", "소한"), ("0320", "춘분"), ("0621", "하지"),
+                           ("0923", "추분"), ("1023", "상강"), ("1222", "동지")],
+    "getSundryDayInfo": [("0214", "발렌타인데이"), ("1111", "빼빼로데이")],
+}
+
+
+def special_day_handler(method, path, query, body):
+    """특일정보(SpcdeInfoService) XML 응답 생성"""
+    endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+    year = query.get("solYear", str(datetime.date.today().year))
+    month = query.get("solMonth")
+    items = []
+    for mmdd, name in SPECIAL_DAYS.get(endpoint, []):
+        if month and mmdd[:2] != month:
+            continue
+        is_holiday = "Y" if endpoint == "getRestDeInfo" else "N"
+        items.append(f"<item><dateKind>01</dateKind><dateName>{name}</dateName>"
+                     f"<isHoliday>{is_holiday}</isHoliday><locdate>{year}{mmdd}</locdate>"
+                     f"<seq>1</seq></item>")
+    xml = ("<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"yes\"?>"
+           "<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>"
+           f"<body><items>{''.join(items)}</items><numOfRows>100</numOfRows><pageNo>1</pageNo>"
+           f"<totalCount>{len(items)}</totalCount></body></response>")
+    return 200, "application/xml; charset=utf-8", xml
+
+
+def fact_handler(method, path, query, body):
+    """Useless Fact 응답 생성"""
+    return 200, JSON, {"id": "stub", "text": "Honey never spoils.", "source": "stub",
+                       "language": query.get("language", "en")}
+
+
+def ollama_handler(method, path, query, body):
+    """Ollama /api/generate 응답 생성"""
+    request = json.loads(body or b"{}")
+    briefing = {
+        "greeting": "좋은 아침입니다! 오늘도 힘내세요.",
+        "weather": "맑고 선선한 하루가 예상됩니다.",
+        "schedule": "오늘 일정은 팀 회의입니다.",
+        "fact": "꿀은 상하지 않는다고 합니다. 신기하죠?",
+        "closing": "오늘도 좋은 연구 되세요!",
+    }
+    return 200, JSON, {"model": request.get("model"), "response": json.dumps(briefing, ensure_ascii=False),
+                       "done": True, "prompt_eval_count": len(request.get("prompt", "")) // 2}
+
+
+_ts_counter = itertools.count(1)
+
+
+def slack_handler(method, path, query, body):
+    """Slack Web API(chat.postMessage) 응답 생성"""
+    if not path.endswith("chat.postMessage"):
+        return 200, JSON, {"ok": False, "error": "unknown_method"}
+    ts = f"{time.time():.0f}.{next(_ts_counter):06d}"
+    return 200, JSON, {"ok": True, "channel": "CSTUB", "ts": ts, "message": {"ts": ts}}
+
+
+_event_counter = itertools.count(1)
+
+
+def calendar_batch_handler(body: bytes) -> tuple:
+    """
+    Google API batch 요청(multipart/mixed)을 나눠서 calendar_handler로 처리하고 multipart 응답 생성
+    Args:
+        body: batch 요청 본문
+    Returns:
+        (status, content_type, payload)
+    """
+    text = body.decode("utf-8")
+    boundary = text.lstrip().splitlines()[0].strip()
+    parts = []
+    for part in text.split(boundary)[1:]:
+        if part.strip() in ("", "--"):
+            continue
+        headers, _, request = part.strip("\r\n").replace("\r\n", "\n").partition("\n\n")
+        content_id = next((line.split(":", 1)[1].strip() for line in headers.split("\n")
+                           if line.lower().startswith("content-id:")), "<0>")
+        request_line, _, rest = request.partition("\n")
+        inner_method, inner_path = request_line.split()[:2]
+        inner_body = rest.partition("\n\n")[2].encode("utf-8")
+        parsed = urlparse(inner_path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        status, content_type, payload = calendar_handler(inner_method, parsed.path, query, inner_body)
+        parts.append(f"--batch_stub\r\nContent-Type: application/http\r\n"
+                     f"Content-ID: <response-{content_id.strip('<>')}>\r\n\r\n"
+                     f"HTTP/1.1 {status} OK\r\nContent-Type: {content_type}\r\n\r\n"
+                     f"{json.dumps(payload, ensure_ascii=False)}\r\n")
+    return 200, "multipart/mixed; boundary=batch_stub", "".join(parts) + "--batch_stub--\r\n"
+
+
+def calendar_handler(method, path, query, body):
+    """Google Calendar v3 events list(전체/증분 동기화)/insert, batch 응답 생성"""
+    if path.startswith("/batch/"):
+        return calendar_batch_handler(body)
+    if method == "POST":
+        event = json.loads(body or b"{}")
+        event_id = f"stub{next(_event_counter)}"
+        return 200, JSON, dict(event, id=event_id, htmlLink=f"https://calendar.example/{event_id}")
+
+    sync_token = query.get("syncToken")
+    if sync_token == "expired":
+        return 410, JSON, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required."}}
+    if sync_token:
+        # 증분 동기화: 바뀐 일정 없음
+        return 200, JSON, {"kind": "calendar#events", "items": [], "nextSyncToken": "stub-sync-token"}
+
+    today = datetime.date.today()
+    tomorrow = (today + datetime.timedelta(days=1)).isoformat()
+    today = today.isoformat()
+    items = [
+        {"id": "e1", "iCalUID": "e1@google.com", "status": "confirmed", "summary": "[솔개팀] 이승민 재택근무",
+         "start": {"date": today}, "end": {"date": tomorrow}},
+        {"id": "e2", "iCalUID": "e2@google.com", "status": "confirmed", "summary": "주간 회의",
+         "start": {"dateTime": f"{today}T10:00:00+09:00"}, "end": {"dateTime": f"{today}T11:00:00+09:00"}},
+    ]
+    return 200, JSON, {"kind": "calendar#events", "items": items, "nextSyncToken": "stub-sync-token"}
+
+
+class TigrisState:
+    """Tigris 대체 서버 상태 (실행마다 새 일정 생성)"""
+
+    def __init__(self, new_schedules_per_run: int = 3):
+        self.new_schedules_per_run = new_schedules_per_run
+        self._counter = itertools.count(1)
+
+    def handler(self, method, path, query, body):
+        """Tigris login/schedule/notices 응답 생성"""
+        if path == "/login":
+            return 200, "text/html; charset=utf-8", "<html>ok</html>"
+        if path.startswith("/schedule/"):
+            today = datetime.date.today().isoformat()
+            schedules = []
+            for _ in range(self.new_schedules_per_run):
+                n = next(self._counter)
+                schedules.append({"scheduleId": f"S{n}", "title": f"일정 {n}", "text": "내용",
+                                  "startDate": today, "endDate": today, "startHm": "10:00",
+                                  "endHm": "11:00", "socialName": "홍길동"})
+            return 200, JSON, schedules
+        if path == "/feed/notices":
+            n = next(self._counter)
+            return 200, JSON, {"data": [{"noticeId": f"N{n}", "title": f"공지 {n}", "text": "내용"}]}
+        return 404, "text/plain", "not found"
+
+
+def start_stub_servers(latency: dict = None, failure_rate: dict = None, jitter: float = 0.0,
+                       new_schedules_per_run: int = 3) -> dict:
+    """
+    모든 upstream 대체 서버 시작
+    Args:
+        latency: upstream별 지연시간 {"kma": 0.1, ...} ("default" 키는 나머지 기본값)
+        failure_rate: upstream별 실패 비율 {"airkorea": 0.2, ...} ("default" 키 지원)
+        jitter: 지연시간 무작위 편차 (초)
+        new_schedules_per_run: Tigris 일정 조회마다 생성할 새 일정 수
+    Returns:
+        서버 dict {name: StubServer}
+    """
+    latency = latency or {}
+    failure_rate = failure_rate or {}
+    handlers = {
+        "kma": kma_handler,
+        "airkorea": airkorea_handler,
+        "special_day": special_day_handler,
+        "fact": fact_handler,
+        "ollama": ollama_handler,
+        "slack": slack_handler,
+        "calendar": calendar_handler,
+        "tigris": TigrisState(new_schedules_per_run).handler,
+    }
+    servers = {}
+    for name, handler in handlers.items():
+        servers[name] = StubServer(
+            name, handler,
+            latency=latency.get(name, latency.get("default", 0.0)),
+            jitter=jitter,
+            failure_rate=failure_rate.get(name, failure_rate.get("default", 0.0)),
+        ).start()
+    return servers
+
+
+def main():
+    """대체 서버를 띄우고 주소 출력 (Ctrl+C로 종료)"""
+    servers = start_stub_servers()
+    for name, server in servers.items():
+        print(f"{name:<12} {server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+상주(daemon) 모드 실행기
+- 아침 브리핑, Tigris 일정 동기화, Tigris 공지 전송을 하나의 프로세스에서 스케줄 실행
+- Google Calendar 서비스, Slack 클라이언트, HTTP 세션을 한번만 만들어 작업 간에 재사용
+- 브리핑 전에 Ollama 모델을 미리 로드해서 cold start 제거
+- 초단기예보로 곧 비가 시작되면 Slack 알림 (단기예보는 다시 조회하지 않음)
+- Calendar 액세스 토큰을 만료 전에 미리 갱신
+- 올해/내년 특일 정보를 주기적으로 다시 받아서 브리핑 실행 중에는 특일 API를 호출하지 않음
+- 작업 스케줄은 config/daemon_jobs.json의 cron 표현식으로 지정
+
+사용법:
+    python briefing_daemon.py                      # 상주 실행
+    python briefing_daemon.py --list               # 작업별 다음 실행 시각 출력
+    python briefing_daemon.py --run-now tigris_sync  # 작업 하나를 즉시 실행하고 종료
+"""
+
+import argparse
+import datetime
+import json
+import os
+import signal
+
+import requests
+
+import daily_briefing
+import get_tigris_and_put_team_cal as tigris_cal
+import get_tigris_notice as tigris_notice
+from util import calendar_client, clients, todayinfo
+from util.weather import check_rain_onset
+from util.scheduler import Scheduler, KST
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_PATH = os.path.join(BASE_DIR, "config", "daemon_jobs.json")
+
+
+class BriefingDaemon:
+    """상주 모드 작업 모음 (warm 상태의 클라이언트를 작업 간에 공유)"""
+
+    def __init__(self, jobs_path: str = JOBS_PATH):
+        """
+        초기화
+        Args:
+            jobs_path: 작업 스케줄 설정 파일 경로
+        """
+        with open(jobs_path, 'r', encoding='utf-8') as f:
+            self.job_configs = json.load(f)["jobs"]
+
+        # Tigris는 로그인 쿠키가 필요하므로 API용 공유 세션과 분리
+        self.tigris_session = requests.Session()
+        self.schedule_manager = None
+        self.notice_manager = None
+        # 이미 알린 비 시작 시각 (같은 비에 대해 반복 알림 방지)
+        self.rain_alerted = set()
+
+        self.job_funcs = {
+            "daily_briefing_prepare": self.run_daily_briefing,
+            "daily_briefing": self.run_daily_briefing,
+            "tigris_sync": self.run_tigris_sync,
+            "tigris_notice": self.run_tigris_notice,
+            "ollama_warmup": self.run_ollama_warmup,
+            "rain_alert": self.run_rain_alert,
+            "special_day_refresh": self.run_special_day_refresh,
+            "calendar_token_refresh": self.run_calendar_token_refresh,
+        }
+        for job in self.job_configs:
+            if job["name"] not in self.job_funcs:
+                raise ValueError(f"알 수 없는 작업: {job['name']}")
+
+    def warm_up(self):
+        """공유 클라이언트 미리 생성 (Calendar discovery, HTTP 커넥션 풀)"""
+        clients.get_session()
+        try:
+            clients.get_calendar_service()
+            print("Calendar 서비스 준비 완료")
+        except Exception as e:
+            print(f"Calendar 서비스 준비 실패 (작업 실행시 재시도): {e}")
+
+    def run_daily_briefing(self, args: list = None):
+        """아침 브리핑 생성 및 전송 (args의 --phase로 prepare/deliver 구분)"""
+        daily_briefing.main(args or [])
+
+    def run_tigris_sync(self, args: list = None):
+        """Tigris 일정 → Google Calendar 동기화"""
+        if self.schedule_manager is None:
+            self.schedule_manager = tigris_cal.ScheduleManager(tigris_cal.SCHEDULES_DB)
+        tigris_cal.login_tigris(self.tigris_session)
+        tigris_cal.sync_schedules(self.tigris_session, clients.get_calendar_service(),
+                                  self.schedule_manager)
+
+    def run_tigris_notice(self, args: list = None):
+        """Tigris 새 공지 Slack 전송"""
+        if self.notice_manager is None:
+            self.notice_manager = tigris_notice.NoticeManager(tigris_notice.NOTICE_DB)
+        tigris_notice.login_tigris(self.tigris_session)
+        tigris_notice.poll_notices(self.tigris_session,
+                                   clients.get_slack(tigris_notice.SLACK_CREDENTIAL_NOTICE),
+                                   self.notice_manager)
+
+    def run_ollama_warmup(self, args: list = None):
+        """브리핑 전에 Ollama 모델을 메모리에 로드"""
+        daily_briefing.preload_model()
+
+    def run_special_day_refresh(self, args: list = None):
+        """올해/내년 특일 정보 다시 조회 (대체/임시공휴일 반영)"""
+        for index in todayinfo.refresh_special_days():
+            print(f"{index['year']}년 특일 {len(index['days'])}개 (공휴일 {len(index['holidays'])}개)")
+
+    def run_calendar_token_refresh(self, args: list = None):
+        """만료가 가까운 Calendar 토큰 미리 갱신 (작업 실행 중에 OAuth 갱신 왕복이 생기지 않도록)"""
+        calendar_client.refresh_credentials()
+
+    def run_rain_alert(self, args: list = None):
+        """
+        곧 비/눈이 시작되면 프로필의 Slack 채널로 알림
+        Args:
+            args: ["--prod", "--profile", "ain", "--location", "서초구 양재1동", "--within", "60"]
+        """
+        parser = argparse.ArgumentParser(prog='rain_alert')
+        parser.add_argument('-p', '--prod', action='store_true')
+        parser.add_argument('--profile', action='append', dest='profiles')
+        parser.add_argument('--location')
+        parser.add_argument('--within', type=int, default=60)
+        options = parser.parse_args(args or [])
+
+        onset = check_rain_onset(options.location, options.within)
+        if onset is None:
+            print("비 시작 예정 없음")
+            return
+        key = onset["time"].format("YYYYMMDDHHmm")
+        if key in self.rain_alerted:
+            print(f"이미 알림 보냄: {key}")
+            return
+
+        text = f"☔ {onset['minutes']}분 후({onset['time']:HH:mm}) {onset['pty']} 시작 예상"
+        if onset["rn1"] and onset["rn1"] != "강수없음":
+            text += f" (시간당 {onset['rn1']})"
+        for profile in daily_briefing.load_profiles(names=options.profiles):
+            slack = clients.get_slack(daily_briefing.get_slack_credential(profile, options.prod))
+            slack.send_message(text)
+        # 오늘 알림만 유지
+        self.rain_alerted = {k for k in self.rain_alerted if k[:8] == key[:8]}
+        self.rain_alerted.add(key)
+        print(text)
+
+    def build_scheduler(self) -> Scheduler:
+        """
+        설정 파일의 작업을 등록한 스케줄러 생성
+        Returns:
+            Scheduler 인스턴스
+        """
+        scheduler = Scheduler(tz=KST)
+        for job in self.job_configs:
+            func = self.job_funcs[job["name"]]
+            args = job.get("args", [])
+            scheduler.add(job["name"], job["cron"], lambda func=func, args=args: func(args))
+        return scheduler
+
+    def run_now(self, name: str):
+        """
+        작업 하나를 즉시 실행
+        Args:
+            name: 작업 이름
+        """
+        config = next((j for j in self.job_configs if j["name"] == name), {"args": []})
+        self.job_funcs[name](config.get("args", []))
+
+
+def main():
+    """상주 모드 실행"""
+    parser = argparse.ArgumentParser(description='Daily Briefing 상주 모드')
+    parser.add_argument('--jobs', default=JOBS_PATH, help='작업 스케줄 설정 파일')
+    parser.add_argument('--list', action='store_true', help='작업별 다음 실행 시각 출력')
+    parser.add_argument('--run-now', metavar='JOB', help='작업 하나를 즉시 실행하고 종료')
+    args = parser.parse_args()
+
+    daemon = BriefingDaemon(args.jobs)
+
+    if args.run_now:
+        daemon.run_now(args.run_now)
+        return
+
+    scheduler = daemon.build_scheduler()
+    print("=== Daily Briefing 상주 모드 ===\n")
+    for job in scheduler.jobs:
+        print(f"  {job['name']:<22} {job['spec'].expr:<18} 다음 실행: {job['next_run']:%Y-%m-%d %H:%M}")
+    if args.list:
+        return
+
+    daemon.warm_up()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: scheduler.stop())
+
+    print(f"\n[{datetime.datetime.now(KST):%Y-%m-%d %H:%M:%S}] 스케줄러 시작", flush=True)
+    scheduler.run_forever()
+    print("스케줄러 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,32 +6,158 @@ Daily Briefing 생성기
 - Useless Fact 조회
 - Ollama를 통한 브리핑 문구 생성
 - Slack 채널로 전송
+- config/briefing_profiles.json의 프로필(대상 그룹)별로 공통 데이터를 한번만 조회해서
+  프로필마다 브리핑 생성/전송
 """
 
 import argparse
 import calendar
 import datetime
 import json
-import requests
+import re
 import arrow
-from util.get_my_calendar_today import get_calendar_service, AINR_CAL, DATONR_CAL
-from util.weather import get_today_weather
-from util.air_quality import get_air_quality
+from util.get_my_calendar_today import AIN_CAL, AINR_CAL, DATONR_CAL, MY_CAL
+from util.weather import get_today_weather, summarize_forecast
+from util.air_quality import get_air_quality, format_air_quality
 from util.todayinfo import is_day_off, get_upcoming_special_days
+from util.business_days import describe_business_days
 from util.useless_fact import UselessFact
-from util.ain_slack import AinSlack
+from util import calendar_store, clients, snapshot
+from util.calendar_dedupe import unique_events
+from util.calendar_index import format_event_time, is_all_day
+from util.gather import Source, gather_sources, format_timings
+from util.trace import start_run, finish_run, span, traced
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SLACK_CREDENTIAL_SERVICE = os.path.join(BASE_DIR, "credential", "slack_credential_service.json")
-SLACK_CREDENTIAL_TEST = os.path.join(BASE_DIR, "credential", "slack_credential_test.json")
+CREDENTIAL_DIR = os.path.join(BASE_DIR, "credential")
+PROFILES_PATH = os.path.join(BASE_DIR, "config", "briefing_profiles.json")
+
+# 프로필에서 이름으로 참조할 수 있는 캘린더
+CALENDARS = {
+    "AIN_CAL": AIN_CAL,
+    "AINR_CAL": AINR_CAL,
+    "DATONR_CAL": DATONR_CAL,
+    "MY_CAL": MY_CAL,
+}
+
+# 브리핑 섹션 (프로필의 sections 기본값)
+ALL_SECTIONS = ["greeting", "weather", "schedule", "special_day", "fact", "closing"]
 
 # Ollama 설정
 OLLAMA_URL = "http://localhost:11434"
 OLLAMA_MODEL = "exaone3.5:32b"
+# 요청 후 모델을 메모리에 유지할 시간 (daemon 모드에서 다음 실행까지 warm 상태 유지)
+OLLAMA_KEEP_ALIVE = "30m"
 #OLLAMA_MODEL = "qwen3.5:27b"
 #OLLAMA_MODEL = "gemma4:26b"
 
+# 프롬프트 변형 (프로필의 prompt 항목으로 선택)
+# - research: 연구소 연구원 대상, 일정 포함
+# - lvis: LVIS OB 대상, 일정 미포함
+PROMPT_TEMPLATES = {
+    "research": """당신은 친근한 비서입니다. 다음 정보를 바탕으로 아침 브리핑 내용을 JSON 형식으로 작성해주세요.
+
+오늘 날짜: {date}
+
+날짜 위치 정보:
+{date_position}
+
+오늘의 날씨:
+{weather}
+
+오늘의 공기질:
+{air_quality}
+
+오늘의 일정:
+{events_text}
+
+특일 정보:
+{special_text}
+
+오늘의 잡학사실 (영어):
+{fact}
+
+다음 JSON 형식으로 작성해주세요. 반드시 유효한 JSON만 출력하세요:
+{{
+  "greeting": "아침 인사말 (3-4문장). 날짜와 요일을 자연스럽게 언급하고, 날씨/일정/특일 등 오늘의 전체 맥락을 고려해서 연구원들에게 힘이 나고 유머러스한 인사말을 작성. 월요일이면 주말 끝 위로, 금요일이면 불금 언급, 날씨가 좋으면 기분 좋은 멘트, 일정이 많으면 파이팅 멘트 등 상황에 맞게 재치있게. **은 절대 사용하지 말 것.",
+  "weather": "날씨 요약 (최저, 최고 기온, 날씨 상태 간단히, 1-2문장)",
+  "schedule": "일정 브리핑 (종일 일정은 종일로 언급, 연구원들 재택근무는 정확히 팀과 이름을 언급)",
+  "special_day": "특일 정보가 있으면 간단히 언급, 없으면 special_day 항목을 생성하지 않음",
+  "fact": "반드시 한국어로만 작성. 영어 원문을 한국어로 번역한 내용 + 재미있는 코멘트 (2-3문장). 영어를 절대 포함하지 말 것. 잡학사실 내용이 성적이거나 불쾌감을 유발하면 항목을 생성하지 않음",
+  "closing": "마무리 인사(날짜 포함, 날씨와 요일을 고려해서 연구활동을 독려하는 적절한 1문장)"
+}}
+
+짧고 간결하게, 밝고 긍정적인 톤으로 작성해주세요.
+
+참고: 일정에 다음과 같은 이름이 있으면 소속과 직책을 확인해서 보정해줘.
+
+이세라 AI 솔루션개발팀/팀장
+이승민 AI 솔루션개발팀/주임연구원
+정종찬 AI 솔루션개발팀/주임연구원
+강진형 AI 솔루션개발팀/연구원
+최호진 기반기술실/실장 
+문영민 기반기술실/파트장
+채승철 산업지능연구소/소장
+
+팀이름은 줄임말도 정식명칭으로 해줘
+솔개팀--> AI솔루션개발팀
+비솔팀--> AI비전솔루션팀
+
+
+""",
+    "lvis": """당신은 친근한 비서입니다. 다음 정보를 바탕으로 아침 브리핑 내용을 JSON 형식으로 작성해주세요.
+
+참조할 정보  
+1. 오늘 날짜: {date}
+2. 날짜 위치 정보: {date_position}
+3. 오늘의 날씨: {weather}
+4. 오늘의 공기질: {air_quality}
+5. 특일 정보: {special_text}
+6. 오늘의 잡학사실 (영어): {fact}
+
+다음 JSON 형식으로 작성해주세요. 반드시 유효한 JSON만 출력하세요:
+{{
+  "greeting": "아침 인사말 (3-4문장). 날짜와 요일을 자연스럽게 언급하고, 오늘의 전체 맥락을 고려해서 LVIS OB들에게 힘이 나고 유머러스한 인사말을 작성. 월요일이면 주말 끝 위로, 금요일이면 불금 언급 등 상황에 맞게 재치있게.",
+  "weather": "날씨 요약 (최저, 최고 기온, 날씨 상태 간단히, 1-2문장), 공기질 정보",
+  "special_day": "특일 정보가 있으면 간단히 언급, 없으면 special_day 항목을 생성하지 않음",
+  "fact": "반드시 한국어로만 작성. 영어 원문을 한국어로 번역한 내용 + 재미있는 코멘트 (2-3문장). 영어를 절대 포함하지 말 것. 잡학사실 내용이 성적이거나 불쾌감을 유발하면 항목을 생성하지 않음",
+  "closing": "마무리 인사(날짜 포함, 날씨와 요일을 고려해서 좋은 하루가 되도록 하기 위해 적절한 1문장)"
+}}
+
+짧고 간결하게, 밝고 긍정적인 톤으로 작성해주세요.
+
+
+""",
+}
+
+# 요일별 날씨 전망 일수 (월요일 브리핑에는 내일부터 3일 전망 추가)
+WEATHER_OUTLOOK_DAYS = {0: 3}
+
+# 데이터 소스별 deadline (초, 수집 시작 시점 기준)
+SOURCE_TIMEOUTS = {
+    "calendar": 20,
+    "weather": 25,
+    "air_quality": 15,
+    "special_days": 20,
+    "fact": 10,
+}
+
+# 데이터 소스별 실패시 사용할 값
+SOURCE_FALLBACKS = {
+    "calendar": {},
+    "weather": "날씨 정보를 가져오지 못했습니다.",
+    "air_quality": "공기질 정보를 가져오지 못했습니다.",
+    "special_days": [],
+    "fact": "No fact available today.",
+}
+
+# prepare 단계에서 만든 브리핑 artifact 저장 위치
+ARTIFACT_DIR = os.path.join(BASE_DIR, "artifacts")
+
+# deliver 단계에서 다시 조회하는 (자주 바뀌는) 데이터 소스
+VOLATILE_SOURCES = ["calendar", "weather", "air_quality"]
+
 
 def get_date_position(date: datetime.date = None) -> str:
     """
@@ -40,6 +166,7 @@ def get_date_position(date: datetime.date = None) -> str:
         date: 날짜 (기본값: 오늘)
     Returns:
         "오늘은 2026년의 x번째주, xx번째 날, 올해가 xx%지났고, 이번달은 xx% 지났습니다."
+        + 이번 달 남은 근무일, 다음 공휴일까지 남은 일수
     """
     if date is None:
         KST = datetime.timezone(datetime.timedelta(hours=9))
@@ -62,137 +189,253 @@ def get_date_position(date: datetime.date = None) -> str:
 
     return (
         f"오늘은 {year}년의 {week_number}번째주, "
-        f"올해가 {year_progress:.1f}% 지났습니다."
-    )
+        f"올해가 {year_progress:.1f}% 지났습니다. "
+        f"{describe_business_days(date)}"
+    ).rstrip()
+
+
+def to_briefing_events(events: list, date: datetime.date) -> list:
+    """
+    Calendar API 일정을 브리핑용 일정으로 변환
+    Args:
+        events: Calendar API 일정 리스트 (하루 일정)
+        date: 일정 날짜 (전날 시작한 일정은 '~끝 시각'으로 표시)
+    Returns:
+        일정 리스트 [{"summary": "...", "start_time": "10:00" / "~11:00" / "종일", "all_day": bool,
+                      "uid": iCalUID (캘린더 간 중복 판별)}]
+    """
+    return [{
+        "summary": event["summary"],
+        "start_time": format_event_time(event, date),
+        "all_day": is_all_day(event),
+        "uid": event.get("iCalUID"),
+    } for event in events]
 
 
-def get_todays_events(service, calendar_id: str) -> list:
+def fetch_calendar_events(calendar_ids: list, date: datetime.date = None) -> dict:
     """
-    오늘의 캘린더 일정 조회
+    여러 캘린더의 하루 일정을 한번에 조회 (batch 요청 하나로 모든 캘린더 증분 동기화)
     Args:
-        service: Google Calendar 서비스 객체
-        calendar_id: 캘린더 ID
+        calendar_ids: 캘린더 ID 리스트
+        date: 날짜 (기본값: 오늘, 내일 미리보기 등은 API 요청 없이 같은 저장소에서 조회)
     Returns:
-        일정 리스트 [{"summary": "...", "start_time": "..."}]
+        캘린더별 일정 dict {calendar_id: [{"summary": "...", "start_time": "...", "all_day": bool}]}
     """
     KST = datetime.timezone(datetime.timedelta(hours=9))
-    today = datetime.datetime.now(KST).date()
-
-    start_of_day = datetime.datetime.combine(today, datetime.datetime.min.time())
-    end_of_day = datetime.datetime.combine(today, datetime.datetime.max.time())
-
-    start_of_day = start_of_day.replace(tzinfo=KST)
-    end_of_day = end_of_day.replace(tzinfo=KST)
-
-    events_result = service.events().list(
-        calendarId=calendar_id,
-        timeMin=start_of_day.isoformat(),
-        timeMax=end_of_day.isoformat(),
-        singleEvents=True,
-        orderBy="startTime"
-    ).execute()
-
-    events = events_result.get("items", [])
-    result = []
-
-    for event in events:
-        start = event["start"].get("dateTime", event["start"].get("date"))
-        dt = datetime.datetime.fromisoformat(start)
-        start_str = dt.strftime("%H:%M")
-        result.append({
-            "summary": event["summary"],
-            "start_time": start_str
-        })
+    date = date or datetime.datetime.now(KST).date()
+
+    window = calendar_store.get_window(calendar_ids, date, 1, service=clients.get_calendar_service())
+    events = window.events_on(date)
+    return {cal_id: to_briefing_events([e for e in events if e["calendarId"] == cal_id], date)
+            for cal_id in calendar_ids}
+
 
-    return result
+def fetch_weather() -> str:
+    """오늘 날씨 요약 (요일에 따라 며칠 전망 포함)"""
+    KST = datetime.timezone(datetime.timedelta(hours=9))
+    weekday = datetime.datetime.now(KST).weekday()
+    return get_today_weather(outlook_days=WEATHER_OUTLOOK_DAYS.get(weekday, 0))
 
 
-def generate_briefing_json(date: str, events: list, weather: str, special_days: list, fact: str, date_position: str = "", air_quality: str = "") -> dict:
+def fetch_fact() -> str:
     """
-    Ollama를 통해 JSON 형식의 브리핑 생성
+    Useless Fact 조회
+    Returns:
+        잡학사실 영문 문자열
+    """
+    fact_api = UselessFact(language="en")
+    return fact_api.get_random()["text"]
+
+
+def gather_briefing_inputs(calendar_ids: list, only: list = None) -> dict:
+    """
+    브리핑에 필요한 데이터 소스를 동시에 조회
+    - 소스별 deadline을 넘기거나 실패하면 SOURCE_FALLBACKS 값 사용
+    - 소스별 지연시간을 출력
     Args:
-        date: 오늘 날짜 문자열
-        events: 일정 리스트
-        weather: 날씨 정보 문자열
-        special_days: 특일 정보 리스트
-        fact: useless fact 문자열
-        date_position: 날짜 위치 정보 문자열
-        air_quality: 공기질 정보 문자열
+        calendar_ids: 조회할 캘린더 ID 리스트 (모든 프로필의 캘린더 합집합)
+        only: 조회할 소스 이름 리스트 (기본값: 전체)
     Returns:
-        브리핑 JSON dict
+        {"calendar": {calendar_id: [...]}, "weather": "...", "air_quality": "...",
+         "special_days": [...], "fact": "..."}
     """
-    # 일정 포맷팅
-    if events:
-        events_text = "\n".join([f"- {e['start_time']} {e['summary']}" for e in events])
-    else:
-        events_text = "오늘은 일정이 없습니다."
+    funcs = {
+        "calendar": lambda: fetch_calendar_events(calendar_ids),
+        "weather": fetch_weather,
+        "air_quality": get_air_quality,
+        "special_days": lambda: get_upcoming_special_days(1),
+        "fact": fetch_fact,
+    }
+    names = only or list(funcs)
+    # 일정이 필요한 프로필이 없으면 캘린더 서비스 생성도 생략
+    if not calendar_ids:
+        names = [name for name in names if name != "calendar"]
+    sources = [Source(name, funcs[name], SOURCE_TIMEOUTS[name], SOURCE_FALLBACKS[name])
+               for name in names]
+
+    with span("gather"):
+        results, timings = gather_sources(sources)
+    if only is None or "calendar" in only:
+        results.setdefault("calendar", {})
+    print("소스별 조회 시간:")
+    print(format_timings(timings))
+    return results
+
+
+def is_fallback(name: str, value) -> bool:
+    """
+    조회 결과가 실패시 fallback 값인지 확인
+    Args:
+        name: 소스 이름
+        value: 조회 결과
+    Returns:
+        fallback 여부
+    """
+    fallback = SOURCE_FALLBACKS[name]
+    if isinstance(fallback, str) and isinstance(value, str):
+        return value.startswith(fallback)
+    return value == fallback
 
-    # 특일 정보 포맷팅
-    type_names = {'holiday': '공휴일', 'division': '24절기', 'sundry': '잡절'}
-    if special_days:
-        special_text = "\n".join([
-            f"- {day['date']}: {day['name']} ({type_names.get(day['type'], day['type'])})"
-            for day in special_days
-        ])
-    else:
-        special_text = ""
 
-    prompt = f"""당신은 친근한 비서입니다. 다음 정보를 바탕으로 아침 브리핑 내용을 JSON 형식으로 작성해주세요.
+def load_profiles(path: str = PROFILES_PATH, names: list = None) -> list:
+    """
+    브리핑 프로필 로드
+    Args:
+        path: 프로필 설정 파일 경로
+        names: 사용할 프로필 이름 리스트 (기본값: 전체)
+    Returns:
+        프로필 리스트 [{"name", "prompt", "calendars", "slack_credential", "sections", ...}]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        profiles = json.load(f)["profiles"]
 
-오늘 날짜: {date}
+    if names:
+        unknown = set(names) - {p["name"] for p in profiles}
+        if unknown:
+            raise ValueError(f"알 수 없는 프로필: {', '.join(sorted(unknown))}")
+        profiles = [p for p in profiles if p["name"] in names]
 
-날짜 위치 정보:
-{date_position}
+    for profile in profiles:
+        if profile.get("prompt", "research") not in PROMPT_TEMPLATES:
+            raise ValueError(f"알 수 없는 프롬프트 변형: {profile['prompt']} ({profile['name']})")
+        # 캘린더는 CALENDARS의 이름 또는 캘린더 ID로 지정
+        profile["calendar_ids"] = [CALENDARS.get(c, c) for c in profile.get("calendars", [])]
+    return profiles
 
-오늘의 날씨:
-{weather}
 
-오늘의 공기질:
-{air_quality if air_quality else "공기질 정보 없음"}
+def get_profile_events(profile: dict, calendar_events: dict) -> list:
+    """
+    공통 조회 결과에서 프로필의 캘린더 일정만 모아 시간순 정렬 (종일 일정 먼저)
+    - 여러 캘린더에 있는 같은 일정은 한 번만 남기고, 사람별 재택근무/연차 등은 종류별 한 줄로 묶음
+    Args:
+        profile: 브리핑 프로필
+        calendar_events: 캘린더별 일정 dict
+    Returns:
+        중복 없는 일정 리스트
+    """
+    events = []
+    for cal_id in profile["calendar_ids"]:
+        events += calendar_events.get(cal_id, [])
+    # 종일 일정, 전날부터 이어지는 일정('~11:00'), 시간 일정 순
+    events.sort(key=lambda e: (not e.get('all_day', False), not e['start_time'].startswith('~'), e['start_time']))
+    return unique_events(events)
 
-오늘의 일정:
-{events_text}
 
-특일 정보:
-{special_text if special_text else "없음"}
+def get_slack_credential(profile: dict, prod: bool) -> str:
+    """
+    프로필의 Slack credential 파일 경로 반환
+    Args:
+        profile: 브리핑 프로필
+        prod: 실행 모드 여부 (False면 테스트 credential)
+    Returns:
+        credential 파일 경로
+    """
+    if prod:
+        return os.path.join(CREDENTIAL_DIR, profile["slack_credential"])
+    return os.path.join(CREDENTIAL_DIR, profile.get("slack_credential_test", "slack_credential_test.json"))
 
-오늘의 잡학사실 (영어):
-{fact}
 
-다음 JSON 형식으로 작성해주세요. 반드시 유효한 JSON만 출력하세요:
-{{
-  "greeting": "아침 인사말 (3-4문장). 날짜와 요일을 자연스럽게 언급하고, 날씨/일정/특일 등 오늘의 전체 맥락을 고려해서 연구원들에게 힘이 나고 유머러스한 인사말을 작성. 월요일이면 주말 끝 위로, 금요일이면 불금 언급, 날씨가 좋으면 기분 좋은 멘트, 일정이 많으면 파이팅 멘트 등 상황에 맞게 재치있게. **은 절대 사용하지 말 것.",
-  "weather": "날씨 요약 (최저, 최고 기온, 날씨 상태 간단히, 1-2문장)",
-  "schedule": "일정 브리핑 (00:00은 종일 일정으로 언급, 중복일정이 있으면 한번만 언급, 연구원들 재택근무는 정확히 팀과 이름을 언급)",
-  "special_day": "특일 정보가 있으면 간단히 언급, 없으면 special_day 항목을 생성하지 않음",
-  "fact": "반드시 한국어로만 작성. 영어 원문을 한국어로 번역한 내용 + 재미있는 코멘트 (2-3문장). 영어를 절대 포함하지 말 것. 잡학사실 내용이 성적이거나 불쾌감을 유발하면 항목을 생성하지 않음",
-  "closing": "마무리 인사(날짜 포함, 날씨와 요일을 고려해서 연구활동을 독려하는 적절한 1문장)"
-}}
+@traced()
+def preload_model(keep_alive: str = OLLAMA_KEEP_ALIVE):
+    """
+    Ollama 모델을 미리 메모리에 올려둠 (프롬프트 없이 요청하면 모델만 로드)
+    Args:
+        keep_alive: 모델을 유지할 시간
+    """
+    response = clients.get_session().post(
+        f"{OLLAMA_URL}/api/generate",
+        json={"model": OLLAMA_MODEL, "keep_alive": keep_alive},
+        timeout=300
+    )
+    response.raise_for_status()
 
-짧고 간결하게, 밝고 긍정적인 톤으로 작성해주세요.
 
-참고: 일정에 다음과 같은 이름이 있으면 소속과 직책을 확인해서 보정해줘.
+def format_events(events: list) -> str:
+    """
+    일정 리스트를 프롬프트용 문자열로 변환
+    Args:
+        events: 일정 리스트
+    Returns:
+        "- 10:00 회의" 형식의 여러 줄 문자열
+    """
+    if events:
+        return "\n".join([f"- {e['start_time']} {e['summary']}" for e in events])
+    return "오늘은 일정이 없습니다."
 
-이세라 AI 솔루션개발팀/팀장
-이승민 AI 솔루션개발팀/주임연구원
-정종찬 AI 솔루션개발팀/주임연구원
-강진형 AI 솔루션개발팀/연구원
-최호진 기반기술실/실장 
-문영민 기반기술실/파트장
-채승철 산업지능연구소/소장
 
-팀이름은 줄임말도 정식명칭으로 해줘
-솔개팀--> AI솔루션개발팀
-비솔팀--> AI비전솔루션팀
+def format_special_days(special_days: list) -> str:
+    """
+    특일 리스트를 프롬프트용 문자열로 변환
+    Args:
+        special_days: 특일 정보 리스트
+    Returns:
+        "- 20261009: 한글날 (공휴일)" 형식의 여러 줄 문자열 (없으면 빈 문자열)
+    """
+    type_names = {'holiday': '공휴일', 'division': '24절기', 'sundry': '잡절'}
+    return "\n".join([
+        f"- {day['date']}: {day['name']} ({type_names.get(day['type'], day['type'])})"
+        for day in special_days
+    ])
 
 
-"""
+def build_prompt(date: str, events: list, weather: str, special_days: list, fact: str, date_position: str = "", air_quality: str = "", prompt_variant: str = "research") -> str:
+    """
+    브리핑 생성 프롬프트 작성
+    Args:
+        generate_briefing_json과 동일
+    Returns:
+        프롬프트 문자열
+    """
+    special_text = format_special_days(special_days)
+    return PROMPT_TEMPLATES[prompt_variant].format(
+        date=date,
+        date_position=date_position,
+        weather=weather,
+        air_quality=air_quality if air_quality else "공기질 정보 없음",
+        events_text=format_events(events),
+        special_text=special_text if special_text else "없음",
+        fact=fact,
+    )
+
+
+def request_ollama(prompt: str) -> str:
+    """
+    Ollama에 JSON 형식 생성을 요청하고 응답 원문 반환
+    Args:
+        prompt: 프롬프트 문자열
+    Returns:
+        모델 응답 문자열
+    """
+    # replay 모드에서는 스냅샷에 기록된 응답 사용 (네트워크 요청 없음)
+    if snapshot.is_replaying():
+        return snapshot.replay_response(prompt)
 
     ollama_request = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
         "stream": False,
         "format": "json",
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "options": {
             "temperature": 0.7,
             "top_p": 0.9,
@@ -200,31 +443,75 @@ def generate_briefing_json(date: str, events: list, weather: str, special_days:
         }
     }
 
-    response = requests.post(
-        f"{OLLAMA_URL}/api/generate",
-        json=ollama_request,
-        timeout=120
-    )
-    response.raise_for_status()
+    with span("ollama.generate", model=OLLAMA_MODEL):
+        response = clients.get_session().post(
+            f"{OLLAMA_URL}/api/generate",
+            json=ollama_request,
+            timeout=120
+        )
+        response.raise_for_status()
 
     result = response.json()
     response_text = result.get("response", "").strip()
+    snapshot.append("ollama", {"prompt": prompt, "response": response_text})
+    return response_text
+
+
+@traced()
+def generate_briefing_json(date: str, events: list, weather: str, special_days: list, fact: str, date_position: str = "", air_quality: str = "", prompt_variant: str = "research") -> dict:
+    """
+    Ollama를 통해 JSON 형식의 브리핑 생성
+    Args:
+        date: 오늘 날짜 문자열
+        events: 일정 리스트
+        weather: 날씨 정보 문자열
+        special_days: 특일 정보 리스트
+        fact: useless fact 문자열
+        date_position: 날짜 위치 정보 문자열
+        air_quality: 공기질 정보 문자열
+        prompt_variant: 프롬프트 변형 이름 (PROMPT_TEMPLATES 키)
+    Returns:
+        브리핑 JSON dict
+    """
+    prompt = build_prompt(date, events, weather, special_days, fact, date_position, air_quality, prompt_variant)
+    response_text = request_ollama(prompt)
 
     try:
         return json.loads(response_text)
     except json.JSONDecodeError:
         # JSON 파싱 실패시 기본 구조 반환
+        special_text = format_special_days(special_days)
         return {
             "greeting": f"안녕하세요! {date}입니다.",
             "weather": weather,
-            "schedule": events_text,
+            "schedule": format_events(events),
             "special_day": special_text if special_text else None,
             "fact": fact,
             "closing": "좋은 하루 보내세요!"
         }
 
 
-def build_slack_blocks(date: str, briefing: dict, date_position: str = "", air_quality: str = "", original_fact: str = "") -> list:
+@traced()
+def regenerate_sections(keys: list, date: str, events: list, weather: str, special_days: list, fact: str, date_position: str = "", air_quality: str = "", prompt_variant: str = "research") -> dict:
+    """
+    바뀐 입력에 해당하는 브리핑 항목만 다시 생성
+    Args:
+        keys: 다시 생성할 항목 (예: ["weather", "schedule"])
+        나머지는 generate_briefing_json과 동일
+    Returns:
+        다시 생성한 항목만 담은 dict (실패한 항목은 포함하지 않음)
+    """
+    prompt = build_prompt(date, events, weather, special_days, fact, date_position, air_quality, prompt_variant)
+    prompt += f"\n위 JSON 형식 중 {', '.join(keys)} 항목만 포함한 JSON을 출력하세요.\n"
+    try:
+        regenerated = json.loads(request_ollama(prompt))
+    except json.JSONDecodeError:
+        return {}
+    return {key: regenerated[key] for key in keys if regenerated.get(key)}
+
+
+@traced()
+def build_slack_blocks(date: str, briefing: dict, date_position: str = "", air_quality: str = "", original_fact: str = "", sections: list = None) -> list:
     """
     브리핑 JSON을 Slack Block Kit 형식으로 변환
     Args:
@@ -233,9 +520,12 @@ def build_slack_blocks(date: str, briefing: dict, date_position: str = "", air_q
         date_position: 날짜 위치 정보 문자열
         air_quality: 공기질 정보 문자열
         original_fact: 잡학사실 영문 원문
+        sections: 포함할 섹션 리스트 (기본값: ALL_SECTIONS)
     Returns:
         Slack Block Kit 블록 리스트
     """
+    if sections is None:
+        sections = ALL_SECTIONS
     blocks = []
 
     # 헤더
@@ -249,42 +539,45 @@ def build_slack_blocks(date: str, briefing: dict, date_position: str = "", air_q
     })
 
     # 인사말 + 날짜 위치
-    greeting_text = f"👋 {briefing.get('greeting', '')}"
-    if date_position:
-        greeting_text += f"\n_{date_position}_"
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": greeting_text
-        }
-    })
+    if "greeting" in sections:
+        greeting_text = f"👋 {briefing.get('greeting', '')}"
+        if date_position:
+            greeting_text += f"\n_{date_position}_"
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": greeting_text
+            }
+        })
 
     # 날씨 + 공기질
-    weather_text = briefing.get('weather', '')
-    if air_quality:
-        weather_text += f"\n{air_quality}"
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": weather_text
-        }
-    })
+    if "weather" in sections:
+        weather_text = briefing.get('weather', '')
+        if air_quality:
+            weather_text += f"\n{air_quality}"
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": weather_text
+            }
+        })
 
 
     # 일정
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": f"*📆 오늘의 일정*\n{briefing.get('schedule', '')}"
-        }
-    })
+    if "schedule" in sections:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*📆 오늘의 일정*\n{briefing.get('schedule', '')}"
+            }
+        })
 
     # 특일 정보 (있는 경우에만)
     special_day = briefing.get('special_day')
-    if special_day:
+    if special_day and "special_day" in sections:
 #        blocks.append({"type": "divider"})
         blocks.append({
             "type": "section",
@@ -297,41 +590,280 @@ def build_slack_blocks(date: str, briefing: dict, date_position: str = "", air_q
     blocks.append({"type": "divider"})
 
     # 잡학사실
-    fact_text = f"*💡 오늘의 잡학사실*\n{briefing.get('fact', '')}"
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": fact_text
-        }
-    })
+    if "fact" in sections:
+        fact_text = f"*💡 오늘의 잡학사실*\n{briefing.get('fact', '')}"
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": fact_text
+            }
+        })
 
-    blocks.append({"type": "divider"})
+        blocks.append({"type": "divider"})
 
     # 마무리 인사 (context block)
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": f"✨ {briefing.get('closing', '')}"
-            }
-        ]
-    })
+    if "closing" in sections:
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"✨ {briefing.get('closing', '')}"
+                }
+            ]
+        })
 
     return blocks
 
 
-def main():
+def prepare_profile(profile: dict, inputs: dict, date_str: str, date_position: str) -> dict:
+    """
+    공통 조회 결과로 프로필 하나의 브리핑 JSON 생성
+    Args:
+        profile: 브리핑 프로필
+        inputs: gather_briefing_inputs 결과
+        date_str: 오늘 날짜 문자열
+        date_position: 날짜 위치 정보 문자열
+    Returns:
+        브리핑 JSON dict (실패시 None)
+    """
+    sections = profile.get("sections", ALL_SECTIONS)
+    events = get_profile_events(profile, inputs["calendar"])
+
+    if "schedule" in sections:
+        print(f"일정 {len(events)}개")
+        for e in events:
+            print(f"  - {e['start_time']} {e['summary']}")
+
+    # Ollama 브리핑 생성 (JSON 형식)
+    print("\n브리핑 생성 중...")
+    try:
+        briefing = generate_briefing_json(date_str, events, inputs["weather"], inputs["special_days"],
+                                          inputs["fact"], date_position, inputs["air_quality"],
+                                          profile.get("prompt", "research"))
+        print(f"\n--- 브리핑 내용 (JSON) ---")
+        print(json.dumps(briefing, ensure_ascii=False, indent=2))
+        print("-------------------")
+        snapshot.record_profile(profile["name"], "briefing", briefing)
+        return briefing
+    except Exception as e:
+        print(f"브리핑 생성 실패: {e}")
+        return None
+
+
+def deliver_profile(profile: dict, briefing: dict, inputs: dict, date_str: str, date_position: str, prod: bool):
+    """
+    브리핑 JSON을 Block Kit으로 변환해서 프로필의 Slack 채널로 전송
+    Args:
+        profile: 브리핑 프로필
+        briefing: 브리핑 JSON dict
+        inputs: 조회 결과 (공기질, 잡학사실 원문 표시용)
+        date_str: 오늘 날짜 문자열
+        date_position: 날짜 위치 정보 문자열
+        prod: 실행 모드 여부
+    """
+    sections = profile.get("sections", ALL_SECTIONS)
+
+    # Block Kit 변환
+    print("\nBlock Kit 변환 중...")
+    blocks = build_slack_blocks(date_str, briefing, date_position, inputs["air_quality"], inputs["fact"], sections)
+    snapshot.record_profile(profile["name"], "briefing", briefing)
+    snapshot.record_profile(profile["name"], "blocks", blocks)
+
+    # fallback text 생성
+    fallback_parts = [briefing.get('greeting', ''), briefing.get('weather', '')]
+    if "schedule" in sections:
+        fallback_parts.append(briefing.get('schedule', ''))
+    fallback_parts.append(briefing.get('closing', ''))
+    fallback_text = " ".join(fallback_parts)
+
+    # Slack 전송
+    print("\nSlack 전송 중...")
+    try:
+        slack = clients.get_slack(get_slack_credential(profile, prod))
+        print("(실행 모드)" if prod else "(테스트 모드)")
+        thread_id = slack.send_message(fallback_text, blocks=blocks)
+        if thread_id:
+            print(f"전송 완료! Thread ID: {thread_id}")
+        else:
+            print("전송 실패!")
+    except Exception as e:
+        print(f"Slack 전송 실패: {e}")
+
+
+def run_profile(profile: dict, inputs: dict, date_str: str, date_position: str, prod: bool):
+    """
+    공통 조회 결과로 프로필 하나의 브리핑을 생성해서 전송
+    Args:
+        profile: 브리핑 프로필
+        inputs: gather_briefing_inputs 결과
+        date_str: 오늘 날짜 문자열
+        date_position: 날짜 위치 정보 문자열
+        prod: 실행 모드 여부
+    """
+    print(f"\n=== [{profile['name']}] 브리핑 ===")
+    with span(f"profile.{profile['name']}"):
+        briefing = prepare_profile(profile, inputs, date_str, date_position)
+        if briefing is not None:
+            deliver_profile(profile, briefing, inputs, date_str, date_position, prod)
+
+
+def get_artifact_path(date: datetime.date) -> str:
+    """
+    날짜별 브리핑 artifact 파일 경로
+    Args:
+        date: 브리핑 날짜
+    Returns:
+        artifacts/briefing_YYYYMMDD.json 경로
+    """
+    return os.path.join(ARTIFACT_DIR, f"briefing_{date:%Y%m%d}.json")
+
+
+def save_artifact(path: str, artifact: dict):
+    """
+    브리핑 artifact 저장 (임시 파일에 쓰고 교체해서 deliver가 깨진 파일을 읽지 않도록 함)
+    Args:
+        path: 저장 경로
+        artifact: 저장할 dict
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: str) -> dict:
+    """
+    브리핑 artifact 로드
+    Args:
+        path: artifact 경로
+    Returns:
+        artifact dict (없으면 None)
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _air_quality_grades(text: str) -> str:
+    """공기질 문자열 첫 줄에서 수치를 뺀 등급 부분 (수치나 추세만 바뀐 것은 무시하기 위함)"""
+    return re.sub(r"[\d.]+", "", text.split("\n")[0])
+
+
+def _weather_summary(text: str) -> str:
+    """
+    날씨 문자열에서 시간마다 바뀌는 값을 뺀 부분 (하늘 상태/강수 형태, 최저/최고 기온, 강수 여부만 비교하기 위함)
+    - 현재 기온(초단기실황)은 빼고 현재 강수 형태만 남김
+    - 시간대별 기온, 전망 기온은 빼고 강수확률은 수치 없이 '강수'로만 남김
+    """
+    lines = []
+    for line in text.split("\n"):
+        line = re.sub(r"\(?현재 -?[\d.]+°C(?:, )?([^)]*)\)?", r"\1", line)
+        if not line.startswith("🌡"):
+            line = re.sub(r"\s*-?[\d.]+(?:~-?[\d.]+)?°C", "", line)
+        lines.append(re.sub(r"\s*(?:강수)?\s*\d+%", " 강수", line).strip())
+    return "\n".join(lines)
+
+
+def get_changed_sections(profile: dict, prepared: dict, fresh: dict) -> list:
+    """
+    prepare 이후 다시 조회한 입력이 크게 바뀌어서 다시 생성해야 하는 브리핑 항목
+    - 하늘 상태/최저·최고 기온/강수 여부가 바뀌었거나 공기질 등급이 바뀌면 weather
+      (현재 기온, 시간대별 기온처럼 매시간 바뀌는 값은 무시)
+    - 프로필의 오늘 일정이 바뀌면 schedule
+    Args:
+        profile: 브리핑 프로필
+        prepared: prepare 단계의 입력
+        fresh: deliver 단계의 입력
+    Returns:
+        다시 생성할 항목 리스트
+    """
+    sections = profile.get("sections", ALL_SECTIONS)
+    keys = []
+    if (_weather_summary(fresh["weather"]) != _weather_summary(prepared["weather"])
+            or _air_quality_grades(fresh["air_quality"]) != _air_quality_grades(prepared["air_quality"])):
+        keys.append("weather")
+    if "schedule" in sections and (get_profile_events(profile, fresh["calendar"])
+                                   != get_profile_events(profile, prepared["calendar"])):
+        keys.append("schedule")
+    return keys
+
+
+def main(argv: list = None):
     """Daily Briefing 실행"""
     # 인자 파싱
     parser = argparse.ArgumentParser(description='Daily Briefing 생성기')
     parser.add_argument('-p', '--prod', action='store_true',
                         help='실행 모드 (기본: 테스트 모드)')
-    args = parser.parse_args()
+    parser.add_argument('--profile', action='append', dest='profiles', metavar='NAME',
+                        help='실행할 프로필 (여러 번 지정 가능, 기본: 전체 프로필)')
+    parser.add_argument('--force', action='store_true',
+                        help='쉬는 날에도 브리핑 생성')
+    parser.add_argument('--phase', choices=['all', 'prepare', 'deliver'], default='all',
+                        help='all: 생성+전송, prepare: 생성해서 artifact 저장, '
+                             'deliver: artifact의 자주 바뀌는 입력만 갱신해서 전송')
+    parser.add_argument('--replay', metavar='DATE',
+                        help='저장된 스냅샷(YYYY-MM-DD 또는 파일 경로)으로 네트워크 요청 없이 브리핑 재구성')
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        start_run("replay_daily_briefing")
+        try:
+            with span("main"):
+                run_replay(args)
+        finally:
+            trace_path = finish_run()
+            print(f"\ntrace 저장: {trace_path}")
+        return
 
+    start_run("daily_briefing")
+    snapshot.start_snapshot("daily_briefing")
+    try:
+        with span("main"):
+            run_briefing(args)
+    finally:
+        trace_path = finish_run()
+        print(f"\ntrace 저장: {trace_path}")
+        snapshot_path = snapshot.finish_snapshot()
+        if snapshot_path:
+            print(f"스냅샷 저장: {snapshot_path}")
+
+
+def record_run_inputs(phase: str, date: datetime.date, date_str: str, date_position: str, inputs: dict):
+    """
+    이번 실행의 입력을 스냅샷에 기록
+    Args:
+        phase: 실행 단계 (all, prepare, deliver)
+        date: 브리핑 날짜
+        date_str: 오늘 날짜 문자열
+        date_position: 날짜 위치 정보 문자열
+        inputs: 브리핑 생성에 사용한 입력
+    """
+    snapshot.record("phase", phase)
+    snapshot.record("date", date.isoformat())
+    snapshot.record("date_str", date_str)
+    snapshot.record("date_position", date_position)
+    snapshot.record("inputs", inputs)
+
+
+def run_briefing(args):
+    """
+    Daily Briefing 파이프라인 실행
+    Args:
+        args: main()에서 파싱한 인자
+    """
     print("=== Daily Briefing 생성 시작 ===\n")
 
+    profiles = load_profiles(names=args.profiles)
+    print(f"프로필: {', '.join(p['name'] for p in profiles)}")
+
+    # Calendar 서비스(google import, 토큰 갱신)는 날짜/artifact 확인과 겹쳐서 미리 준비
+    if any(p["calendar_ids"] for p in profiles):
+        clients.warm_calendar_service()
+
     # 1. 오늘 날짜
     KST = datetime.timezone(datetime.timedelta(hours=9))
     today = datetime.datetime.now(KST)
@@ -339,110 +871,169 @@ def main():
     date_str = today.strftime("%Y년 %m월 %d일 %A")
     print(f"날짜: {date_str}")
 
+    artifact_path = get_artifact_path(today.date())
+    if args.phase == "deliver":
+        artifact = load_artifact(artifact_path)
+        if artifact is not None:
+            deliver_artifact(artifact, profiles, args.prod)
+            return
+        print(f"\n준비된 브리핑이 없어서 전체 실행합니다: {artifact_path}")
+
     # 2. 쉬는 날 체크
     print("\n쉬는 날 여부 확인 중...")
     is_off, reason = is_day_off(arrow.get(today))
-    if is_off:
+    if is_off and args.force:
+        print(f"오늘은 쉬는 날이지만 --force로 계속 진행합니다: {reason}")
+    elif is_off:
         print(f"오늘은 쉬는 날입니다: {reason}")
         print("브리핑을 생성하지 않고 종료합니다.")
         return
 
-    # 3. Google Calendar 일정 조회
-    print("\n캘린더 일정 조회 중...")
-    try:
-        service = get_calendar_service()
-        events = get_todays_events(service, AINR_CAL)
-        events += get_todays_events(service, DATONR_CAL)
-        events.sort(key=lambda e: e['start_time'])
-        print(f"일정 {len(events)}개 조회됨")
-        for e in events:
-            print(f"  - {e['start_time']} {e['summary']}")
-    except Exception as e:
-        print(f"캘린더 조회 실패: {e}")
-        events = []
+    # 3~7. 일정/날씨/공기질/특일/잡학사실 동시 조회 (모든 프로필 공통, 1회)
+    print("\n데이터 소스 동시 조회 중...")
+    calendar_ids = list(dict.fromkeys(c for p in profiles for c in p["calendar_ids"]))
+    inputs = gather_briefing_inputs(calendar_ids)
 
-    # 4. 날씨 정보 조회
-    print("\n날씨 정보 조회 중...")
-    try:
-        weather = get_today_weather()
-        print(weather)
-    except Exception as e:
-        print(f"날씨 조회 실패: {e}")
-        weather = "날씨 정보를 가져오지 못했습니다."
+    print(f"\n날씨:\n{inputs['weather']}")
+    print(f"\n공기질: {inputs['air_quality']}")
 
-    # 4-1. 공기질 정보 조회
-    print("\n공기질 정보 조회 중...")
-    try:
-        air_quality = get_air_quality()
-        print(air_quality)
-    except Exception as e:
-        print(f"공기질 조회 실패: {e}")
-        air_quality = "공기질 정보를 가져오지 못했습니다."
+    print("\n특일 정보:")
+    type_names = {'holiday': '공휴일', 'division': '24절기', 'sundry': '잡절'}
+    if inputs["special_days"]:
+        for day in inputs["special_days"]:
+            type_name = type_names.get(day['type'], day['type'])
+            print(f"  - {day['date']}: {day['name']} ({type_name})")
+    else:
+        print("  특일 정보 없음")
 
-    # 5. 특일 정보 조회
-    print("\n특일 정보 조회 중...")
-    try:
-        special_days = get_upcoming_special_days(1)
-        type_names = {'holiday': '공휴일', 'division': '24절기', 'sundry': '잡절'}
-        if special_days:
-            for day in special_days:
-                type_name = type_names.get(day['type'], day['type'])
-                print(f"  - {day['date']}: {day['name']} ({type_name})")
-        else:
-            print("  특일 정보 없음")
-    except Exception as e:
-        print(f"특일 정보 조회 실패: {e}")
-        special_days = []
-
-    # 7. Useless Fact 조회
-    print("\nUseless Fact 조회 중...")
-    try:
-        fact_api = UselessFact(language="en")
-        fact_data = fact_api.get_random()
-        fact = fact_data["text"]
-        print(f"Fact: {fact}")
-    except Exception as e:
-        print(f"Fact 조회 실패: {e}")
-        fact = "No fact available today."
+    print(f"\nFact: {inputs['fact']}")
 
     # 8. 날짜 위치 정보 생성
     date_position = get_date_position(today.date())
     print(f"\n날짜 위치: {date_position}")
-
-    # 9. Ollama 브리핑 생성 (JSON 형식)
-    print("\n브리핑 생성 중...")
-    try:
-        briefing = generate_briefing_json(date_str, events, weather, special_days, fact, date_position, air_quality)
-        print(f"\n--- 브리핑 내용 (JSON) ---")
-        print(json.dumps(briefing, ensure_ascii=False, indent=2))
-        print("-------------------")
-    except Exception as e:
-        print(f"브리핑 생성 실패: {e}")
+    record_run_inputs(args.phase, today.date(), date_str, date_position, inputs)
+
+    # 9. prepare: 프로필별 브리핑 생성 후 artifact 저장 (전송은 deliver 단계에서)
+    if args.phase == "prepare":
+        artifact = {
+            "date": today.date().isoformat(),
+            "date_str": date_str,
+            "date_position": date_position,
+            "prepared_at": today.isoformat(),
+            "inputs": inputs,
+            "profiles": {},
+        }
+        for profile in profiles:
+            print(f"\n=== [{profile['name']}] 브리핑 준비 ===")
+            with span(f"profile.{profile['name']}"):
+                briefing = prepare_profile(profile, inputs, date_str, date_position)
+            if briefing is not None:
+                artifact["profiles"][profile["name"]] = briefing
+        save_artifact(artifact_path, artifact)
+        print(f"\n브리핑 저장: {artifact_path}")
         return
 
-    # 10. Block Kit 변환
-    print("\nBlock Kit 변환 중...")
-    blocks = build_slack_blocks(date_str, briefing, date_position, air_quality, fact)
+    # 9~11. 프로필별 브리핑 생성 및 Slack 전송
+    for profile in profiles:
+        run_profile(profile, inputs, date_str, date_position, args.prod)
 
-    # fallback text 생성
-    fallback_text = f"{briefing.get('greeting', '')} {briefing.get('weather', '')} {briefing.get('schedule', '')} {briefing.get('closing', '')}"
 
-    # 11. Slack 전송
-    print("\nSlack 전송 중...")
+def deliver_artifact(artifact: dict, profiles: list, prod: bool):
+    """
+    prepare 단계의 artifact를 전송
+    - 자주 바뀌는 입력(일정, 날씨, 공기질)만 다시 조회
+    - 크게 바뀐 입력에 해당하는 항목만 다시 생성
+    Args:
+        artifact: load_artifact 결과
+        profiles: 전송할 프로필 리스트
+        prod: 실행 모드 여부
+    """
+    date_str = artifact["date_str"]
+    date_position = artifact["date_position"]
+    prepared = artifact["inputs"]
+    print(f"\n준비된 브리핑 사용 (준비 시각: {artifact['prepared_at']})")
+
+    print("\n자주 바뀌는 데이터 다시 조회 중...")
+    calendar_ids = list(dict.fromkeys(c for p in profiles for c in p["calendar_ids"]))
+    refreshed = gather_briefing_inputs(calendar_ids, only=VOLATILE_SOURCES)
+
+    # 다시 조회에 실패한 소스는 준비된 값 유지
+    fresh = dict(prepared)
+    for name, value in refreshed.items():
+        if not is_fallback(name, value):
+            fresh[name] = value
+    record_run_inputs("deliver", datetime.date.fromisoformat(artifact["date"]), date_str, date_position, fresh)
+
+    for profile in profiles:
+        print(f"\n=== [{profile['name']}] 브리핑 전송 ===")
+        with span(f"profile.{profile['name']}"):
+            briefing = artifact["profiles"].get(profile["name"])
+            if briefing is None:
+                # prepare 단계에서 없던 프로필은 지금 생성
+                briefing = prepare_profile(profile, fresh, date_str, date_position)
+                if briefing is None:
+                    continue
+            else:
+                keys = get_changed_sections(profile, prepared, fresh)
+                if keys:
+                    print(f"입력 변경으로 다시 생성: {', '.join(keys)}")
+                    events = get_profile_events(profile, fresh["calendar"])
+                    try:
+                        briefing.update(regenerate_sections(
+                            keys, date_str, events, fresh["weather"], fresh["special_days"], fresh["fact"],
+                            date_position, fresh["air_quality"], profile.get("prompt", "research")))
+                    except Exception as e:
+                        print(f"항목 재생성 실패 (준비된 내용으로 전송): {e}")
+            deliver_profile(profile, briefing, fresh, date_str, date_position, prod)
+
+
+def run_replay(args):
+    """
+    스냅샷으로 브리핑 재구성 (네트워크 요청 없음, Slack 전송 없음)
+    - 기상청/에어코리아 원본이 있으면 현재 코드로 다시 변환
+    - Ollama 응답은 같은 프롬프트의 기록된 응답 사용 (없으면 기록된 브리핑 사용)
+    - 재구성한 Block Kit을 출력하고 기록된 Block Kit과 비교
+    Args:
+        args: main()에서 파싱한 인자
+    """
+    data = snapshot.load_snapshot(args.replay)
+    print(f"=== Daily Briefing replay: {data['path']} ===\n")
+
+    date = datetime.date.fromisoformat(data["date"])
+    date_str = data["date_str"]
+    # 날짜 위치는 근무일 계산에서 특일 API를 부를 수 있으므로 다시 계산하지 않고 기록된 값 사용
+    date_position = data["date_position"]
+    inputs = dict(data["inputs"])
+    if data.get("kma_items"):
+        inputs["weather"] = summarize_forecast(data["kma_items"], date.strftime("%Y%m%d"),
+                                               WEATHER_OUTLOOK_DAYS.get(date.weekday(), 0))
+    if data.get("airkorea_item"):
+        inputs["air_quality"] = format_air_quality(data["airkorea_item"], data.get("airkorea_trend"))
+    print(f"날짜: {date_str} ({data.get('phase', 'all')} 단계 스냅샷)")
+
+    recorded = data.get("profiles", {})
+    profiles = load_profiles(names=args.profiles)
+    snapshot.start_replay(data)
     try:
-        if args.prod:
-            slack = AinSlack(SLACK_CREDENTIAL_SERVICE)
-            print("(실행 모드)")
-        else:
-            slack = AinSlack(SLACK_CREDENTIAL_TEST)
-            print("(테스트 모드)")
-        thread_id = slack.send_message(fallback_text, blocks=blocks)
-        if thread_id:
-            print(f"전송 완료! Thread ID: {thread_id}")
-        else:
-            print("전송 실패!")
-    except Exception as e:
-        print(f"Slack 전송 실패: {e}")
+        for profile in profiles:
+            name = profile["name"]
+            print(f"\n=== [{name}] 브리핑 replay ===")
+            with span(f"profile.{name}"):
+                briefing = prepare_profile(profile, inputs, date_str, date_position)
+                if briefing is None and recorded.get(name, {}).get("briefing"):
+                    print("기록된 브리핑 사용")
+                    briefing = recorded[name]["briefing"]
+                if briefing is None:
+                    continue
+                blocks = build_slack_blocks(date_str, briefing, date_position, inputs["air_quality"],
+                                            inputs["fact"], profile.get("sections", ALL_SECTIONS))
+
+            print(json.dumps(blocks, ensure_ascii=False, indent=2))
+            if "blocks" in recorded.get(name, {}):
+                same = blocks == recorded[name]["blocks"]
+                print(f"기록된 Block Kit과 {'일치' if same else '다름'}")
+    finally:
+        snapshot.stop_replay()
 
 
 if __name__ == "__main__":
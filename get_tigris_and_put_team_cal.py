@@ -1,16 +1,8 @@
 import datetime
 import os.path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import pytz
-from util.ain_slack import AinSlack
+from util import clients
 
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 import json
 
 import os
@@ -21,7 +13,8 @@ from dotenv import load_dotenv
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CREDENTIAL_ENV = os.path.join(BASE_DIR, "credential", ".env")
 SCHEDULES_DB = os.path.join(BASE_DIR, "schedules.db")
-TOKEN_PATH = os.path.join(BASE_DIR, "credential", "token.json")
+
+TIGRIS_URL = "https://www.tigrison.com"
 
 load_dotenv(CREDENTIAL_ENV)
 
@@ -80,8 +73,6 @@ class ScheduleManager:
 
 
 
-# If modifying these scopes, delete the file token.json.
-SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
 
 def format_datetime(start_time: str) -> str:
@@ -96,29 +87,14 @@ def format_datetime(start_time: str) -> str:
 
 
 def get_calendar_service():
-    """Gets authorized calendar service."""
-    creds = None
-    # token.json 파일이 있는 경우 로드
-    token_path = TOKEN_PATH
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    # 유효한 크레덴셜이 없거나 만료된 경우
-    if not creds or not creds.valid:
-        # refresh token이 있고 만료된 경우 갱신
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            # 갱신된 크레덴셜 저장
-            with open(token_path, "w") as token:
-                token.write(creds.to_json())
-        # refresh token이 없는 경우 새로운 인증 진행
-        else:
-            print("ERROR:token.json not exist")
-                
-    return build("calendar", "v3", credentials=creds)
+    """Gets authorized calendar service (shared, built by util.calendar_client)."""
+    return clients.get_calendar_service()
 
 
 def list_calendars(service):
     """Lists all available calendars."""
+    from googleapiclient.errors import HttpError
+
     print("\nAvailable Calendars:")
     print("-" * 50)
     try:
@@ -139,6 +115,8 @@ def list_calendars(service):
 
 def get_todays_calendar_events(service, calendar_id):
     """Gets all events for today from the specified calendar."""
+    from googleapiclient.errors import HttpError
+
     message =""
     try:
             # 한국 시간으로 변환
@@ -224,42 +202,46 @@ AIN_CAL  = 'c_de44760786ebcf05ffc555d66b9e2de2b657aabb72e61780bfbb107e297d5ae2@g
 AINR_CAL = 'c_4a296c449497a5362d9a06a2ae85431fbc1bc7771e0a6184eb9dd95ec23e46c2@group.calendar.google.com'
 MY_CAL   = 'chae@aination.kr'
 
-def main():
-    service = get_calendar_service()
-    # List all available calendars
-    #calendars = list_calendars(service)
-    #if not calendars:
-    #    return
-
-    # Get events for selected calendar
-    #msg = get_todays_calendar_events(service, TEST_CAL)
-    #slack = AinSlack("/home/scchae/work/tigris/slack_credential.json")
-    #thread_id = slack.send_message(msg)
-
-    # ScheduleManager 인스턴스 생성
-    manager = ScheduleManager()
-    session = requests.session()
+def login_tigris(session: requests.Session):
+    """
+    Tigris 로그인 (세션 쿠키에 로그인 상태 저장)
+    Args:
+        session: Tigris용 requests 세션
+    """
     login_info = {
         "loginId": os.environ["TIGRIS_LOGIN_ID"],
         "passwd": os.environ["TIGRIS_PASSWORD"],
     }
 
     #POST로 데이터 보내기
-    url_login = "https://www.tigrison.com/login"
-    this_month=datetime.datetime.now().strftime("%Y%m")
-#    this_month="202411"
-    url_calendar = "https://www.tigrison.com/schedule/%s?scheduleType=ALL&communityId="%this_month
-
+    url_login = f"{TIGRIS_URL}/login"
     res = session.post(url_login, data = login_info, verify=False)
     res.raise_for_status() #오류 발생하면 예외 발생
     print(res.status_code)
     print(res.text)
     print(res.headers)
     print("===============")
+
+
+def sync_schedules(session: requests.Session, service, manager: ScheduleManager) -> int:
+    """
+    이번 달 Tigris 일정 중 새 일정을 Google Calendar(AIN_CAL)에 등록
+    Args:
+        session: 로그인된 Tigris 세션
+        service: Google Calendar 서비스 객체
+        manager: 동기화된 일정 기록용 ScheduleManager
+    Returns:
+        새로 등록한 일정 수
+    """
+    this_month=datetime.datetime.now().strftime("%Y%m")
+#    this_month="202411"
+    url_calendar = f"{TIGRIS_URL}/schedule/%s?scheduleType=ALL&communityId="%this_month
+
     res = session.get(url_calendar)
     print(res.status_code)
     print(type(res.text))
     data = json.loads(res.text)
+    created = 0
     for d in data:
         if d.get('scheduleId') and 'title' in d and 'text' in d and 'startDate' in d and 'startHm' in d and 'endHm' in d:
             # 단일 스케줄 처리
@@ -274,6 +256,28 @@ def main():
                 event = create_calendar_event(d)
                 created_event = service.events().insert(calendarId=AIN_CAL, body=event).execute()
                 print('Event created: %s' % (created_event.get('htmlLink')))
+                created += 1
+    return created
+
+
+def main():
+    service = get_calendar_service()
+    # List all available calendars
+    #calendars = list_calendars(service)
+    #if not calendars:
+    #    return
+
+    # Get events for selected calendar
+    #msg = get_todays_calendar_events(service, TEST_CAL)
+    #from util.ain_slack import AinSlack
+    #slack = AinSlack("/home/scchae/work/tigris/slack_credential.json")
+    #thread_id = slack.send_message(msg)
+
+    # ScheduleManager 인스턴스 생성
+    manager = ScheduleManager(SCHEDULES_DB)
+    session = requests.session()
+    login_tigris(session)
+    sync_schedules(session, service, manager)
 
 
 if __name__ == "__main__":
@@ -12,6 +12,8 @@ SLACK_CREDENTIAL_NOTICE = os.path.join(BASE_DIR, "credential", "slack_credential
 SLACK_CREDENTIAL_TEST = os.path.join(BASE_DIR, "credential", "slack_credential_test.json")
 NOTICE_DB = os.path.join(BASE_DIR, "notice.db")
 
+TIGRIS_URL = "https://www.tigrison.com"
+
 load_dotenv(CREDENTIAL_ENV)
 
 
@@ -32,20 +34,34 @@ class NoticeManager:
         return True
 
 
-def main():
-    # Tigris 로그인
-    session = requests.session()
+def login_tigris(session: requests.Session):
+    """
+    Tigris 로그인 (세션 쿠키에 로그인 상태 저장)
+    Args:
+        session: Tigris용 requests 세션
+    """
     login_info = {
         "loginId": os.environ["TIGRIS_LOGIN_ID"],
         "passwd": os.environ["TIGRIS_PASSWORD"],
     }
-    url_login = "https://www.tigrison.com/login"
+    url_login = f"{TIGRIS_URL}/login"
     res = session.post(url_login, data=login_info, verify=False)
     res.raise_for_status()
     print(f"로그인: {res.status_code}")
 
+
+def poll_notices(session: requests.Session, slack: AinSlack, manager: NoticeManager) -> int:
+    """
+    Tigris 공지사항 중 새 공지를 Slack으로 전송
+    Args:
+        session: 로그인된 Tigris 세션
+        slack: 공지 전송용 AinSlack
+        manager: 전송한 공지 기록용 NoticeManager
+    Returns:
+        새로 전송한 공지 수
+    """
     # 공지사항 조회
-    res = session.get("https://www.tigrison.com/feed/notices", verify=False)
+    res = session.get(f"{TIGRIS_URL}/feed/notices", verify=False)
     res.raise_for_status()
     data = res.json()
     notices = data.get("data", [])
@@ -53,13 +69,9 @@ def main():
 
     if not notices:
         print("새 공지사항 없음")
-        return
-
-    # NoticeManager로 중복 검사
-    manager = NoticeManager()
+        return 0
 
     # Slack 메시지 전송
-    slack = AinSlack(SLACK_CREDENTIAL_NOTICE)
     new_count = 0
     for notice in notices:
         if not manager.check_and_save_notice(notice):
@@ -78,6 +90,18 @@ def main():
         slack.send_message(msg)
 
     print(f"Slack 전송 완료 (새 공지: {new_count}건, 기존: {len(notices) - new_count}건)")
+    return new_count
+
+
+def main():
+    # Tigris 로그인
+    session = requests.session()
+    login_tigris(session)
+
+    # NoticeManager로 중복 검사
+    manager = NoticeManager(NOTICE_DB)
+    slack = AinSlack(SLACK_CREDENTIAL_NOTICE)
+    poll_notices(session, slack, manager)
 
 
 if __name__ == "__main__":
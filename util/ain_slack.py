@@ -1,6 +1,7 @@
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 import json
+from util.trace import traced
 
 class AinSlack:
     def __init__(self, credential_path):
@@ -14,17 +15,23 @@ class AinSlack:
                 credentials = json.load(f)
                 self.slack_token = credentials.get('slack_token')
                 self.channel_id = credentials.get('channel_id')
+                # Slack API 주소 (벤치마크용 대체 서버 등, 기본값: slack_sdk 기본 주소)
+                self.base_url = credentials.get('base_url')
                 
             if not self.slack_token or not self.channel_id:
                 raise ValueError("slack_token과 channel_id가 필요합니다")
                 
-            self.client = WebClient(token=self.slack_token)
+            if self.base_url:
+                self.client = WebClient(token=self.slack_token, base_url=self.base_url)
+            else:
+                self.client = WebClient(token=self.slack_token)
             
         except FileNotFoundError:
             raise FileNotFoundError(f"Credential 파일을 찾을 수 없습니다: {credential_path}")
         except json.JSONDecodeError:
             raise ValueError(f"Credential 파일이 올바른 JSON 형식이 아닙니다: {credential_path}")
 
+    @traced()
     def send_message(self, message, blocks=None):
         """
         Slack 채널에 메시지 전송
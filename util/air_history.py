@@ -0,0 +1,300 @@
+"""
+측정소별 대기질 시계열 (고정 크기 링 버퍼)
+- 측정소마다 cache/airkorea_history/<측정소>.bin 파일 하나에 시간별 PM10/PM2.5를 저장
+- 슬롯 위치는 (측정 시각 % HISTORY_HOURS)로 정해지므로 같은 측정 시각은 같은 슬롯에 덮어써서 중복 제거,
+  파일 크기는 항상 일정 (헤더 12바이트 + 슬롯 12바이트 x HISTORY_HOURS)
+- 특정 시각 값 조회는 슬롯 하나만 읽음 (어제 같은 시각 비교, 추세)
+- 최근 AVERAGE_HOURS시간 이동 평균은 항목별 합계/개수를 값이 들어오거나 구간에서 빠질 때 갱신해서 O(1)로 계산
+- 헤더에 마지막 24시간 보충 조회 시각을 기록 (보충 조회는 하루 한 번까지)
+
+사용법:
+    history = AirHistory("서초구")
+    history.ingest(items)               # 에어코리아 item 리스트 (새 측정값만 반영)
+    history.save()
+    history.day_over_day("pm25")        # (현재 값, 어제 같은 시각 값)
+    history.rolling_average("pm10", 24)
+"""
+
+import datetime
+import math
+import os
+import struct
+import sys
+
+from util import cache
+
+HISTORY_DIR_NAME = "airkorea_history"
+
+# 보관할 시간 수 (8일: 어제 같은 시각 비교와 일주일 평균에 충분)
+HISTORY_HOURS = 24 * 8
+
+# 합계를 유지하는 이동 평균 구간 (시간)
+AVERAGE_HOURS = 24
+
+HEADER = struct.Struct("<4sIi")  # 형식 식별자, 슬롯 수, 마지막 보충 조회 시각 (시간 번호, 없으면 -1)
+RECORD = struct.Struct("<iff")  # 측정 시각 (1970-01-01 00:00 KST부터 시간 수), PM10, PM2.5
+MAGIC = b"AQH2"
+EMPTY_HOUR = -1
+
+KINDS = {"pm10": 1, "pm25": 2}
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_data_time(data_time: str) -> int:
+    """
+    에어코리아 dataTime을 시간 번호로 변환 ("2026-10-16 24:00"은 다음 날 00:00)
+    Args:
+        data_time: 'YYYY-MM-DD HH:MM'
+    Returns:
+        1970-01-01 00:00부터의 시간 수
+    """
+    date_str, time_str = data_time.split()
+    date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
+    return (date - EPOCH) // datetime.timedelta(hours=1) + int(time_str[:2])
+
+
+def format_hour(hour: int) -> str:
+    """시간 번호를 'YYYY-MM-DD HH:00'으로 변환"""
+    return (EPOCH + datetime.timedelta(hours=hour)).strftime("%Y-%m-%d %H:00")
+
+
+def _to_float(value) -> float:
+    """측정값 문자열을 float로 변환 (점검중 '-', 빈 값은 NaN)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class AirHistory:
+    """측정소 하나의 시간별 PM10/PM2.5 링 버퍼"""
+
+    def __init__(self, station_name: str, hours: int = HISTORY_HOURS):
+        """
+        초기화 (파일이 있으면 로드, 없거나 형식이 다르면 빈 버퍼)
+        Args:
+            station_name: 측정소 이름
+            hours: 슬롯 수
+        """
+        self.station_name = station_name
+        self.hours = hours
+        self.buffer = bytearray(HEADER.size + RECORD.size * hours)
+        HEADER.pack_into(self.buffer, 0, MAGIC, hours, EMPTY_HOUR)
+        for slot in range(hours):
+            RECORD.pack_into(self.buffer, self._offset(slot), EMPTY_HOUR, math.nan, math.nan)
+        self.latest_hour = None
+        self.dirty = False
+        # 최근 AVERAGE_HOURS시간 (latest_hour까지) 항목별 합계와 값 개수
+        self.sums = dict.fromkeys(KINDS, 0.0)
+        self.counts = dict.fromkeys(KINDS, 0)
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        if len(data) == len(self.buffer) and HEADER.unpack_from(data, 0)[:2] == (MAGIC, hours):
+            self.buffer[:] = data
+            stored = [RECORD.unpack_from(self.buffer, self._offset(slot))[0] for slot in range(hours)]
+            self.latest_hour = max(stored) if max(stored) != EMPTY_HOUR else None
+            if self.latest_hour is not None:
+                for hour in range(self.latest_hour - AVERAGE_HOURS + 1, self.latest_hour + 1):
+                    self._add_to_window(self._read(hour), 1)
+
+    @property
+    def backfilled_hour(self):
+        """마지막 보충 조회 시각 (시간 번호, 없으면 None)"""
+        hour = HEADER.unpack_from(self.buffer, 0)[2]
+        return None if hour == EMPTY_HOUR else hour
+
+    def mark_backfilled(self, hour: int):
+        """보충 조회 시각 기록"""
+        HEADER.pack_into(self.buffer, 0, MAGIC, self.hours, hour)
+        self.dirty = True
+
+    @property
+    def path(self) -> str:
+        """버퍼 파일 경로 (cache.CACHE_DIR은 호출 시점 값 사용)"""
+        return os.path.join(cache.CACHE_DIR, HISTORY_DIR_NAME, f"{self.station_name}.bin")
+
+    def _offset(self, slot: int) -> int:
+        return HEADER.size + RECORD.size * slot
+
+    def _read(self, hour: int):
+        """시간 번호의 슬롯 (다른 시각 값으로 덮였거나 비었으면 None)"""
+        record = RECORD.unpack_from(self.buffer, self._offset(hour % self.hours))
+        return record if record[0] == hour else None
+
+    def _add_to_window(self, record, sign: int):
+        """이동 평균 합계에 측정값 더하기(sign=1)/빼기(sign=-1) (NaN은 제외)"""
+        if record is None:
+            return
+        for kind, index in KINDS.items():
+            if not math.isnan(record[index]):
+                self.sums[kind] += sign * record[index]
+                self.counts[kind] += sign
+
+    def _in_window(self, hour: int) -> bool:
+        return self.latest_hour is not None and self.latest_hour - AVERAGE_HOURS < hour <= self.latest_hour
+
+    def put(self, hour: int, pm10: float, pm25: float) -> bool:
+        """
+        측정값 하나 저장 (버퍼보다 오래된 값은 무시)
+        Args:
+            hour: 시간 번호
+            pm10, pm25: 측정값 (없으면 NaN)
+        Returns:
+            값이 새로 들어가거나 바뀌었는지 여부
+        """
+        if self.latest_hour is not None and hour <= self.latest_hour - self.hours:
+            return False
+        current = self._read(hour)
+        if current is not None and _same(current[1], pm10) and _same(current[2], pm25):
+            return False
+        if self._in_window(hour):
+            self._add_to_window(current, -1)
+        if self.latest_hour is None or hour > self.latest_hour:
+            # 구간이 앞으로 이동하면 빠지는 시간의 값만 합계에서 뺌 (최대 AVERAGE_HOURS개)
+            if self.latest_hour is not None:
+                first_kept = hour - AVERAGE_HOURS + 1
+                for old in range(self.latest_hour - AVERAGE_HOURS + 1, min(first_kept, self.latest_hour + 1)):
+                    self._add_to_window(self._read(old), -1)
+            self.latest_hour = hour
+        record = (hour, pm10, pm25)
+        RECORD.pack_into(self.buffer, self._offset(hour % self.hours), *record)
+        if self._in_window(hour):
+            self._add_to_window(RECORD.unpack(RECORD.pack(*record)), 1)
+        self.dirty = True
+        return True
+
+    def ingest(self, items: list) -> int:
+        """
+        에어코리아 item 리스트 반영 (dataTime 기준 중복 제거)
+        Args:
+            items: 측정소별/시도별 실시간 측정 item 리스트
+        Returns:
+            새로 들어가거나 바뀐 측정값 수
+        """
+        changed = 0
+        for item in items:
+            if not item or not item.get('dataTime'):
+                continue
+            if self.put(parse_data_time(item['dataTime']),
+                        _to_float(item.get('pm10Value')), _to_float(item.get('pm25Value'))):
+                changed += 1
+        return changed
+
+    def save(self):
+        """바뀐 내용이 있으면 파일에 저장 (임시 파일에 쓰고 교체)"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.buffer)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def value(self, kind: str, hour: int = None):
+        """
+        특정 시각 측정값
+        Args:
+            kind: "pm10" 또는 "pm25"
+            hour: 시간 번호 (기본값: 최신 측정 시각)
+        Returns:
+            측정값 (없으면 None)
+        """
+        hour = self.latest_hour if hour is None else hour
+        if hour is None:
+            return None
+        record = self._read(hour)
+        if record is None or math.isnan(record[KINDS[kind]]):
+            return None
+        return record[KINDS[kind]]
+
+    def coverage(self, hours: int = 24, end: int = None) -> int:
+        """
+        최근 hours시간 중 측정값이 있는 시간 수
+        Args:
+            hours: 구간 길이
+            end: 구간 마지막 시간 번호 (기본값: 최신 측정 시각)
+        """
+        end = self.latest_hour if end is None else end
+        if end is None:
+            return 0
+        return sum(1 for hour in range(end - hours + 1, end + 1) if self._read(hour) is not None)
+
+    def rolling_average(self, kind: str, hours: int = AVERAGE_HOURS, end: int = None):
+        """
+        최근 hours시간 평균 (측정값이 있는 시간만, 최신 AVERAGE_HOURS시간 구간은 유지 중인 합계로 O(1))
+        Args:
+            kind: "pm10" 또는 "pm25"
+            hours: 구간 길이
+            end: 구간 마지막 시간 번호 (기본값: 최신 측정 시각)
+        Returns:
+            평균 (값이 하나도 없으면 None)
+        """
+        end = self.latest_hour if end is None else end
+        if end is None:
+            return None
+        if hours == AVERAGE_HOURS and end == self.latest_hour:
+            return self.sums[kind] / self.counts[kind] if self.counts[kind] else None
+        values = [v for v in (self.value(kind, hour) for hour in range(end - hours + 1, end + 1))
+                  if v is not None]
+        return sum(values) / len(values) if values else None
+
+    def trend(self, kind: str, hours: int = 3):
+        """
+        최근 hours시간 변화량 (최신 값 - hours시간 전 값)
+        Args:
+            kind: "pm10" 또는 "pm25"
+            hours: 비교할 시간 간격
+        Returns:
+            변화량 (둘 중 하나라도 없으면 None)
+        """
+        current = self.value(kind)
+        before = self.value(kind, self.latest_hour - hours) if self.latest_hour is not None else None
+        if current is None or before is None:
+            return None
+        return current - before
+
+    def day_over_day(self, kind: str):
+        """
+        최신 값과 어제 같은 시각 값
+        Args:
+            kind: "pm10" 또는 "pm25"
+        Returns:
+            (현재 값, 어제 같은 시각 값) (없는 값은 None)
+        """
+        if self.latest_hour is None:
+            return None, None
+        return self.value(kind), self.value(kind, self.latest_hour - 24)
+
+
+def _same(a: float, b: float) -> bool:
+    """float32로 저장된 값과 새 값 비교 (NaN끼리는 같음)"""
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return abs(a - b) < 1e-3
+
+
+def main():
+    # 사용법: python -m util.air_history [측정소 이름]
+    station_name = sys.argv[1] if len(sys.argv) > 1 else "서초구"
+    history = AirHistory(station_name)
+    if history.latest_hour is None:
+        print(f"{station_name} 측정 기록이 없습니다: {history.path}")
+        return
+
+    print(f"{station_name} 최신 측정: {format_hour(history.latest_hour)} "
+          f"(최근 24시간 중 {history.coverage(24)}시간 기록)")
+    for kind in KINDS:
+        current, yesterday = history.day_over_day(kind)
+        average = history.rolling_average(kind, 24)
+        print(f"  {kind}: 현재 {current}, 어제 같은 시각 {yesterday}, 3시간 변화 {history.trend(kind)}, "
+              f"24시간 평균 {average if average is None else round(average, 1)}")
+
+
+if __name__ == "__main__":
+    main()
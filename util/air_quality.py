@@ -1,14 +1,67 @@
-import requests
+"""
+에어코리아 실시간 대기질 조회
+- 시도별 실시간 측정정보(getCtprvnRltmMesureDnsty)로 시도 전체 측정소를 한 번에 조회하고
+  cache/airkorea_sido/에 측정 시각 단위로 저장 (같은 시간대에는 시도당 한 번만 요청)
+- 위치는 측정소 목록(getMsrstnList)으로 만든 색인에서 가장 가까운 측정소로 변환
+- 시도 조회 결과에 측정소가 없으면 측정소별 조회(getMsrstnAcctoRltmMesureDnsty)로 대체
+
+사용법:
+    get_air_quality()                          # 기본 측정소 (서초구)
+    get_air_quality("부산광역시 해운대구")       # 가장 가까운 측정소
+    get_air_quality_for_locations(["양재1동", "해운대구"])
+"""
+
+import contextvars
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import arrow
 from dotenv import load_dotenv
+from util.cache import JsonFileCache
+from util.clients import get_session
+from util import snapshot
+from util.air_history import AirHistory
+from util.location import build_buckets, find_nearest, resolve_location
+from util.trace import span, traced
 
 load_dotenv()
 
 GONGGONG_API_KEY = os.environ.get("GONGGONG_API_KEY", "")
 
 api_url = "https://apis.data.go.kr/B552584/ArpltnInforInqireSvc/getMsrstnAcctoRltmMesureDnsty"
+sido_url = "https://apis.data.go.kr/B552584/ArpltnInforInqireSvc/getCtprvnRltmMesureDnsty"
+station_list_url = "https://apis.data.go.kr/B552584/MsrstnInfoInqireSvc/getMsrstnList"
 
+# 기본 측정소 (위치를 지정하지 않은 경우)
 STATION_NAME = "서초구"
+STATION_SIDO = "서울"
+
+# 매시 측정값이 API에 반영되는 시각 (분). 이 시각 전에는 이전 시간대 측정값 사용
+PUBLISH_DELAY_MINUTES = 15
+
+# 시도별 측정값은 측정 시각 단위, 측정소 목록은 월 단위로 캐시
+sido_cache = JsonFileCache("airkorea_sido", 1)
+station_cache = JsonFileCache("airkorea_stations", 62)
+
+# 시도 이름 → 에어코리아 시도 이름 (sidoName 파라미터 값)
+SIDO_NAMES = {
+    "서울특별시": "서울", "부산광역시": "부산", "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전", "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원도": "강원", "강원특별자치도": "강원", "충청북도": "충북",
+    "충청남도": "충남", "전라북도": "전북", "전북특별자치도": "전북", "전라남도": "전남",
+    "경상북도": "경북", "경상남도": "경남", "제주특별자치도": "제주",
+}
+
+# 동시에 조회할 시도 수
+MAX_SIDO_WORKERS = 4
+
+# 측정소 기록이 비었거나 가장 최근 기록이 이보다 오래되었으면 측정소별 조회(dataTerm=DAILY, 24시간)로 채움
+HISTORY_BACKFILL_HOURS = 24
+
+# 측정소별 보충 조회 최소 간격 (시간, 하루 한 번까지)
+HISTORY_BACKFILL_INTERVAL = 24
 
 GRADE_EMOJI = {
     '1': '😊',
@@ -24,28 +77,329 @@ GRADE_LABEL = {
     '4': '매우나쁨',
 }
 
+_lock = threading.Lock()
+_sido_locks = {}
+_station_index = None
+
+
+def _sido_name(address: str) -> str:
+    """주소 첫 단어를 에어코리아 시도 이름으로 변환 ("서울 중구 ..." / "서울특별시 중구 ..." → "서울")"""
+    first = address.split()[0] if address else ""
+    return SIDO_NAMES.get(first, first)
+
+
+def fetch_station_list() -> list:
+    """
+    에어코리아 측정소 목록 조회
+    Returns:
+        [{"stationName", "sido", "lat", "lon"}, ...] (좌표가 없는 측정소는 제외)
+    """
+    params = {
+        'serviceKey': GONGGONG_API_KEY,
+        'returnType': 'json',
+        'numOfRows': '1000',
+        'pageNo': '1',
+    }
+    with span("airkorea.station_list"):
+        response = get_session().get(station_list_url, params=params, timeout=10)
+        response.raise_for_status()
+        items = response.json()['response']['body']['items']
+
+    stations = []
+    for item in items:
+        try:
+            lat, lon = float(item['dmX']), float(item['dmY'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        stations.append({"stationName": item['stationName'], "sido": _sido_name(item.get('addr', '')),
+                         "lat": lat, "lon": lon})
+    return stations
+
+
+def load_station_index() -> dict:
+    """
+    가장 가까운 측정소 검색용 색인 (프로세스당 한 번, 측정소 목록은 월 단위로 캐시)
+    Returns:
+        {"stations": fetch_station_list 결과, "buckets": {버킷: [측정소 번호, ...]}}
+    """
+    global _station_index
+    with _lock:
+        if _station_index is not None:
+            return _station_index
+        key = f"stations_{arrow.now('Asia/Seoul').format('YYYYMM')}"
+        stations = station_cache.get(key)
+        if stations is None:
+            stations = fetch_station_list()
+            station_cache.put(key, stations)
+        _station_index = {
+            "stations": stations,
+            "buckets": build_buckets((s["lat"], s["lon"]) for s in stations),
+        }
+        return _station_index
+
+
+def get_station(location=None) -> dict:
+    """
+    위치에서 가장 가까운 측정소
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: STATION_NAME)
+    Returns:
+        {"stationName", "sido", "lat", "lon", "distance_km"} (기본 측정소는 stationName, sido만)
+    """
+    if location is None:
+        return {"stationName": STATION_NAME, "sido": STATION_SIDO}
+    location = resolve_location(location)
+    index = load_station_index()
+    stations = index["stations"]
+    station_id, distance_km = find_nearest(index["buckets"],
+                                           lambda i: (stations[i]["lat"], stations[i]["lon"]),
+                                           location["lat"], location["lon"])
+    return {**stations[station_id], "distance_km": distance_km}
+
+
+def get_data_hour(now=None) -> str:
+    """
+    API에 반영되었을 최신 측정 시각 (캐시 키)
+    Args:
+        now: 기준 시각 (arrow, 기본값: 현재 KST)
+    Returns:
+        'YYYYMMDDHH'
+    """
+    now = now or arrow.now('Asia/Seoul')
+    return now.shift(minutes=-PUBLISH_DELAY_MINUTES).format("YYYYMMDDHH")
+
+
+def fetch_sido_items(sido: str) -> list:
+    """
+    시도 전체 측정소의 실시간 측정값 조회
+    Args:
+        sido: 에어코리아 시도 이름 ("서울", "부산", ...)
+    Returns:
+        측정소별 item 리스트
+    """
+    params = {
+        'serviceKey': GONGGONG_API_KEY,
+        'returnType': 'json',
+        'numOfRows': '1000',
+        'pageNo': '1',
+        'sidoName': sido,
+        'ver': '1.0',
+    }
+    with span("airkorea.sido", sido=sido):
+        response = get_session().get(sido_url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()['response']['body']['items']
+
+
+def get_sido_items(sido: str, now=None) -> dict:
+    """
+    시도 전체 측정값 (측정 시각 단위 캐시, 같은 시도를 동시에 요청하면 한 번만 조회)
+    Args:
+        sido: 에어코리아 시도 이름
+        now: 기준 시각 (arrow)
+    Returns:
+        {측정소 이름: item}
+    """
+    key = f"{sido}_{get_data_hour(now)}"
+    with _lock:
+        sido_lock = _sido_locks.setdefault(sido, threading.Lock())
+    with sido_lock:
+        items = sido_cache.get(key)
+        if items is None:
+            items = fetch_sido_items(sido)
+            if items:
+                sido_cache.put(key, items)
+    return {item.get('stationName'): item for item in items or []}
+
 
-def get_air_quality() -> str:
-    """에어코리아 API에서 양재동 실시간 미세먼지 정보를 조회하여 문자열로 반환"""
+def fetch_station_items(station_name: str, rows: int = 1) -> list:
+    """
+    측정소 하나의 실시간 측정값 조회 (dataTerm=DAILY, 최신 시각부터 최대 24시간)
+    Args:
+        station_name: 측정소 이름
+        rows: 조회할 시간 수
+    Returns:
+        item 리스트 (최신 시각 순)
+    """
     params = {
         'serviceKey': GONGGONG_API_KEY,
         'returnType': 'json',
-        'numOfRows': '1',
+        'numOfRows': str(rows),
         'pageNo': '1',
-        'stationName': STATION_NAME,
+        'stationName': station_name,
         'dataTerm': 'DAILY',
         'ver': '1.0',
     }
 
-    response = requests.get(api_url, params=params, timeout=10)
+    response = get_session().get(api_url, params=params, timeout=10)
     response.raise_for_status()
-    data = response.json()
+    return response.json()['response']['body']['items'] or []
+
+
+def fetch_station_item(station_name: str):
+    """
+    측정소 하나의 최신 측정값 조회 (시도 조회 결과에 측정소가 없을 때 사용)
+    Args:
+        station_name: 측정소 이름
+    Returns:
+        최신 item (없으면 None)
+    """
+    items = fetch_station_items(station_name)
+    return items[0] if items else None
+
+
+def update_history(station_name: str, item: dict) -> AirHistory:
+    """
+    측정값을 측정소 기록에 반영
+    - 기록이 비었거나 가장 최근 기록이 HISTORY_BACKFILL_HOURS보다 오래되었을 때만 측정소별 24시간 조회로 채움
+      (하루 한 번 실행해도 어제 같은 시각 값은 전날 실행에서 쌓이므로 보통은 추가 요청 없음)
+    - 보충 조회는 측정소마다 HISTORY_BACKFILL_INTERVAL시간에 한 번까지 (실패해도 다시 시도하지 않음)
+    Args:
+        station_name: 측정소 이름
+        item: 최신 측정 item
+    Returns:
+        AirHistory
+    """
+    history = AirHistory(station_name)
+    latest = history.latest_hour
+    history.ingest([item])
+    now = history.latest_hour
+    stale = latest is None or (now is not None and now - latest > HISTORY_BACKFILL_HOURS)
+    backfilled = history.backfilled_hour
+    if stale and now is not None and (backfilled is None or now - backfilled >= HISTORY_BACKFILL_INTERVAL):
+        history.mark_backfilled(now)
+        try:
+            history.ingest(fetch_station_items(station_name, 24))
+        except Exception as e:
+            print(f"{station_name} 측정 기록 조회 실패: {e}")
+    history.save()
+    return history
+
+
+def summarize_history(history: AirHistory) -> dict:
+    """
+    측정소 기록 요약
+    Args:
+        history: AirHistory
+    Returns:
+        {"pm10": {"current", "yesterday", "trend_3h", "average_24h"}, "pm25": {...}} (없는 값은 None)
+    """
+    summary = {}
+    for kind in ("pm10", "pm25"):
+        current, yesterday = history.day_over_day(kind)
+        summary[kind] = {
+            "current": current,
+            "yesterday": yesterday,
+            "trend_3h": history.trend(kind, 3),
+            "average_24h": history.rolling_average(kind, 24),
+        }
+    return summary
+
 
-    items = data['response']['body']['items']
-    if not items:
+def get_station_item(station: dict, now=None):
+    """
+    측정소의 최신 측정값 (시도 조회 우선, 없으면 측정소별 조회)
+    Args:
+        station: get_station 결과
+        now: 기준 시각 (arrow)
+    Returns:
+        item (없으면 None)
+    """
+    item = get_sido_items(station["sido"], now).get(station["stationName"])
+    if item is None:
+        item = fetch_station_item(station["stationName"])
+    return item
+
+
+@traced()
+def get_air_quality(location=None) -> str:
+    """
+    에어코리아 API에서 실시간 미세먼지 정보를 조회하여 문자열로 반환
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: 서초구 측정소)
+    Returns:
+        공기질 문자열
+    """
+    station = get_station(location)
+    item = get_station_item(station)
+    if not item:
         return "공기질 정보를 가져오지 못했습니다."
 
-    item = items[0]
+    trend = summarize_history(update_history(station["stationName"], item))
+    snapshot.record("airkorea_item", item)
+    snapshot.record("airkorea_trend", trend)
+    return format_air_quality(item, trend)
+
+
+def get_air_quality_for_locations(locations, max_workers=MAX_SIDO_WORKERS) -> list:
+    """
+    여러 위치의 공기질 (가장 가까운 측정소의 시도별로 묶어서 시도당 한 번만 조회)
+    - 측정소를 찾지 못하거나 조회에 실패한 위치는 그 위치만 실패 문구
+    Args:
+        locations: 위치 리스트 (행정구역 이름, (위도, 경도), location dict)
+        max_workers: 동시에 조회할 시도 수
+    Returns:
+        locations 순서대로 공기질 문자열 리스트
+    """
+    stations = []
+    for location in locations:
+        try:
+            stations.append(get_station(location))
+        except Exception as e:
+            print(f"위치 {location} 측정소 찾기 실패: {e}")
+            stations.append(None)
+    now = arrow.now('Asia/Seoul')
+    sidos = list(dict.fromkeys(station["sido"] for station in stations if station is not None))
+
+    by_sido = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sidos)))) as executor:
+        futures = {sido: executor.submit(contextvars.copy_context().run, get_sido_items, sido, now)
+                   for sido in sidos}
+        for sido, future in futures.items():
+            try:
+                by_sido[sido] = future.result()
+            except Exception as e:
+                print(f"{sido} 공기질 조회 실패: {e}")
+                by_sido[sido] = {}
+
+    messages = []
+    items = {}
+    trends = {}
+    for station in stations:
+        if station is None:
+            messages.append("공기질 정보를 가져오지 못했습니다.")
+            continue
+        name = station["stationName"]
+        if name not in items:
+            item = by_sido[station["sido"]].get(name)
+            if item is None:
+                try:
+                    item = fetch_station_item(name)
+                except Exception as e:
+                    print(f"{name} 측정소 공기질 조회 실패: {e}")
+            items[name] = item
+            if item:
+                try:
+                    trends[name] = summarize_history(update_history(name, item))
+                except Exception as e:
+                    print(f"{name} 측정 기록 반영 실패: {e}")
+        item = items[name]
+        messages.append(format_air_quality(item, trends.get(name)) if item
+                        else "공기질 정보를 가져오지 못했습니다.")
+
+    snapshot.record("airkorea_items", items)
+    return messages
+
+
+def format_air_quality(item: dict, trend: dict = None) -> str:
+    """
+    에어코리아 측정 item을 브리핑용 공기질 문자열로 변환
+    Args:
+        item: 측정소 실시간 측정 item
+        trend: summarize_history 결과 (있으면 어제 같은 시각 대비 변화와 24시간 평균 줄 추가)
+    Returns:
+        공기질 문자열
+    """
     pm10_value = item.get('pm10Value', '-')
     pm10_grade = item.get('pm10Grade', '')
     pm25_value = item.get('pm25Value', '-')
@@ -56,15 +410,55 @@ def get_air_quality() -> str:
     pm25_emoji = GRADE_EMOJI.get(pm25_grade, '❓')
     pm25_label = GRADE_LABEL.get(pm25_grade, pm25_grade)
 
-    return (
+    msg = (
         f"{pm10_emoji} 미세먼지(PM10): {pm10_value}μg/m³ {pm10_label} | "
         f"{pm25_emoji} 초미세먼지(PM2.5): {pm25_value}μg/m³ {pm25_label}"
     )
+    if trend:
+        trend_msg = format_trend(trend)
+        if trend_msg:
+            msg += f"\n{trend_msg}"
+    return msg
+
+
+def format_trend(trend: dict) -> str:
+    """
+    측정소 기록 요약을 한 줄 문자열로 변환
+    Args:
+        trend: summarize_history 결과
+    Returns:
+        "📊 어제 이맘때보다 미세먼지 +5, 초미세먼지 -3μg/m³ · 24시간 평균 32/15μg/m³" (비교할 값이 없으면 빈 문자열)
+    """
+    labels = {"pm10": "미세먼지", "pm25": "초미세먼지"}
+    changes = []
+    for kind, label in labels.items():
+        current, yesterday = trend[kind]["current"], trend[kind]["yesterday"]
+        if current is not None and yesterday is not None:
+            changes.append(f"{label} {current - yesterday:+.0f}")
+    averages = [trend[kind]["average_24h"] for kind in labels]
+
+    parts = []
+    if changes:
+        parts.append(f"어제 이맘때보다 {', '.join(changes)}μg/m³")
+    if all(average is not None for average in averages):
+        parts.append(f"24시간 평균 {averages[0]:.0f}/{averages[1]:.0f}μg/m³")
+    return f"📊 {' · '.join(parts)}" if parts else ""
 
 
 def main():
-    msg = get_air_quality()
-    print(msg)
+    # 사용법: python -m util.air_quality [행정구역 이름 ...]
+    locations = sys.argv[1:]
+    if len(locations) <= 1:
+        location = locations[0] if locations else None
+        station = get_station(location)
+        distance = f" ({station['distance_km']:.1f}km)" if "distance_km" in station else ""
+        print(f"측정소: {station['sido']} {station['stationName']}{distance}")
+        print(get_air_quality(location))
+        return
+
+    for location, msg in zip(locations, get_air_quality_for_locations(locations)):
+        print(f"[{location}] {msg}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,238 @@
+"""
+근무일 비트맵 달력
+- 연도마다 근무일(주말, 공휴일, 대체공휴일 제외)과 공휴일을 각각 int 비트셋 하나로 계산 (비트 i = 1월 1일부터 i일째)
+- 특일 정보는 util.todayinfo의 연도 저장소를 사용하고, 저장소가 다시 조회되면 비트맵도 다시 계산
+- 근무일 여부는 비트 하나, 다음/이전 근무일은 최하위/최상위 비트, 기간 내 근무일 수는 bit_count로 계산
+- 브리핑 문구(describe_business_days)는 필요한 연도를 한 번에 로드하고, 특일 정보를 못 받은 연도가 있으면 생략
+
+사용법:
+    is_business_day(date)                       # 근무일 여부
+    next_business_day(date)                     # 다음 근무일
+    count_business_days(start, end)             # 기간 내 근무일 수 (양 끝 포함)
+    days_until_holiday(date)                    # (다음 공휴일까지 일수, 공휴일 이름)
+"""
+
+import datetime
+import threading
+
+from util import todayinfo
+
+# 다음/이전 근무일, 공휴일을 찾을 때 확인할 최대 연도 수
+MAX_SEARCH_YEARS = 2
+
+_lock = threading.Lock()
+_bitmaps = {}
+
+
+def _to_date(date) -> datetime.date:
+    """datetime.date, datetime.datetime, arrow.Arrow를 datetime.date로 변환 (None이면 오늘)"""
+    if date is None:
+        KST = datetime.timezone(datetime.timedelta(hours=9))
+        return datetime.datetime.now(KST).date()
+    if isinstance(date, datetime.datetime):
+        return date.date()
+    if isinstance(date, datetime.date):
+        return date
+    return date.date()  # arrow.Arrow
+
+
+def build_year_bitmap(year: int, holidays: list) -> dict:
+    """
+    연도 비트맵 생성
+    Args:
+        year: 연도
+        holidays: 쉬는 공휴일 리스트 [{"date": "YYYYMMDD", "name": ...}] (todayinfo 색인의 holidays)
+    Returns:
+        {"year", "days": 연도 일수, "business": 근무일 비트셋, "holidays": 공휴일 비트셋,
+         "holiday_names": {비트 번호: 공휴일 이름}}
+    """
+    first = datetime.date(year, 1, 1)
+    days = (datetime.date(year + 1, 1, 1) - first).days
+
+    # 주말 비트셋: 1월 1일 요일부터 토/일 위치에 비트
+    weekend = 0
+    for i in range((5 - first.weekday()) % 7, days, 7):
+        weekend |= 1 << i
+    for i in range((6 - first.weekday()) % 7, days, 7):
+        weekend |= 1 << i
+
+    holiday_bits = 0
+    holiday_names = {}
+    for holiday in holidays:
+        date = datetime.datetime.strptime(holiday['date'], "%Y%m%d").date()
+        if date.year != year:
+            continue
+        i = (date - first).days
+        holiday_bits |= 1 << i
+        holiday_names.setdefault(i, holiday['name'])
+
+    all_days = (1 << days) - 1
+    return {
+        "year": year,
+        "days": days,
+        "business": all_days & ~(weekend | holiday_bits),
+        "holidays": holiday_bits,
+        "holiday_names": holiday_names,
+    }
+
+
+def get_year_bitmap(year: int) -> dict:
+    """
+    연도 비트맵 (특일 저장소가 다시 조회되었으면 다시 계산)
+    Args:
+        year: 연도
+    Returns:
+        build_year_bitmap 결과
+    """
+    index = todayinfo.load_year(year)
+    with _lock:
+        bitmap = _bitmaps.get(year)
+        if bitmap is None or bitmap["fetched_at"] != index["fetched_at"]:
+            bitmap = build_year_bitmap(year, index["holidays"])
+            bitmap["fetched_at"] = index["fetched_at"]
+            _bitmaps[year] = bitmap
+        return bitmap
+
+
+def _position(date: datetime.date) -> int:
+    """연도 안에서 날짜의 비트 번호"""
+    return date.timetuple().tm_yday - 1
+
+
+def _next_bit(key: str, date: datetime.date, include: bool):
+    """date 이후(include면 당일 포함) 처음으로 key 비트셋에 비트가 있는 (날짜, 비트 번호)"""
+    start = _position(date) + (0 if include else 1)
+    for year in range(date.year, date.year + MAX_SEARCH_YEARS + 1):
+        bits = get_year_bitmap(year)[key] >> start
+        if bits:
+            i = start + (bits & -bits).bit_length() - 1
+            return datetime.date(year, 1, 1) + datetime.timedelta(days=i), i
+        start = 0
+    return None, None
+
+
+def _previous_bit(key: str, date: datetime.date, include: bool):
+    """date 이전(include면 당일 포함) 마지막으로 key 비트셋에 비트가 있는 (날짜, 비트 번호)"""
+    end = _position(date) - (0 if include else 1)
+    for year in range(date.year, date.year - MAX_SEARCH_YEARS - 1, -1):
+        if end >= 0:
+            bits = get_year_bitmap(year)[key] & ((1 << (end + 1)) - 1)
+            if bits:
+                i = bits.bit_length() - 1
+                return datetime.date(year, 1, 1) + datetime.timedelta(days=i), i
+        end = (datetime.date(year, 1, 1) - datetime.date(year - 1, 1, 1)).days - 1
+    return None, None
+
+
+def is_business_day(date=None) -> bool:
+    """
+    근무일 여부 (주말, 공휴일, 대체공휴일이 아닌 날)
+    Args:
+        date: 날짜 (datetime.date / arrow, 기본값: 오늘)
+    Returns:
+        근무일이면 True
+    """
+    date = _to_date(date)
+    return bool(get_year_bitmap(date.year)["business"] >> _position(date) & 1)
+
+
+def next_business_day(date=None, include_today: bool = False):
+    """
+    다음 근무일
+    Args:
+        date: 기준 날짜 (기본값: 오늘)
+        include_today: 기준 날짜가 근무일이면 기준 날짜 반환
+    Returns:
+        datetime.date (MAX_SEARCH_YEARS 안에 없으면 None)
+    """
+    return _next_bit("business", _to_date(date), include_today)[0]
+
+
+def previous_business_day(date=None, include_today: bool = False):
+    """
+    이전 근무일
+    Args:
+        date: 기준 날짜 (기본값: 오늘)
+        include_today: 기준 날짜가 근무일이면 기준 날짜 반환
+    Returns:
+        datetime.date (MAX_SEARCH_YEARS 안에 없으면 None)
+    """
+    return _previous_bit("business", _to_date(date), include_today)[0]
+
+
+def count_business_days(start, end) -> int:
+    """
+    기간 내 근무일 수 (양 끝 포함, start가 end보다 늦으면 0)
+    Args:
+        start: 시작 날짜
+        end: 끝 날짜
+    Returns:
+        근무일 수
+    """
+    start, end = _to_date(start), _to_date(end)
+    count = 0
+    for year in range(start.year, end.year + 1):
+        bitmap = get_year_bitmap(year)
+        low = _position(start) if year == start.year else 0
+        high = _position(end) if year == end.year else bitmap["days"] - 1
+        if low <= high:
+            count += (bitmap["business"] >> low & ((1 << (high - low + 1)) - 1)).bit_count()
+    return count
+
+
+def days_until_holiday(date=None) -> tuple:
+    """
+    다음 공휴일까지 남은 일수 (기준 날짜 다음 날부터 검색)
+    Args:
+        date: 기준 날짜 (기본값: 오늘)
+    Returns:
+        (남은 일수, 공휴일 이름) (MAX_SEARCH_YEARS 안에 없으면 (None, None))
+    """
+    date = _to_date(date)
+    holiday, i = _next_bit("holidays", date, False)
+    if holiday is None:
+        return None, None
+    return (holiday - date).days, get_year_bitmap(holiday.year)["holiday_names"][i]
+
+
+def describe_business_days(date=None) -> str:
+    """
+    브리핑용 근무일 정보
+    Args:
+        date: 기준 날짜 (기본값: 오늘)
+    Returns:
+        "이번 달 남은 근무일은 오늘 포함 10일, 다음 공휴일(개천절)까지 5일 남았습니다."
+        (특일 정보를 못 받은 연도가 있으면 빈 문자열)
+    """
+    date = _to_date(date)
+    # 검색할 연도를 한 번에(동시에) 로드하고, 실패한 연도가 있으면 연도별로 다시 조회하지 않고 생략
+    indexes = todayinfo.load_years(list(range(date.year, date.year + MAX_SEARCH_YEARS + 1)))
+    if not all(todayinfo.is_loaded(index) for index in indexes.values()):
+        print("특일 정보가 없어 근무일 정보를 생략합니다")
+        return ""
+    month_end = (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1) - datetime.timedelta(days=1)
+    msg = f"이번 달 남은 근무일은 오늘 포함 {count_business_days(date, month_end)}일"
+    days, name = days_until_holiday(date)
+    if days is not None:
+        msg += f", 다음 공휴일({name})까지 {days}일"
+    return msg + " 남았습니다."
+
+
+def main():
+    """근무일 계산 예제"""
+    import time
+
+    today = _to_date(None)
+    started = time.perf_counter()
+    get_year_bitmap(today.year)
+    print(f"비트맵 준비: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    year_end = datetime.date(today.year, 12, 31)
+    print(f"오늘({today}) 근무일: {is_business_day(today)}")
+    print(f"이전 근무일: {previous_business_day(today)}, 다음 근무일: {next_business_day(today)}")
+    print(f"올해 남은 근무일: {count_business_days(today, year_end)}일")
+    print(describe_business_days(today))
+
+
+if __name__ == "__main__":
+    main()
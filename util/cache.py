@@ -0,0 +1,104 @@
+"""
+JSON 파일 캐시
+- 키별로 cache/<이름>/<키>.json 파일에 저장해서 실행 간에 재사용 (cron 실행마다 새 프로세스여도 유지)
+- 같은 프로세스 안에서는 메모리에도 보관 (daemon 모드에서 파일을 다시 읽지 않음)
+- 유효 기간은 호출하는 쪽이 키로 정함 (예: 기상청 발표 시각을 키에 포함하면 다음 발표 전까지 유효)
+
+사용법:
+    cache = JsonFileCache("kma_forecast", max_age_days=2)
+    items = cache.get("20261017_0500_61_125")
+    cache.put("20261017_0500_61_125", items)
+"""
+
+import json
+import os
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+
+
+class JsonFileCache:
+    """키별 JSON 파일 캐시"""
+
+    def __init__(self, name: str, max_age_days: float = 2):
+        """
+        초기화
+        Args:
+            name: 캐시 이름 (CACHE_DIR 아래 디렉토리 이름)
+            max_age_days: 이보다 오래된 파일은 put()할 때 삭제
+        """
+        self.name = name
+        self.max_age = max_age_days * 86400
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.last_prune = 0.0
+
+    @property
+    def directory(self) -> str:
+        """캐시 디렉토리 (CACHE_DIR은 호출 시점 값 사용)"""
+        return os.path.join(CACHE_DIR, self.name)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, default=None):
+        """
+        캐시 값 조회
+        Args:
+            key: 캐시 키 (파일 이름으로 쓸 수 있는 문자열)
+            default: 없을 때 반환할 값
+        Returns:
+            저장된 값
+        """
+        path = self._path(key)
+        with self.lock:
+            if path in self.memory:
+                return self.memory[path]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return default
+        with self.lock:
+            self.memory[path] = value
+        return value
+
+    def put(self, key: str, value):
+        """
+        캐시에 저장 (임시 파일에 쓰고 교체해서 동시에 실행된 프로세스가 깨진 파일을 읽지 않도록 함)
+        Args:
+            key: 캐시 키
+            value: JSON으로 저장 가능한 값
+        """
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.memory[path] = value
+        self.prune()
+
+    def prune(self):
+        """max_age_days보다 오래된 파일 삭제 (한 시간에 한번만 확인)"""
+        now = time.time()
+        if now - self.last_prune < 3600:
+            return
+        self.last_prune = now
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+                    with self.lock:
+                        self.memory.pop(path, None)
+            except OSError:
+                pass
+
+    def clear(self):
+        """메모리에 보관한 값 폐기 (파일은 유지)"""
+        with self.lock:
+            self.memory.clear()
@@ -0,0 +1,150 @@
+"""
+Google Calendar 서비스 생성 (공유 팩토리)
+- token.json 크레덴셜은 프로세스당 한 번 로드하고, 만료 REFRESH_MARGIN_MINUTES 전이면 미리 갱신
+  (브리핑 중에 OAuth 갱신 왕복이 생기지 않도록 daemon 작업/시작 시점에 갱신)
+- 갱신한 토큰은 임시 파일에 쓰고 교체해서 동시에 실행된 프로세스가 깨진 token.json을 읽지 않도록 함
+- discovery 문서는 googleapiclient에 포함된 정적 문서를 한 번만 파싱해서 재사용 (네트워크 요청 없음)
+- 서비스 객체 캐시는 util.clients.get_calendar_service 사용
+
+사용법:
+    service = build_service()                 # 새 서비스 생성
+    refresh_credentials()                     # 만료가 가까우면 토큰 갱신 후 token.json 저장
+"""
+
+import datetime
+import json
+import os
+import threading
+
+from util.trace import span, traced
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_PATH = os.path.join(BASE_DIR, "credential", "token.json")
+
+# If modifying these scopes, delete the file token.json.
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# 남은 유효 시간이 이보다 짧으면 미리 갱신 (액세스 토큰 유효 시간은 1시간)
+REFRESH_MARGIN_MINUTES = 35
+
+_lock = threading.Lock()
+_credentials = None
+_discovery_document = None
+
+
+def get_credentials():
+    """
+    token.json 크레덴셜 (프로세스당 한 번 로드)
+    Returns:
+        google.oauth2.credentials.Credentials (token.json이 없으면 None)
+    """
+    from google.oauth2.credentials import Credentials
+
+    global _credentials
+    with _lock:
+        if _credentials is None and os.path.exists(TOKEN_PATH):
+            _credentials = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+        return _credentials
+
+
+def save_credentials(creds):
+    """
+    크레덴셜을 token.json에 저장 (임시 파일에 쓰고 교체)
+    Args:
+        creds: 저장할 크레덴셜
+    """
+    os.makedirs(os.path.dirname(TOKEN_PATH), exist_ok=True)
+    tmp_path = f"{TOKEN_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as token:
+        token.write(creds.to_json())
+    os.replace(tmp_path, TOKEN_PATH)
+
+
+def expires_in(creds):
+    """
+    액세스 토큰 남은 유효 시간
+    Args:
+        creds: 크레덴셜
+    Returns:
+        datetime.timedelta (토큰이나 만료 시각이 없으면 None)
+    """
+    if creds is None or not creds.token or creds.expiry is None:
+        return None
+    # google-auth의 expiry는 timezone 없는 UTC
+    return creds.expiry - datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def refresh_credentials(margin_minutes: float = REFRESH_MARGIN_MINUTES) -> bool:
+    """
+    만료가 margin_minutes 안으로 다가왔으면 액세스 토큰 갱신 후 token.json 저장
+    (같은 크레덴셜 객체를 갱신하므로 이미 만든 서비스에도 바로 반영)
+    Args:
+        margin_minutes: 미리 갱신할 남은 유효 시간 (분)
+    Returns:
+        갱신했으면 True
+    """
+    creds = get_credentials()
+    if creds is None or not creds.refresh_token:
+        return False
+    with _lock:
+        remaining = expires_in(creds)
+        if remaining is not None and remaining > datetime.timedelta(minutes=margin_minutes):
+            return False
+        from google.auth.transport.requests import Request
+
+        from util import clients
+
+        with span("calendar.refresh_token"):
+            creds.refresh(Request(session=clients.get_session()))
+        save_credentials(creds)
+    print(f"Calendar 토큰 갱신 (만료: {creds.expiry:%H:%M} UTC)")
+    return True
+
+
+def get_discovery_document() -> dict:
+    """
+    Calendar v3 discovery 문서 (googleapiclient 포함 정적 문서, 한 번만 파싱)
+    Returns:
+        discovery 문서 dict
+    """
+    from googleapiclient import discovery_cache
+
+    global _discovery_document
+    with _lock:
+        if _discovery_document is None:
+            _discovery_document = json.loads(discovery_cache.get_static_doc("calendar", "v3"))
+        return _discovery_document
+
+
+@traced()
+def build_service(creds=None):
+    """
+    Google Calendar 서비스 생성 (만료가 가까운 토큰은 먼저 갱신)
+    Args:
+        creds: 사용할 크레덴셜 (기본값: token.json 크레덴셜)
+    Returns:
+        Google Calendar 서비스 객체
+    """
+    from googleapiclient.discovery import build_from_document
+
+    if creds is None:
+        creds = get_credentials()
+        if creds is None:
+            print("ERROR:token.json not exist")
+        else:
+            refresh_credentials()
+    return build_from_document(get_discovery_document(), credentials=creds)
+
+
+def main():
+    """토큰 상태 확인 및 미리 갱신"""
+    creds = get_credentials()
+    if creds is None:
+        print(f"token.json이 없습니다: {TOKEN_PATH}")
+        return
+    print(f"토큰 남은 유효 시간: {expires_in(creds)}")
+    print(f"갱신: {refresh_credentials()}")
+
+
+if __name__ == "__main__":
+    main()
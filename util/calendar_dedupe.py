@@ -0,0 +1,146 @@
+"""
+브리핑 일정 중복 제거 / 묶기
+- 여러 캘린더(AINR_CAL, DATONR_CAL 등)에 같은 일정이 있으면 한 번만 남김
+  (iCalUID가 같거나, 정규화한 제목과 시각이 같으면 같은 일정)
+- "[솔개팀] 이승민 재택근무"처럼 사람별 근태 일정은 종류별로 한 줄로 묶고 사람마다 한 번만 표시
+  ("재택근무: [솔개팀] 이승민, 정종찬")
+- 팀 태그가 있거나 이름이 모두 KNOWN_PEOPLE에 있을 때만 사람별 일정으로 봄
+  ("신입 교육", "해외 출장"처럼 이름이 아닌 말로 시작하는 제목은 그대로 둠)
+- LLM에 중복 판단을 맡기지 않으므로 프롬프트가 짧아지고 일정 항목 결과가 실행마다 같음
+
+사용법:
+    events = unique_events(events)      # to_briefing_events 결과 (여러 캘린더 합친 리스트)
+"""
+
+import re
+import unicodedata
+
+# 사람별로 묶을 근태 일정 종류
+PERSON_EVENT_KINDS = ("재택근무", "재택", "오전반차", "오후반차", "반차", "연차", "휴가", "외근", "출장", "교육")
+
+# 팀 태그 없이도 사람별 일정으로 볼 이름 (daily_briefing 프롬프트의 팀원 목록)
+KNOWN_PEOPLE = frozenset({"이세라", "이승민", "정종찬", "강진형", "최호진", "문영민", "채승철"})
+
+# "[팀] 이름 종류", "[팀] 이름1, 이름2 종류", "이름 종류" (이름은 한글 2~4자)
+PERSON_EVENT_PATTERN = re.compile(
+    r"^(?:\[(?P<team>[^\]]+)\])?\s*"
+    r"(?P<names>[가-힣]{2,4}(?:\s*[,/·]\s*[가-힣]{2,4})*)\s*"
+    rf"(?P<kind>{'|'.join(PERSON_EVENT_KINDS)})$"
+)
+
+
+def normalize_summary(summary: str) -> str:
+    """
+    비교용 제목 정규화 (전각 문자, 공백, 대소문자, 괄호 앞뒤 공백 차이 무시)
+    Args:
+        summary: 일정 제목
+    Returns:
+        정규화한 제목
+    """
+    text = unicodedata.normalize("NFKC", summary or "").casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"\s*([\[\]()])\s*", r"\1", text)
+
+
+def parse_person_event(summary: str):
+    """
+    사람별 근태 일정 제목 분해
+    Args:
+        summary: 일정 제목
+    Returns:
+        (팀 이름 또는 None, [이름, ...], 종류)
+        (근태 일정이 아니거나, 팀 태그가 없는데 KNOWN_PEOPLE에 없는 이름이 있으면 None)
+    """
+    text = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", summary or "")).strip()
+    match = PERSON_EVENT_PATTERN.match(text)
+    if match is None:
+        return None
+    names = [name.strip() for name in re.split(r"[,/·]", match.group("names"))]
+    team = match.group("team").strip() if match.group("team") else None
+    if team is None and not all(name in KNOWN_PEOPLE for name in names):
+        return None
+    return team, names, match.group("kind")
+
+
+def dedupe_events(events: list) -> list:
+    """
+    같은 일정 제거 (처음 나온 일정만 유지)
+    Args:
+        events: 브리핑용 일정 리스트 [{"summary", "start_time", "all_day", "uid"}]
+    Returns:
+        중복을 뺀 일정 리스트 (순서 유지)
+    """
+    seen = set()
+    result = []
+    for event in events:
+        keys = {("text", normalize_summary(event["summary"]), event["start_time"])}
+        if event.get("uid"):
+            keys.add(("uid", event["uid"]))
+        if keys & seen:
+            seen |= keys
+            continue
+        seen |= keys
+        result.append(event)
+    return result
+
+
+def group_person_events(events: list) -> list:
+    """
+    사람별 근태 일정을 (종류, 시각)별로 한 줄로 묶음 (같은 사람은 한 번만)
+    Args:
+        events: 브리핑용 일정 리스트
+    Returns:
+        묶은 일정 리스트 (묶은 일정은 그 종류가 처음 나온 위치에 둠)
+    """
+    result = []
+    groups = {}
+    for event in events:
+        parsed = parse_person_event(event["summary"])
+        if parsed is None:
+            result.append(event)
+            continue
+        team, names, kind = parsed
+        key = (kind, event["start_time"])
+        if key not in groups:
+            groups[key] = {"event": dict(event), "teams": {}}
+            result.append(groups[key]["event"])
+        members = groups[key]["teams"].setdefault(team, [])
+        members += [name for name in names if name not in members]
+
+    for (kind, _), group in groups.items():
+        people = [f"[{team}] {', '.join(names)}" if team else ', '.join(names)
+                  for team, names in group["teams"].items()]
+        group["event"]["summary"] = f"{kind}: {' / '.join(people)}"
+        group["event"].pop("uid", None)
+    return result
+
+
+def unique_events(events: list) -> list:
+    """
+    중복 제거 후 사람별 근태 일정 묶기
+    Args:
+        events: 브리핑용 일정 리스트 (여러 캘린더 합친 리스트)
+    Returns:
+        중복 없는 일정 리스트
+    """
+    return group_person_events(dedupe_events(events))
+
+
+def main():
+    """중복 제거 예제"""
+    events = [
+        {"summary": "[솔개팀] 이승민 재택근무", "start_time": "종일", "all_day": True, "uid": "a@google.com"},
+        {"summary": "[솔개팀]이승민  재택근무", "start_time": "종일", "all_day": True, "uid": "b@google.com"},
+        {"summary": "[솔개팀] 정종찬 재택근무", "start_time": "종일", "all_day": True},
+        {"summary": "[비솔팀] 강진형 연차", "start_time": "종일", "all_day": True},
+        {"summary": "문영민 연차", "start_time": "종일", "all_day": True},
+        {"summary": "신입 교육", "start_time": "14:00", "all_day": False},
+        {"summary": "주간 회의", "start_time": "10:00", "all_day": False, "uid": "c@google.com"},
+        {"summary": "주간회의 (변경)", "start_time": "10:00", "all_day": False, "uid": "c@google.com"},
+    ]
+    for event in unique_events(events):
+        print(f"- {event['start_time']} {event['summary']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+일정 구간 색인 (메모리)
+- 종일 일정은 날짜 구간 [start.date, end.date), 시간 일정은 KST 시각 구간 [start, end)으로 따로 보관
+  (종일 일정을 00:00 시각으로 바꾸지 않음)
+- 각 구간 리스트는 시작 기준으로 정렬하고 가장 긴 일정 길이를 기억해서,
+  겹침 조회는 bisect로 (질의 시작 - 최대 길이, 질의 끝) 범위만 확인
+- 빈 시간 조회는 시간 일정만 바쁜 시간으로 계산 (종일 일정은 재택근무/휴가 표시로 보고 제외)
+
+사용법:
+    index = CalendarIndex(events)                # Calendar API 일정 리스트
+    index.events_on(date)                        # 하루 일정 (종일 일정 먼저, 시간 일정은 시작 시각순)
+    index.overlapping(start, end)                # 시각 구간과 겹치는 일정
+    index.free_slots(date, min_minutes=30)       # 근무 시간 중 빈 시간
+"""
+
+import bisect
+import datetime
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 빈 시간을 찾을 기본 근무 시간
+WORK_START = datetime.time(9, 0)
+WORK_END = datetime.time(18, 0)
+
+
+def is_all_day(event: dict) -> bool:
+    """종일 일정 여부 (start에 dateTime 없이 date만 있음)"""
+    return "dateTime" not in event["start"]
+
+
+def event_span(event: dict) -> tuple:
+    """
+    일정 구간
+    Args:
+        event: Calendar API 일정
+    Returns:
+        종일 일정이면 (시작 date, 끝 date (제외)), 시간 일정이면 (시작 datetime, 끝 datetime) (KST)
+    """
+    if is_all_day(event):
+        return (datetime.date.fromisoformat(event["start"]["date"]),
+                datetime.date.fromisoformat(event["end"]["date"]))
+    return (datetime.datetime.fromisoformat(event["start"]["dateTime"]).astimezone(KST),
+            datetime.datetime.fromisoformat(event["end"]["dateTime"]).astimezone(KST))
+
+
+def day_bounds(date: datetime.date) -> tuple:
+    """날짜의 KST 00:00과 다음 날 00:00"""
+    start = datetime.datetime.combine(date, datetime.time(), tzinfo=KST)
+    return start, start + datetime.timedelta(days=1)
+
+
+class _Intervals:
+    """시작 기준으로 정렬된 구간 리스트 (date 또는 datetime)"""
+
+    def __init__(self, spans: list):
+        """
+        초기화
+        Args:
+            spans: [(시작, 끝, 일정), ...]
+        """
+        spans = sorted(spans, key=lambda span: span[0])
+        self.starts = [span[0] for span in spans]
+        self.ends = [span[1] for span in spans]
+        self.events = [span[2] for span in spans]
+        self.longest = max((end - start for start, end, _ in spans), default=None)
+
+    def overlapping(self, start, end) -> list:
+        """[start, end)와 겹치는 일정 (시작순)"""
+        if self.longest is None:
+            return []
+        low = bisect.bisect_left(self.starts, start - self.longest)
+        high = bisect.bisect_left(self.starts, end)
+        return [self.events[i] for i in range(low, high)
+                if self.ends[i] > start or (self.ends[i] == self.starts[i] == start)]
+
+
+class CalendarIndex:
+    """종일/시간 일정 구간 색인"""
+
+    def __init__(self, events: list):
+        """
+        초기화
+        Args:
+            events: Calendar API 일정 리스트 (취소된 일정 제외)
+        """
+        all_day, timed = [], []
+        for event in events:
+            start, end = event_span(event)
+            (all_day if is_all_day(event) else timed).append((start, end, event))
+        self.all_day = _Intervals(all_day)
+        self.timed = _Intervals(timed)
+
+    def __len__(self):
+        return len(self.all_day.events) + len(self.timed.events)
+
+    def overlapping(self, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        시각 구간과 겹치는 일정 (종일 일정은 해당 날짜 KST 00:00~24:00으로 봄)
+        Args:
+            start: 시작 시각 (포함)
+            end: 끝 시각 (제외)
+        Returns:
+            종일 일정 먼저, 시간 일정은 시작 시각순
+        """
+        start, end = start.astimezone(KST), end.astimezone(KST)
+        # 종일 일정은 날짜 단위로 비교 (end가 자정이 아니면 end 날짜까지 포함)
+        end_date = end.date() if end.time() == datetime.time() else end.date() + datetime.timedelta(days=1)
+        return self.all_day.overlapping(start.date(), end_date) + self.timed.overlapping(start, end)
+
+    def events_on(self, date: datetime.date) -> list:
+        """
+        하루 일정
+        Args:
+            date: 날짜
+        Returns:
+            종일 일정 먼저, 시간 일정은 시작 시각순
+        """
+        return self.overlapping(*day_bounds(date))
+
+    def events_by_day(self, start_date: datetime.date, days: int) -> dict:
+        """
+        날짜별 일정 (주간 요약 등)
+        Args:
+            start_date: 시작 날짜
+            days: 날짜 수
+        Returns:
+            {date: 일정 리스트} (일정이 없는 날짜도 포함)
+        """
+        return {start_date + datetime.timedelta(days=i): self.events_on(start_date + datetime.timedelta(days=i))
+                for i in range(days)}
+
+    def free_slots(self, date: datetime.date, min_minutes: int = 30,
+                   work_start: datetime.time = WORK_START, work_end: datetime.time = WORK_END) -> list:
+        """
+        근무 시간 중 시간 일정이 없는 구간
+        Args:
+            date: 날짜
+            min_minutes: 이보다 짧은 빈 시간은 제외
+            work_start: 근무 시작 시각
+            work_end: 근무 끝 시각
+        Returns:
+            [(시작 datetime, 끝 datetime), ...]
+        """
+        start = datetime.datetime.combine(date, work_start, tzinfo=KST)
+        end = datetime.datetime.combine(date, work_end, tzinfo=KST)
+        slots = []
+        cursor = start
+        for event in self.timed.overlapping(start, end):
+            busy_start, busy_end = event_span(event)
+            if busy_end <= busy_start:
+                continue  # 길이가 없는 일정(알림 등)은 바쁜 시간이 아님
+            if busy_start > cursor:
+                slots.append((cursor, min(busy_start, end)))
+            cursor = max(cursor, busy_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            slots.append((cursor, end))
+        minimum = datetime.timedelta(minutes=min_minutes)
+        return [(slot_start, slot_end) for slot_start, slot_end in slots if slot_end - slot_start >= minimum]
+
+
+def format_event_time(event: dict, date: datetime.date = None) -> str:
+    """
+    일정 시각 표시 문자열
+    Args:
+        event: Calendar API 일정
+        date: 기준 날짜 (전날 시작한 시간 일정은 '~HH:MM'으로 끝 시각 표시)
+    Returns:
+        '종일', '10:00', '~11:00'
+    """
+    if is_all_day(event):
+        return "종일"
+    start, end = event_span(event)
+    if date is not None and start.date() < date:
+        return f"~{end:%H:%M}"
+    return f"{start:%H:%M}"
@@ -0,0 +1,408 @@
+"""
+캘린더별 로컬 일정 저장소 (Google Calendar 증분 동기화)
+- 처음에는 SYNC_PAST_DAYS 전부터 SYNC_FUTURE_DAYS 후까지 전체 일정을 받아 cache/calendar_events/<캘린더>.json에 저장하고,
+  이후에는 nextSyncToken으로 바뀐 일정만 받아서 반영 (취소된 일정은 삭제)
+- sync token이 만료되면(410 Gone) 저장소를 비우고 전체 동기화
+- 여러 캘린더는 첫 페이지 요청을 Google API batch 요청 하나로 묶어서 동기화
+- 응답은 fields 부분 응답으로 필요한 필드만 받음
+- 오늘/기간 일정 조회는 저장소의 구간 색인(util.calendar_index)에서 찾음 (API 요청 없음)
+- 저장소 범위(SYNC_PAST_DAYS 전 ~ 마지막 전체 동기화의 SYNC_FUTURE_DAYS 후) 밖의 기간은 timeMin/timeMax로 그 기간만 조회
+- 미래 범위가 SYNC_MIN_AHEAD_DAYS보다 짧아지면 다시 전체 동기화 (전체 동기화는 끝까지 받은 뒤에 저장소 교체)
+
+사용법:
+    store = get_store(AINR_CAL)
+    store.sync(service)                    # 바뀐 일정만 조회
+    store.events_between(start, end)       # 기간과 겹치는 일정 (종일 일정 먼저, 시작 시각순)
+    sync_calendars(service, [AINR_CAL, DATONR_CAL])   # 여러 캘린더를 batch 요청 하나로 동기화
+    window = get_window([AINR_CAL, DATONR_CAL], monday, 7)   # 이번 주 일정 색인
+    window.events_on(tomorrow), window.free_slots(tomorrow)
+"""
+
+import datetime
+import hashlib
+import threading
+import time
+
+from util.cache import JsonFileCache
+from util.calendar_index import CalendarIndex, day_bounds
+from util.trace import span
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 전체 동기화할 때 가져올 과거/미래 일정 범위 (일)
+# (singleEvents=True는 반복 일정을 회차별로 펼치므로 미래 범위를 제한하지 않으면 저장소가 끝없이 커짐)
+SYNC_PAST_DAYS = 30
+SYNC_FUTURE_DAYS = 90
+
+# 증분 동기화는 바뀐 일정만 받으므로 전체 동기화 때의 미래 범위(horizon) 밖 일정은 들어오지 않음
+# -> horizon까지 남은 기간이 이보다 짧아지면 다시 전체 동기화해서 범위를 앞으로 옮김
+SYNC_MIN_AHEAD_DAYS = 60
+
+# 한 페이지 최대 일정 수 (Calendar API 최대값)
+MAX_RESULTS = 2500
+
+# 저장할 일정 필드 (status는 취소 판별, iCalUID는 캘린더 간 중복 판별에 사용)
+EVENT_FIELDS = ("id", "status", "summary", "start", "end", "iCalUID")
+
+# events().list 부분 응답 필드
+LIST_FIELDS = f"items({','.join(EVENT_FIELDS)}),nextPageToken,nextSyncToken"
+
+event_cache = JsonFileCache("calendar_events", max_age_days=30)
+
+_lock = threading.Lock()
+_stores = {}
+
+
+def event_time(point: dict) -> datetime.datetime:
+    """
+    일정 start/end 값을 KST datetime으로 변환 (종일 일정의 date는 그날 00:00)
+    Args:
+        point: {"dateTime": ...} 또는 {"date": "YYYY-MM-DD"}
+    Returns:
+        timezone이 있는 datetime
+    """
+    if "dateTime" in point:
+        return datetime.datetime.fromisoformat(point["dateTime"]).astimezone(KST)
+    return datetime.datetime.fromisoformat(point["date"]).replace(tzinfo=KST)
+
+
+def next_horizon() -> datetime.datetime:
+    """지금 전체 동기화할 때의 timeMax (SYNC_FUTURE_DAYS 후 KST 00:00)"""
+    today = datetime.datetime.now(KST).date()
+    return day_bounds(today + datetime.timedelta(days=SYNC_FUTURE_DAYS))[0]
+
+
+class CalendarStore:
+    """캘린더 하나의 로컬 일정 저장소"""
+
+    def __init__(self, calendar_id: str):
+        """
+        초기화 (저장된 파일이 있으면 로드)
+        Args:
+            calendar_id: 캘린더 ID
+        """
+        self.calendar_id = calendar_id
+        self.key = hashlib.sha1(calendar_id.encode("utf-8")).hexdigest()[:16]
+        self.lock = threading.Lock()
+        stored = event_cache.get(self.key) or {}
+        self.sync_token = stored.get("sync_token")
+        self.synced_at = stored.get("synced_at", 0.0)
+        # 마지막 전체 동기화의 timeMax (저장소에 일정이 모두 있는 가장 늦은 시각)
+        self.horizon = stored.get("horizon")
+        self.events = stored.get("events", {})
+        # 일정이 바뀌면 version을 올리고, 구간 색인은 조회할 때 다시 생성
+        self.version = 0
+        self._index = None
+        self._index_version = None
+
+    def save(self):
+        """저장소를 파일에 저장"""
+        event_cache.put(self.key, {
+            "calendar_id": self.calendar_id,
+            "sync_token": self.sync_token,
+            "synced_at": self.synced_at,
+            "horizon": self.horizon,
+            "events": self.events,
+        })
+
+    def list_request(self, service, page_token: str = None, full: bool = False):
+        """
+        다음 동기화 요청 생성 (sync token이 없거나 full이면 전체 동기화 요청)
+        Args:
+            service: Google Calendar 서비스 객체
+            page_token: 이어서 받을 페이지 토큰
+            full: 전체 동기화 요청 여부
+        Returns:
+            실행 전 HttpRequest
+        """
+        params = {
+            "calendarId": self.calendar_id,
+            "singleEvents": True,
+            "maxResults": MAX_RESULTS,
+            "fields": LIST_FIELDS,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        if full or self.needs_full_sync():
+            params["timeMin"] = self.coverage_start().isoformat()
+            params["timeMax"] = next_horizon().isoformat()
+        else:
+            params["syncToken"] = self.sync_token
+            params["showDeleted"] = True
+        return service.events().list(**params)
+
+    def _list_pages(self, service, full: bool, first: dict = None):
+        """events().list 모든 페이지 조회 (pageToken, first가 있으면 첫 페이지로 사용)"""
+        result = first if first is not None else self.list_request(service, full=full).execute()
+        while True:
+            yield result.get("items", []), result.get("nextSyncToken")
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return
+            result = self.list_request(service, page_token, full).execute()
+
+    def _apply(self, events: dict, items: list) -> int:
+        """바뀐 일정을 events에 반영 (취소된 일정은 삭제), 반영한 일정 수 반환"""
+        if items:
+            self.version += 1
+        for item in items:
+            if item.get("status") == "cancelled":
+                events.pop(item["id"], None)
+            else:
+                events[item["id"]] = {field: item[field] for field in EVENT_FIELDS if field in item}
+        return len(items)
+
+    def _receive(self, service, full: bool, first: dict = None) -> int:
+        """
+        모든 페이지를 받아서 반영하고 sync token 갱신
+        (전체 동기화는 새 dict에 모았다가 마지막 페이지까지 받은 뒤에 교체, 중간에 실패하면 기존 일정 유지)
+        """
+        events = {} if full else self.events
+        horizon = next_horizon()
+        sync_token = None
+        count = 0
+        with span("calendar.full_sync" if full else "calendar.incremental_sync"):
+            for items, page_sync_token in self._list_pages(service, full, first):
+                count += self._apply(events, items)
+                sync_token = page_sync_token or sync_token
+        if full:
+            self.events = events
+            self.horizon = horizon.isoformat()
+            self.version += 1
+        self.sync_token = sync_token or self.sync_token
+        return count
+
+    def full_sync(self, service) -> int:
+        """
+        SYNC_PAST_DAYS 전부터 SYNC_FUTURE_DAYS 후까지 전체 일정을 받아서 저장소 교체
+        Args:
+            service: Google Calendar 서비스 객체
+        Returns:
+            받은 일정 수
+        """
+        return self._receive(service, full=True)
+
+    def sync(self, service, first: dict = None, error: Exception = None) -> int:
+        """
+        바뀐 일정만 받아서 반영 (sync token이 없거나 만료되었으면 전체 동기화)
+        Args:
+            service: Google Calendar 서비스 객체
+            first: batch 요청으로 이미 받은 첫 페이지 응답 (없으면 직접 요청)
+            error: batch 요청의 첫 페이지 오류
+        Returns:
+            받은 일정 수 (추가/변경/삭제)
+        """
+        from googleapiclient.errors import HttpError
+
+        with self.lock:
+            full = self.needs_full_sync()
+            try:
+                if error is not None:
+                    raise error
+                count = self._receive(service, full, first)
+            except HttpError as e:
+                if e.resp.status != 410 or full:
+                    raise
+                print(f"sync token 만료, 전체 동기화: {self.calendar_id}")
+                self.sync_token = None
+                count = self.full_sync(service)
+            self.prune()
+            self.synced_at = time.time()
+            self.save()
+            return count
+
+    def prune(self):
+        """저장 범위(SYNC_PAST_DAYS 전 ~ SYNC_FUTURE_DAYS 후) 밖의 일정 삭제 (저장소 크기 유지)"""
+        cutoff, horizon = self.coverage_start(), self.coverage_end()
+        kept = {event_id: event for event_id, event in self.events.items()
+                if event_time(event["end"]) >= cutoff and event_time(event["start"]) < horizon}
+        if len(kept) != len(self.events):
+            self.events = kept
+            self.version += 1
+
+    @staticmethod
+    def coverage_start() -> datetime.datetime:
+        """저장소에 일정이 모두 있는 가장 이른 시각 (이보다 이전 기간은 fetch_window로 조회)"""
+        return datetime.datetime.now(KST) - datetime.timedelta(days=SYNC_PAST_DAYS)
+
+    def coverage_end(self) -> datetime.datetime:
+        """저장소에 일정이 모두 있는 가장 늦은 시각 (이보다 이후 기간은 fetch_window로 조회)"""
+        if self.horizon is None:
+            return datetime.datetime.now(KST)
+        return datetime.datetime.fromisoformat(self.horizon)
+
+    def needs_full_sync(self) -> bool:
+        """sync token이 없거나 horizon까지 SYNC_MIN_AHEAD_DAYS보다 적게 남았으면 전체 동기화"""
+        if not self.sync_token or self.horizon is None:
+            return True
+        return self.coverage_end() - datetime.datetime.now(KST) < datetime.timedelta(days=SYNC_MIN_AHEAD_DAYS)
+
+    def index(self) -> CalendarIndex:
+        """
+        저장소 일정의 구간 색인 (일정이 바뀌었을 때만 다시 생성)
+        Returns:
+            CalendarIndex
+        """
+        with self.lock:
+            if self._index is None or self._index_version != self.version:
+                self._index = CalendarIndex(list(self.events.values()))
+                self._index_version = self.version
+            return self._index
+
+    def events_between(self, start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        기간과 겹치는 일정 (저장소에서 조회)
+        Args:
+            start: 시작 시각 (포함)
+            end: 끝 시각 (제외)
+        Returns:
+            일정 리스트 (종일 일정 먼저, 시간 일정은 시작 시각순, Calendar API 일정 형식)
+        """
+        return self.index().overlapping(start, end)
+
+    def events_on(self, date: datetime.date) -> list:
+        """
+        하루 일정 (저장소에서 조회)
+        Args:
+            date: 날짜
+        Returns:
+            종일 일정 먼저, 시간 일정은 시작 시각순
+        """
+        return self.index().events_on(date)
+
+
+def get_store(calendar_id: str) -> CalendarStore:
+    """
+    캘린더 저장소 (프로세스당 한 번 로드)
+    Args:
+        calendar_id: 캘린더 ID
+    Returns:
+        CalendarStore
+    """
+    with _lock:
+        if calendar_id not in _stores:
+            _stores[calendar_id] = CalendarStore(calendar_id)
+        return _stores[calendar_id]
+
+
+def sync_calendars(service, calendar_ids: list) -> dict:
+    """
+    여러 캘린더 동기화 (캘린더별 첫 페이지 요청을 batch HTTP 요청 하나로 전송)
+    - 다음 페이지가 있거나 sync token이 만료된 캘린더만 따로 이어서 요청
+    - 동기화에 실패한 캘린더는 저장된 일정을 그대로 사용
+    Args:
+        service: Google Calendar 서비스 객체
+        calendar_ids: 캘린더 ID 리스트
+    Returns:
+        {calendar_id: 받은 일정 수 (실패하면 None)}
+    """
+    stores = [get_store(calendar_id) for calendar_id in dict.fromkeys(calendar_ids)]
+    if not stores:
+        return {}
+
+    responses = {}
+
+    def callback(request_id, response, exception):
+        responses[request_id] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=callback)
+    for i, store in enumerate(stores):
+        batch.add(store.list_request(service), request_id=str(i))
+    with span("calendar.batch", calendars=len(stores)):
+        batch.execute()
+
+    counts = {}
+    for i, store in enumerate(stores):
+        response, exception = responses.get(str(i), (None, None))
+        try:
+            counts[store.calendar_id] = store.sync(service, first=response, error=exception)
+        except Exception as e:
+            print(f"캘린더 동기화 실패, 저장된 일정 사용: {store.calendar_id}: {e}")
+            counts[store.calendar_id] = None
+    return counts
+
+
+def fetch_window(service, calendar_id: str, start: datetime.datetime, end: datetime.datetime) -> list:
+    """
+    기간 일정을 API로 직접 조회 (저장소 범위 밖의 기간용, nextPageToken으로 모든 페이지 조회)
+    Args:
+        service: Google Calendar 서비스 객체
+        calendar_id: 캘린더 ID
+        start: 시작 시각 (포함)
+        end: 끝 시각 (제외)
+    Returns:
+        일정 리스트 (취소된 일정 제외)
+    """
+    params = {
+        "calendarId": calendar_id,
+        "timeMin": start.isoformat(),
+        "timeMax": end.isoformat(),
+        "singleEvents": True,
+        "maxResults": MAX_RESULTS,
+        "fields": LIST_FIELDS,
+    }
+    events = []
+    with span("calendar.fetch_window"):
+        while True:
+            result = service.events().list(**params).execute()
+            events += [{field: item[field] for field in EVENT_FIELDS if field in item}
+                       for item in result.get("items", []) if item.get("status") != "cancelled"]
+            if not result.get("nextPageToken"):
+                return events
+            params["pageToken"] = result["nextPageToken"]
+
+
+def get_window(calendar_ids: list, start_date: datetime.date, days: int = 7, service=None) -> CalendarIndex:
+    """
+    여러 캘린더의 기간 일정 색인 (한 번 만들어서 날짜별/겹침/빈 시간 조회에 재사용)
+    Args:
+        calendar_ids: 캘린더 ID 리스트
+        start_date: 시작 날짜
+        days: 날짜 수
+        service: Google Calendar 서비스 객체 (주면 먼저 batch 요청으로 증분 동기화,
+                 저장소 범위 밖의 기간은 이 서비스로 직접 조회)
+    Returns:
+        CalendarIndex (각 일정에 calendarId 추가)
+    """
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    start = day_bounds(start_date)[0]
+    end = start + datetime.timedelta(days=days)
+    if service is not None and start >= CalendarStore.coverage_start():
+        sync_calendars(service, calendar_ids)
+
+    events = []
+    for calendar_id in calendar_ids:
+        store = get_store(calendar_id)
+        if service is not None and (start < store.coverage_start() or end > store.coverage_end()):
+            matched = fetch_window(service, calendar_id, start, end)
+        else:
+            matched = store.events_between(start, end)
+        events += [dict(event, calendarId=calendar_id) for event in matched]
+    return CalendarIndex(events)
+
+
+def main():
+    """저장소 동기화 및 이번 주 일정/빈 시간 출력"""
+    import sys
+
+    from util.calendar_index import format_event_time
+    from util.get_my_calendar_today import AINR_CAL, DATONR_CAL, get_calendar_service
+
+    calendar_ids = sys.argv[1:] or [AINR_CAL, DATONR_CAL]
+    started = time.perf_counter()
+    counts = sync_calendars(get_calendar_service(), calendar_ids)
+    print(f"동기화: {counts} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    today = datetime.datetime.now(KST).date()
+    monday = today - datetime.timedelta(days=today.weekday())
+    window = get_window(calendar_ids, monday, 7)
+    for date, events in window.events_by_day(monday, 7).items():
+        print(f"{date:%m/%d %a}")
+        for event in events:
+            print(f"  {format_event_time(event, date)} {event.get('summary', '')}")
+    slots = window.free_slots(today)
+    print(f"오늘 빈 시간: {', '.join(f'{s:%H:%M}~{e:%H:%M}' for s, e in slots) or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
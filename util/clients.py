@@ -0,0 +1,114 @@
+"""
+프로세스 내 공유 클라이언트
+- requests 세션 (커넥션 풀 재사용)
+- Slack(AinSlack) 클라이언트 (credential 파일별)
+- Google Calendar 서비스 (util.calendar_client로 생성)
+한 번 생성하면 프로세스가 끝날 때까지 재사용 (daemon 모드에서는 실행 간에도 유지)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 호스트별 커넥션 풀 크기 (pool_block으로 호스트별 동시 요청 수 상한으로도 사용,
+# 격자별/발표별/페이지별 스레드가 겹쳐도 한 호스트에 POOL_MAXSIZE개보다 많이 요청하지 않음)
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 16
+
+_lock = threading.Lock()
+# 서비스 생성(google import, 토큰 갱신) 중에도 세션/Slack 조회가 막히지 않도록 별도 lock
+_calendar_lock = threading.Lock()
+_session = None
+_slack_clients = {}
+_calendar_service = None
+
+
+def get_session() -> requests.Session:
+    """
+    공유 requests 세션 반환 (최초 호출시 생성)
+    Returns:
+        커넥션 풀이 설정된 requests.Session (풀이 다 차면 연결이 반환될 때까지 대기)
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                                  pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_slack(credential_path: str):
+    """
+    credential 파일별 AinSlack 클라이언트 반환 (최초 호출시 생성)
+    Args:
+        credential_path: slack credential 파일 경로
+    Returns:
+        AinSlack 인스턴스
+    """
+    from util.ain_slack import AinSlack
+
+    with _lock:
+        if credential_path not in _slack_clients:
+            _slack_clients[credential_path] = AinSlack(credential_path)
+        return _slack_clients[credential_path]
+
+
+def get_calendar_service():
+    """
+    Google Calendar 서비스 반환 (최초 호출시 생성)
+    - 만료가 가까운 토큰은 생성할 때 미리 갱신하고, 이후에는 daemon 작업이 갱신
+      (그래도 만료되면 서비스의 인증 http가 요청시 자동 갱신)
+    Returns:
+        Google Calendar 서비스 객체
+    """
+    from util import calendar_client
+
+    global _calendar_service
+    with _calendar_lock:
+        if _calendar_service is None:
+            _calendar_service = calendar_client.build_service()
+        return _calendar_service
+
+
+def warm_calendar_service() -> threading.Thread:
+    """
+    Google Calendar 서비스를 백그라운드 스레드에서 미리 생성
+    (google 라이브러리 import와 토큰 갱신을 다른 준비 작업과 겹쳐서 실행, 실패하면 사용할 때 다시 시도)
+    Returns:
+        생성 스레드
+    """
+    def warm():
+        try:
+            get_calendar_service()
+        except Exception as e:
+            print(f"Calendar 서비스 준비 실패 (사용할 때 재시도): {e}")
+
+    thread = threading.Thread(target=warm, name="calendar-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def reset():
+    """캐시된 클라이언트 모두 폐기 (다음 호출시 새로 생성)"""
+    global _session, _calendar_service
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _slack_clients.clear()
+        _calendar_service = None
+
+
+def main():
+    """사용법 예제 및 테스트"""
+    session = get_session()
+    print(f"세션 재사용: {session is get_session()}")
+
+
+if __name__ == "__main__":
+    main()
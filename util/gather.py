@@ -0,0 +1,123 @@
+"""
+데이터 소스 동시 수집기
+- 서로 독립적인 데이터 소스를 스레드 풀에서 동시에 실행
+- 소스별 deadline을 넘기거나 예외가 발생하면 fallback 값 사용
+- 소스별 지연시간(latency) 기록
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from util.trace import span
+
+
+class Source:
+    """수집할 데이터 소스 정의"""
+
+    def __init__(self, name: str, func, timeout: float, fallback=None):
+        """
+        초기화
+        Args:
+            name: 소스 이름 (로그 표시용)
+            func: 인자 없이 호출되는 수집 함수
+            timeout: 수집 시작 시점부터의 deadline (초)
+            fallback: 실패/시간초과시 사용할 값
+        """
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+def gather_sources(sources: list, max_workers: int = None) -> tuple:
+    """
+    여러 데이터 소스를 동시에 수집
+    Args:
+        sources: Source 리스트
+        max_workers: 최대 스레드 수 (기본값: 소스 개수)
+    Returns:
+        (결과 dict {name: 값}, 타이밍 리스트 [{"name", "status", "elapsed", "error"}])
+    """
+    results = {}
+    timings = []
+    if not sources:
+        return results, timings
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sources),
+                                  thread_name_prefix="gather")
+    started = time.monotonic()
+    finished_at = {}
+
+    def run(source):
+        try:
+            with span(f"source.{source.name}"):
+                return source.func()
+        finally:
+            finished_at[source.name] = time.monotonic()
+
+    # 작업 스레드에서도 trace의 상위 span이 이어지도록 context 복사
+    futures = [(source, executor.submit(contextvars.copy_context().run, run, source))
+               for source in sources]
+
+    try:
+        # deadline이 짧은 소스부터 기다려야 긴 소스가 짧은 소스의 판정을 늦추지 않음
+        for source, future in sorted(futures, key=lambda f: f[0].timeout):
+            remaining = max(0.0, started + source.timeout - time.monotonic())
+            status, error = "ok", None
+            try:
+                results[source.name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                status, error = "timeout", f"{source.timeout:g}초 초과"
+                results[source.name] = source.fallback
+            except Exception as e:
+                status, error = "error", str(e)
+                results[source.name] = source.fallback
+
+            end = finished_at.get(source.name, time.monotonic())
+            timings.append({
+                "name": source.name,
+                "status": status,
+                "elapsed": end - started,
+                "error": error,
+            })
+    finally:
+        # 시간 초과된 작업은 기다리지 않음 (각 요청의 자체 timeout으로 종료됨)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    order = {source.name: i for i, source in enumerate(sources)}
+    timings.sort(key=lambda t: order[t["name"]])
+    return results, timings
+
+
+def format_timings(timings: list) -> str:
+    """
+    소스별 지연시간 표를 문자열로 반환
+    Args:
+        timings: gather_sources가 반환한 타이밍 리스트
+    Returns:
+        "  weather        1.23s  ok" 형식의 여러 줄 문자열
+    """
+    width = max((len(t["name"]) for t in timings), default=0)
+    lines = []
+    for t in timings:
+        line = f"  {t['name']:<{width}}  {t['elapsed']:6.2f}s  {t['status']}"
+        if t["error"]:
+            line += f" ({t['error']})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    """사용법 예제 및 테스트"""
+    sources = [
+        Source("fast", lambda: "fast result", timeout=1),
+        Source("slow", lambda: time.sleep(2) or "slow result", timeout=0.5, fallback="fallback"),
+        Source("broken", lambda: 1 / 0, timeout=1, fallback="fallback"),
+    ]
+    results, timings = gather_sources(sources)
+    print(results)
+    print(format_timings(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,7 @@
 import datetime
 import os
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import pytz
-from util.ain_slack import AinSlack
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-TOKEN_PATH = os.path.join(BASE_DIR, "credential", "token.json")
-
-# If modifying these scopes, delete the file token.json.
-SCOPES = ["https://www.googleapis.com/auth/calendar"]
+from util import clients
+from util.calendar_index import is_all_day
 
 
 def format_datetime(start_time: str) -> str:
@@ -27,25 +16,8 @@ def format_datetime(start_time: str) -> str:
 
 
 def get_calendar_service():
-    """Gets authorized calendar service."""
-    creds = None
-    # token.json 파일이 있는 경우 로드
-    token_path = TOKEN_PATH
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    # 유효한 크레덴셜이 없거나 만료된 경우
-    if not creds or not creds.valid:
-        # refresh token이 있고 만료된 경우 갱신
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            # 갱신된 크레덴셜 저장
-            with open(token_path, "w") as token:
-                token.write(creds.to_json())
-        # refresh token이 없는 경우 새로운 인증 진행
-        else:
-            print("ERROR:token.json not exist")
-                
-    return build("calendar", "v3", credentials=creds)
+    """Gets authorized calendar service (shared, built by util.calendar_client)."""
+    return clients.get_calendar_service()
 
 
 #def get_calendar_service():
@@ -57,6 +29,8 @@ def get_calendar_service():
 
 def list_calendars(service):
     """Lists all available calendars."""
+    from googleapiclient.errors import HttpError
+
     print("\nAvailable Calendars:")
     print("-" * 50)
     try:
@@ -76,44 +50,30 @@ def list_calendars(service):
         return []
 
 def get_todays_calendar_events(service, calendar_id):
-    """Gets all events for today from the specified calendar."""
+    """Gets all events for today from the specified calendar (local store, incremental sync)."""
+    from googleapiclient.errors import HttpError
+    from util import calendar_store
+
     message =""
     try:
             # 한국 시간으로 변환
         KST = datetime.timezone(datetime.timedelta(hours=9))
         today = datetime.datetime.now(KST).date()
-        #today = today + datetime.timedelta(days=1)  # 내일 날짜 보기
-
-        start_of_day = datetime.datetime.combine(today, datetime.datetime.min.time())
-        end_of_day = datetime.datetime.combine(today, datetime.datetime.max.time())
-
-        # KST 시간대 정보 추가
-        start_of_day = start_of_day.replace(tzinfo=KST)
-        end_of_day = end_of_day.replace(tzinfo=KST)
-
-        # Convert to ISO format with Z suffix
-        time_min = start_of_day.isoformat()
-        time_max = end_of_day.isoformat()
-        print(time_min, time_max)
 
         message += f"\n*Today's attendance status of research center - ({today})*"
-        events_result = service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
-
-        events = events_result.get("items", [])
+        store = calendar_store.get_store(calendar_id)
+        store.sync(service)
+        events = store.events_on(today)
 
         if not events:
             message+="\nNo events found for today."
             return message
 
         for event in events:
-            start = event["start"].get("dateTime", event["start"].get("date"))
-            start_str = format_datetime(start)
+            if is_all_day(event):
+                start_str = "종일"
+            else:
+                start_str = format_datetime(event["start"]["dateTime"])
             message+=(f"\n* {event['summary']} {start_str}")
         return message
 
@@ -0,0 +1,260 @@
+"""
+지역 → 기상청 격자 좌표 변환
+- data/kma_forecast_grid_coordinates.csv (기상청 동네예보 격자 좌표, EUC-KR)를 한번만 읽어서
+  색인 파일(cache/location_index.pickle)로 저장하고, 이후 실행은 색인 파일만 로드
+- 행정구역 이름 검색: 1단계/2단계/3단계 이름의 앞부분으로 검색 ("서초구", "서울특별시 서초구 양재", "양재1동")
+- 위경도 검색: 가장 가까운 행정구역의 격자 좌표
+
+사용법:
+    resolve_location("서초구 양재1동")       # {"name": "서울특별시 서초구 양재1동", "nx": 61, "ny": 125, ...}
+    resolve_location((37.47, 127.04))       # 위경도로 가장 가까운 행정구역
+    search_locations("양재")                 # 이름이 "양재"로 시작하는 행정구역 리스트
+"""
+
+import bisect
+import math
+import os
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRID_CSV_PATH = os.path.join(BASE_DIR, "data", "kma_forecast_grid_coordinates.csv")
+INDEX_PATH = os.path.join(BASE_DIR, "cache", "location_index.pickle")
+
+# 색인 형식이 바뀌면 올려서 기존 색인 파일을 다시 만들게 함
+INDEX_VERSION = 1
+
+# 위경도 검색용 버킷 크기 (도, 약 11km)
+BUCKET_SIZE = 0.1
+
+_lock = threading.Lock()
+_index = None
+
+
+def _bucket(lat: float, lon: float) -> tuple:
+    """위경도가 속한 버킷 좌표"""
+    return int(math.floor(lat / BUCKET_SIZE)), int(math.floor(lon / BUCKET_SIZE))
+
+
+def build_buckets(points) -> dict:
+    """
+    위경도 검색용 버킷 생성
+    Args:
+        points: [(위도, 경도), ...]
+    Returns:
+        {(위도 버킷, 경도 버킷): [points 번호, ...]}
+    """
+    buckets = {}
+    for point_id, (lat, lon) in enumerate(points):
+        buckets.setdefault(_bucket(lat, lon), []).append(point_id)
+    return buckets
+
+
+def build_index(csv_path: str = GRID_CSV_PATH) -> dict:
+    """
+    격자 좌표 CSV로 색인 생성
+    Args:
+        csv_path: 기상청 격자 좌표 CSV 경로
+    Returns:
+        {"version", "source_mtime",
+         "rows": [(행정구역코드, 전체 이름, nx, ny, 위도, 경도), ...],
+         "keys": [(검색 이름, row 번호), ...] (이름순 정렬),
+         "buckets": {(위도 버킷, 경도 버킷): [row 번호, ...]}}
+    """
+    import csv
+
+    rows = []
+    keys = []
+    with open(csv_path, "r", encoding="euc-kr", newline="") as f:
+        reader = csv.reader(f)
+        next(reader)  # 헤더
+        for record in reader:
+            code, level1, level2, level3 = record[1:5]
+            levels = [name for name in (level1, level2, level3) if name]
+            lon, lat = float(record[13]), float(record[14])
+            row_id = len(rows)
+            rows.append((code, " ".join(levels), int(record[5]), int(record[6]), lat, lon))
+
+            # 1단계부터, 2단계부터, 3단계부터 시작하는 이름을 모두 검색 키로 등록
+            for start in range(len(levels)):
+                keys.append((" ".join(levels[start:]), row_id))
+
+    keys.sort()
+    return {
+        "version": INDEX_VERSION,
+        "source_mtime": os.path.getmtime(csv_path),
+        "rows": rows,
+        "keys": keys,
+        "buckets": build_buckets((row[4], row[5]) for row in rows),
+    }
+
+
+def load_index(index_path: str = None, csv_path: str = GRID_CSV_PATH) -> dict:
+    """
+    색인 로드 (프로세스당 한번, 색인 파일이 없거나 CSV보다 오래되었으면 다시 생성)
+    Args:
+        index_path: 색인 파일 경로 (기본값: INDEX_PATH)
+        csv_path: 기상청 격자 좌표 CSV 경로
+    Returns:
+        build_index 결과
+    """
+    import pickle
+
+    global _index
+    index_path = index_path or INDEX_PATH
+    with _lock:
+        if _index is not None:
+            return _index
+
+        index = None
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, "rb") as f:
+                    index = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                index = None
+        if (index is None or index.get("version") != INDEX_VERSION
+                or index.get("source_mtime") != os.path.getmtime(csv_path)):
+            index = build_index(csv_path)
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            tmp_path = f"{index_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+
+        _index = index
+        return _index
+
+
+def _to_location(row: tuple) -> dict:
+    """색인 row를 location dict로 변환"""
+    code, name, nx, ny, lat, lon = row
+    return {"code": code, "name": name, "nx": nx, "ny": ny, "lat": lat, "lon": lon}
+
+
+def search_locations(query: str, limit: int = 20) -> list:
+    """
+    행정구역 이름 앞부분으로 검색
+    - 1단계("서울특별시"), 2단계("서초구"), 3단계("양재1동") 어느 단계부터 입력해도 됨
+    - 상위 행정구역(단계가 적은 것)을 먼저 반환
+    Args:
+        query: 검색어 (단계 사이는 공백으로 구분)
+        limit: 최대 결과 수
+    Returns:
+        location dict 리스트
+    """
+    index = load_index()
+    query = " ".join(query.split())
+    keys = index["keys"]
+    row_ids = []
+    seen = set()
+    pos = bisect.bisect_left(keys, (query,))
+    while pos < len(keys) and keys[pos][0].startswith(query):
+        row_id = keys[pos][1]
+        if row_id not in seen:
+            seen.add(row_id)
+            row_ids.append(row_id)
+        pos += 1
+
+    rows = index["rows"]
+    row_ids.sort(key=lambda i: (rows[i][1].count(" "), i))
+    return [_to_location(rows[i]) for i in row_ids[:limit]]
+
+
+def _ring_cells(center_i: int, center_j: int, ring: int):
+    """중심 버킷에서 ring 칸 떨어진 테두리 버킷 좌표"""
+    if ring == 0:
+        yield center_i, center_j
+        return
+    for j in range(center_j - ring, center_j + ring + 1):
+        yield center_i - ring, j
+        yield center_i + ring, j
+    for i in range(center_i - ring + 1, center_i + ring):
+        yield i, center_j - ring
+        yield i, center_j + ring
+
+
+def find_nearest(buckets: dict, position, lat: float, lon: float) -> tuple:
+    """
+    버킷 색인에서 위경도와 가장 가까운 지점
+    Args:
+        buckets: build_buckets 결과 ({버킷: [지점 번호, ...]})
+        position: 지점 번호 -> (위도, 경도) 함수
+        lat: 위도
+        lon: 경도
+    Returns:
+        (지점 번호, 거리 km) (지점이 없으면 ValueError)
+    """
+    center_lat, center_lon = _bucket(lat, lon)
+    cos_lat = math.cos(math.radians(lat))
+
+    best_id, best_dist = None, None
+    # 주변 버킷을 한 겹씩 넓혀가며 검색 (찾은 후보가 이미 확인한 범위 안에 있어야 종료)
+    for ring in range(0, 50):
+        for i, j in _ring_cells(center_lat, center_lon, ring):
+            for point_id in buckets.get((i, j), ()):
+                point_lat, point_lon = position(point_id)
+                dist = (point_lat - lat) ** 2 + ((point_lon - lon) * cos_lat) ** 2
+                if best_dist is None or dist < best_dist:
+                    best_id, best_dist = point_id, dist
+        if best_id is not None and math.sqrt(best_dist) <= ring * BUCKET_SIZE * min(cos_lat, 1.0):
+            break
+    if best_id is None:
+        raise ValueError(f"가까운 지점이 없습니다: {lat}, {lon}")
+    return best_id, math.sqrt(best_dist) * 111.0
+
+
+def nearest_location(lat: float, lon: float) -> dict:
+    """
+    위경도에서 가장 가까운 행정구역
+    Args:
+        lat: 위도
+        lon: 경도
+    Returns:
+        location dict (distance_km 포함)
+    """
+    index = load_index()
+    rows = index["rows"]
+    row_id, distance_km = find_nearest(index["buckets"], lambda i: (rows[i][4], rows[i][5]), lat, lon)
+    location = _to_location(rows[row_id])
+    location["distance_km"] = distance_km
+    return location
+
+
+def resolve_location(location) -> dict:
+    """
+    여러 형식의 위치를 격자 좌표가 포함된 location dict로 변환
+    Args:
+        location: 행정구역 이름, (위도, 경도), 또는 nx/ny가 있는 dict
+    Returns:
+        location dict ({"code", "name", "nx", "ny", "lat", "lon"})
+    """
+    if isinstance(location, dict):
+        if "nx" in location and "ny" in location:
+            return location
+        return nearest_location(location["lat"], location["lon"])
+    if isinstance(location, (tuple, list)):
+        return nearest_location(*location)
+
+    matches = search_locations(location, limit=1)
+    if not matches:
+        raise ValueError(f"행정구역을 찾을 수 없습니다: {location}")
+    return matches[0]
+
+
+def main():
+    """사용법 예제 및 테스트"""
+    import time
+
+    started = time.perf_counter()
+    load_index()
+    print(f"색인 로드: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    for query in ["서초구 양재1동", "양재", "부산광역시 해운대구", (37.4846, 127.0342)]:
+        started = time.perf_counter()
+        location = resolve_location(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{str(query):<24} → {location['name']} ({location['nx']}, {location['ny']}) {elapsed:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
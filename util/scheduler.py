@@ -0,0 +1,173 @@
+"""
+cron 형식 스케줄러
+- "분 시 일 월 요일" 5필드 cron 표현식 (*, */n, a-b, a-b/n, a,b 지원, 요일 0/7=일요일)
+- 등록된 작업을 정해진 시각에 순서대로 실행 (작업끼리 겹치지 않음)
+"""
+
+import datetime
+import threading
+import time
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+# 필드별 (최소, 최대)
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(expr: str, low: int, high: int) -> set:
+    """cron 필드 하나를 허용 값 집합으로 변환"""
+    values = set()
+    for part in expr.split(','):
+        step = 1
+        if '/' in part:
+            part, step_str = part.split('/')
+            step = int(step_str)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-'))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron 필드 범위 오류: {expr} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSpec:
+    """cron 표현식"""
+
+    def __init__(self, expr: str):
+        """
+        초기화
+        Args:
+            expr: "분 시 일 월 요일" 형식 (예: "0 8 * * 1-5")
+        """
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드가 필요합니다: {expr}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(f, low, high) for f, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        # cron 요일(0=일요일)을 datetime.weekday()(0=월요일)로 변환
+        self.weekdays = {(d - 1) % 7 for d in weekdays}
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+
+    def _day_matches(self, dt: datetime.datetime) -> bool:
+        """일/요일 조건 (둘 다 지정되면 cron 규칙대로 OR)"""
+        day_ok = dt.day in self.days
+        weekday_ok = dt.weekday() in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, dt: datetime.datetime) -> bool:
+        """
+        해당 시각(분 단위)이 표현식과 일치하는지 확인
+        Args:
+            dt: 확인할 시각
+        Returns:
+            일치 여부
+        """
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt: datetime.datetime) -> datetime.datetime:
+        """
+        dt 이후 처음 일치하는 시각
+        Args:
+            dt: 기준 시각
+        Returns:
+            다음 실행 시각 (분 단위, 초 0)
+        """
+        t = dt.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = t + datetime.timedelta(days=366 * 4)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                t = t.replace(minute=0) + datetime.timedelta(hours=1)
+                continue
+            if t.minute not in self.minutes:
+                t += datetime.timedelta(minutes=1)
+                continue
+            return t
+        raise ValueError(f"일치하는 시각이 없습니다: {self.expr}")
+
+
+class Scheduler:
+    """cron 작업 스케줄러"""
+
+    def __init__(self, tz: datetime.tzinfo = KST):
+        """
+        초기화
+        Args:
+            tz: 스케줄 기준 시간대 (기본값: KST)
+        """
+        self.tz = tz
+        self.jobs = []
+        self.stop_event = threading.Event()
+
+    def add(self, name: str, cron: str, func):
+        """
+        작업 등록
+        Args:
+            name: 작업 이름
+            cron: cron 표현식
+            func: 인자 없이 호출되는 작업 함수
+        """
+        spec = CronSpec(cron)
+        now = datetime.datetime.now(self.tz)
+        self.jobs.append({"name": name, "spec": spec, "func": func,
+                          "next_run": spec.next_after(now)})
+
+    def run_job(self, job: dict):
+        """작업 하나 실행 (예외는 기록만 하고 스케줄러는 계속 동작)"""
+        started = time.monotonic()
+        print(f"[{datetime.datetime.now(self.tz):%Y-%m-%d %H:%M:%S}] {job['name']} 시작")
+        try:
+            job["func"]()
+            status = "완료"
+        except Exception as e:
+            status = f"실패: {e}"
+        print(f"[{datetime.datetime.now(self.tz):%Y-%m-%d %H:%M:%S}] {job['name']} {status} "
+              f"({time.monotonic() - started:.1f}s)", flush=True)
+
+    def run_forever(self):
+        """stop()이 호출될 때까지 작업 실행"""
+        while not self.stop_event.is_set():
+            now = datetime.datetime.now(self.tz)
+            due = sorted((j for j in self.jobs if j["next_run"] <= now), key=lambda j: j["next_run"])
+            for job in due:
+                self.run_job(job)
+                # 실행 중 지나간 시각은 한번만 따라잡고, 다음 시각은 현재 기준으로 계산
+                job["next_run"] = job["spec"].next_after(datetime.datetime.now(self.tz))
+            if due:
+                continue
+
+            next_run = min(j["next_run"] for j in self.jobs)
+            wait = (next_run - datetime.datetime.now(self.tz)).total_seconds()
+            # 시계 변경에 대비해 최대 60초 단위로 다시 확인
+            self.stop_event.wait(min(max(wait, 0.0), 60.0))
+
+    def stop(self):
+        """스케줄러 종료 요청"""
+        self.stop_event.set()
+
+
+def main():
+    """사용법 예제 및 테스트"""
+    now = datetime.datetime.now(KST)
+    for expr in ["0 8 * * 1-5", "*/30 * * * 1-5", "30 6 1 * *"]:
+        print(f"{expr:<16} 다음 실행: {CronSpec(expr).next_after(now):%Y-%m-%d %H:%M %a}")
+
+
+if __name__ == "__main__":
+    main()
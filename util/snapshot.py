@@ -0,0 +1,193 @@
+"""
+실행별 입력 스냅샷
+- 브리핑 실행마다 원본 입력(일정, 기상청 items, 에어코리아 item, 특일, 잡학사실, 프롬프트,
+  Ollama 응답 원문, Block Kit)을 날짜별 JSON 파일로 저장
+- replay 모드에서는 저장된 Ollama 응답을 프롬프트로 찾아서 네트워크 요청 없이 브리핑 재구성
+
+사용법:
+    start_snapshot("daily_briefing")
+    record("inputs", inputs)
+    append("ollama", {"prompt": prompt, "response": text})
+    finish_snapshot()
+
+    data = load_snapshot("2026-10-16")
+    start_replay(data)
+    text = replay_response(prompt)
+"""
+
+import copy
+import datetime
+import glob
+import json
+import os
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "logs", "snapshots")
+
+# 보관할 스냅샷 파일 수 (오래된 것부터 삭제)
+MAX_SNAPSHOT_FILES = 500
+
+_lock = threading.Lock()
+_snapshot = None
+_replay = None
+
+
+def start_snapshot(name: str):
+    """
+    새 스냅샷 시작. 이후 record/append 기록은 이 스냅샷에 모임
+    Args:
+        name: 실행 이름 (파일명 접두사로 사용)
+    """
+    global _snapshot
+    with _lock:
+        _snapshot = {"name": name, "started_at": time.time(), "data": {}}
+
+
+def record(key: str, value):
+    """
+    스냅샷에 값 기록 (스냅샷 중이 아니면 아무것도 하지 않음)
+    - 이후 원본이 바뀌어도 기록 시점 값이 남도록 복사해서 저장
+    Args:
+        key: 항목 이름
+        value: JSON으로 저장 가능한 값
+    """
+    with _lock:
+        if _snapshot is not None:
+            _snapshot["data"][key] = copy.deepcopy(value)
+
+
+def record_profile(profile_name: str, key: str, value):
+    """
+    스냅샷에 프로필별 값 기록 (data["profiles"][profile_name][key])
+    Args:
+        profile_name: 프로필 이름
+        key: 항목 이름 (briefing, blocks 등)
+        value: JSON으로 저장 가능한 값
+    """
+    with _lock:
+        if _snapshot is not None:
+            profiles = _snapshot["data"].setdefault("profiles", {})
+            profiles.setdefault(profile_name, {})[key] = copy.deepcopy(value)
+
+
+def append(key: str, value):
+    """
+    스냅샷의 리스트 항목에 값 추가 (Ollama 호출처럼 여러 번 생기는 기록)
+    Args:
+        key: 항목 이름
+        value: JSON으로 저장 가능한 값
+    """
+    with _lock:
+        if _snapshot is not None:
+            _snapshot["data"].setdefault(key, []).append(copy.deepcopy(value))
+
+
+def finish_snapshot(snapshot_dir: str = None) -> str:
+    """
+    현재 스냅샷을 종료하고 파일로 저장 (입력을 기록하지 않은 실행은 저장하지 않음)
+    Args:
+        snapshot_dir: 저장 디렉토리 (기본값: SNAPSHOT_DIR)
+    Returns:
+        저장한 파일 경로 (저장하지 않았으면 None)
+    """
+    global _snapshot
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    with _lock:
+        snapshot, _snapshot = _snapshot, None
+    if snapshot is None or "inputs" not in snapshot["data"]:
+        return None
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    started_at = snapshot["started_at"]
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(started_at))
+    stamp += f"_{int(started_at * 1000) % 1000:03d}"
+    path = os.path.join(snapshot_dir, f"{snapshot['name']}_{stamp}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"name": snapshot["name"], "started_at": started_at, **snapshot["data"]},
+                  f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    # 오래된 스냅샷 정리
+    old_files = sorted(glob.glob(os.path.join(snapshot_dir, f"{snapshot['name']}_*.json")))
+    for old in old_files[:-MAX_SNAPSHOT_FILES]:
+        os.remove(old)
+
+    return path
+
+
+def load_snapshot(target: str, name: str = "daily_briefing", snapshot_dir: str = None) -> dict:
+    """
+    스냅샷 로드
+    Args:
+        target: 스냅샷 파일 경로 또는 날짜 (YYYY-MM-DD / YYYYMMDD, 해당 날짜의 마지막 실행)
+        name: 실행 이름
+        snapshot_dir: 스냅샷 디렉토리 (기본값: SNAPSHOT_DIR)
+    Returns:
+        스냅샷 dict
+    """
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    path = target
+    if not os.path.isfile(target):
+        date = datetime.datetime.strptime(target.replace("-", ""), "%Y%m%d").date()
+        files = sorted(glob.glob(os.path.join(snapshot_dir, f"{name}_{date:%Y%m%d}_*.json")))
+        if not files:
+            raise FileNotFoundError(f"{date} 스냅샷이 없습니다: {snapshot_dir}")
+        path = files[-1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["path"] = path
+    return data
+
+
+def start_replay(data: dict):
+    """
+    replay 시작. 이후 replay_response는 스냅샷에 기록된 Ollama 응답을 반환
+    Args:
+        data: load_snapshot 결과
+    """
+    global _replay
+    _replay = {call["prompt"]: call["response"] for call in data.get("ollama", [])}
+
+
+def stop_replay():
+    """replay 종료"""
+    global _replay
+    _replay = None
+
+
+def is_replaying() -> bool:
+    """replay 중인지 여부"""
+    return _replay is not None
+
+
+def replay_response(prompt: str) -> str:
+    """
+    프롬프트에 해당하는 기록된 Ollama 응답 반환
+    Args:
+        prompt: 프롬프트 문자열
+    Returns:
+        응답 원문
+    """
+    if prompt not in _replay:
+        raise KeyError("스냅샷에 같은 프롬프트의 Ollama 응답이 없습니다")
+    return _replay[prompt]
+
+
+def main():
+    """최근 스냅샷 목록 출력"""
+    files = sorted(glob.glob(os.path.join(SNAPSHOT_DIR, "*.json")))
+    if not files:
+        print(f"스냅샷이 없습니다: {SNAPSHOT_DIR}")
+    for path in files[-10:]:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        profiles = ", ".join(data.get("profiles", {}))
+        print(f"{os.path.basename(path)}  {data.get('date')} {data.get('phase', '')}  [{profiles}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,30 @@
-import requests
+"""
+특일 정보 (공휴일, 24절기, 잡절)
+- 한국천문연구원 특일정보(SpcdeInfoService)를 연도 단위로 조회해서 cache/special_days/<연도>.json에 저장
+- 올해와 내년은 처음 조회할 때 함께 받아두고, REFRESH_DAYS가 지나면 다시 조회 (대체/임시공휴일 반영)
+- 조회가 필요한 (연도 x 종류) 요청은 공유 세션으로 동시에 보내고, 응답 XML은 받는 대로 iterparse로 파싱
+- 날짜순으로 정렬된 색인을 bisect로 검색하므로 is_day_off, is_holiday, get_upcoming_special_days는
+  저장된 연도 안에서는 네트워크 요청 없이 응답
+
+사용법:
+    is_day_off()                      # (쉬는날 여부, 사유)
+    get_upcoming_special_days(30)     # 오늘부터 30일 후까지 특일
+    refresh_special_days()            # 올해/내년 특일 다시 조회 (daemon 작업)
+"""
+
+import bisect
+import contextvars
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 import arrow
-import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
+from util.cache import JsonFileCache
+from util.clients import get_session
+from util.trace import span, traced
 
 load_dotenv()
 
@@ -15,61 +37,308 @@ API_ENDPOINTS = {
     'sundry': '/getSundryDayInfo',     # 잡절 정보
 }
 
+# 연도 단위 조회시 한 페이지 항목 수 (한 해 특일은 종류별로 100개 미만)
+YEAR_NUM_OF_ROWS = 100
 
-def fetch_special_days(year: str, month: str, api_type: str) -> list:
+# 저장된 연도를 다시 조회하는 주기 (일)
+REFRESH_DAYS = 7
+
+# 조회에 실패한 연도를 다시 조회할 때까지 기다리는 시간 (초)
+# (API 장애 중에 load_year를 부를 때마다 REQUEST_DEADLINE만큼 기다리지 않도록 실패 결과도 잠시 보관)
+FAILURE_RETRY_SECONDS = 600
+
+# 요청별 (연결, 읽기) timeout과 응답을 다 받을 때까지의 deadline (초)
+REQUEST_TIMEOUT = (3.05, 10)
+REQUEST_DEADLINE = 15
+
+# 동시에 보낼 특일 API 요청 수 (올해/내년 x 3종류)
+MAX_FETCH_WORKERS = 6
+
+special_day_cache = JsonFileCache("special_days", max_age_days=800)
+
+_lock = threading.Lock()
+_years = {}
+
+
+def iter_special_days(source, api_type: str, deadline: float = None):
     """
-    특정 연월의 특일 정보 조회
+    특일 정보 XML을 읽으면서 항목을 하나씩 반환 (iterparse, 처리한 항목은 메모리에서 해제)
+    Args:
+        source: XML 바이트 스트림 (파일 객체)
+        api_type: API 타입 ('holiday', 'division', 'sundry')
+        deadline: time.monotonic() 기준 마감 시각 (넘으면 requests Timeout)
+    Yields:
+        {"date": "20260101", "name": "신정", "type": "holiday", "is_holiday": True}
+    """
+    import xml.etree.ElementTree as ET
+
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if deadline is not None and time.monotonic() > deadline:
+            raise requests.exceptions.Timeout(f"특일 정보 응답이 {REQUEST_DEADLINE:g}초 안에 끝나지 않았습니다")
+        if elem.tag != 'item':
+            continue
+        locdate = elem.findtext('locdate')
+        date_name = elem.findtext('dateName')
+        if locdate and date_name:
+            yield {
+                'date': locdate,
+                'name': date_name,
+                'type': api_type,
+                'is_holiday': elem.findtext('isHoliday') == 'Y',
+            }
+        elem.clear()
+
+
+def stream_special_days(year: str, month: str, api_type: str):
+    """
+    특일 정보 API 요청 (응답을 받는 대로 파싱해서 항목 반환, 요청/파싱 오류는 예외로 전달)
+    - 공유 세션의 커넥션 풀 사용, 연결/읽기 timeout과 요청 전체 deadline(REQUEST_DEADLINE) 적용
     Args:
         year: 연도 (예: '2026')
-        month: 월 (예: '01')
+        month: 월 (예: '01', None이면 연도 전체)
         api_type: API 타입 ('holiday', 'division', 'sundry')
-    Returns:
-        특일 리스트 [{"date": "20260101", "name": "신정", "type": "holiday"}]
+    Yields:
+        특일 dict
     """
-    if api_type not in API_ENDPOINTS:
-        return []
-
     url = BASE_URL + API_ENDPOINTS[api_type]
     params = {
         'serviceKey': GONGGONG_API_KEY,
         'solYear': year,
-        'solMonth': month,
     }
+    if month:
+        params['solMonth'] = month
+    else:
+        params['numOfRows'] = YEAR_NUM_OF_ROWS
 
-    try:
-        response = requests.get(url, params=params)
+    deadline = time.monotonic() + REQUEST_DEADLINE
+    with get_session().get(url, params=params, timeout=REQUEST_TIMEOUT, stream=True) as response:
         response.raise_for_status()
+        response.raw.decode_content = True
+        yield from iter_special_days(response.raw, api_type, deadline)
+
 
-        # XML 파싱
-        root = ET.fromstring(response.content)
+def request_special_days(year: str, month: str, api_type: str) -> list:
+    """
+    특일 정보 API 요청 (요청/파싱 오류는 예외로 전달)
+    Args:
+        year: 연도 (예: '2026')
+        month: 월 (예: '01', None이면 연도 전체)
+        api_type: API 타입 ('holiday', 'division', 'sundry')
+    Returns:
+        특일 리스트 [{"date": "20260101", "name": "신정", "type": "holiday", "is_holiday": True}]
+    """
+    with span("special_day.request", year=year, month=month or "", type=api_type):
+        return list(stream_special_days(year, month, api_type))
 
-        # 응답 확인
-        total_count = root.find('.//totalCount')
-        if total_count is None or total_count.text == '0':
-            return []
 
-        # 특일 항목 추출
-        items = []
-        for item in root.findall('.//item'):
-            locdate = item.find('locdate')
-            dateName = item.find('dateName')
-            if locdate is not None and dateName is not None:
-                items.append({
-                    'date': locdate.text,
-                    'name': dateName.text,
-                    'type': api_type
-                })
+@traced()
+def fetch_special_days(year: str, month: str, api_type: str) -> list:
+    """
+    특정 연월의 특일 정보 조회
+    Args:
+        year: 연도 (예: '2026')
+        month: 월 (예: '01', None이면 연도 전체)
+        api_type: API 타입 ('holiday', 'division', 'sundry')
+    Returns:
+        특일 리스트 [{"date": "20260101", "name": "신정", "type": "holiday", "is_holiday": True}]
+    """
+    if api_type not in API_ENDPOINTS:
+        return []
 
-        return items
+    from xml.etree.ElementTree import ParseError
 
+    try:
+        return request_special_days(year, month, api_type)
     except requests.exceptions.RequestException as err:
         print(f"API 요청 오류: {err}")
         return []
-    except ET.ParseError as e:
+    except ParseError as e:
         print(f"XML 파싱 오류: {e}")
         return []
 
 
+@traced()
+def fetch_special_day_matrix(queries: list, max_workers: int = MAX_FETCH_WORKERS) -> dict:
+    """
+    여러 (연도, 월, 종류) 조합을 동시에 조회
+    Args:
+        queries: [(연도, 월 또는 None, API 타입), ...]
+        max_workers: 동시 요청 수
+    Returns:
+        {query: 특일 리스트 또는 발생한 예외}
+    """
+    from xml.etree.ElementTree import ParseError
+
+    results = {}
+    if not queries:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+        futures = {query: executor.submit(contextvars.copy_context().run, request_special_days, *query)
+                   for query in queries}
+        for query, future in futures.items():
+            try:
+                results[query] = future.result()
+            except (requests.exceptions.RequestException, ParseError) as e:
+                results[query] = e
+    return results
+
+
+def fetch_years(years: list) -> dict:
+    """
+    여러 해의 특일 전체 조회 (연도 x 종류 요청을 동시에 보냄)
+    Args:
+        years: 연도 리스트
+    Returns:
+        {연도: 날짜순 특일 리스트 (종류 하나라도 실패하면 예외)}
+    """
+    queries = [(str(year), None, api_type) for year in years for api_type in API_ENDPOINTS]
+    fetched = fetch_special_day_matrix(queries)
+
+    results = {}
+    for year in years:
+        parts = [fetched[(str(year), None, api_type)] for api_type in API_ENDPOINTS]
+        error = next((part for part in parts if isinstance(part, Exception)), None)
+        if error is not None:
+            results[year] = error
+            continue
+        days = [day for part in parts for day in part]
+        days.sort(key=lambda day: day['date'])
+        results[year] = days
+    return results
+
+
+def _build_year_index(year: int, days: list, fetched_at: float) -> dict:
+    """연도 특일 리스트로 bisect 검색용 색인 생성"""
+    holidays = [day for day in days if day['type'] == 'holiday' and day.get('is_holiday', True)]
+    return {
+        "year": year,
+        "fetched_at": fetched_at,
+        "days": days,
+        "dates": [day['date'] for day in days],
+        "holidays": holidays,
+        "holiday_dates": [day['date'] for day in holidays],
+    }
+
+
+def _is_fresh(entry) -> bool:
+    """저장된 연도가 REFRESH_DAYS 안에 조회된 것인지 (조회 실패 후 retry_at 전이면 그대로 사용)"""
+    if entry is None:
+        return False
+    if entry.get("retry_at", 0.0) > time.time():
+        return True
+    return time.time() - entry["fetched_at"] < REFRESH_DAYS * 86400
+
+
+def load_years(years: list, force: bool = False) -> dict:
+    """
+    여러 해의 특일 색인 (메모리 → 파일 → API 순서, REFRESH_DAYS가 지났으면 다시 조회)
+    - 다시 조회해야 하는 연도들은 한 번에 동시에 조회
+    - 다시 조회하다 실패하면 저장된 값(없으면 빈 색인)을 FAILURE_RETRY_SECONDS 동안 사용
+    Args:
+        years: 연도 리스트
+        force: 저장된 값이 있어도 다시 조회
+    Returns:
+        {연도: {"year", "fetched_at", "days", "dates", "holidays", "holiday_dates"}}
+    """
+    with _lock:
+        indexes = {}
+        stored = {}
+        for year in years:
+            if not force and _is_fresh(_years.get(year)):
+                indexes[year] = _years[year]
+                continue
+            stored[year] = special_day_cache.get(str(year))
+            if not force and _is_fresh(stored[year]):
+                indexes[year] = _years[year] = _build_year_index(year, stored[year]["days"],
+                                                                 stored[year]["fetched_at"])
+
+        missing = [year for year in years if year not in indexes]
+        fetched = fetch_years(missing) if missing else {}
+        for year, result in fetched.items():
+            if not isinstance(result, Exception):
+                fetched_at = time.time()
+                special_day_cache.put(str(year), {"year": year, "fetched_at": fetched_at, "days": result})
+                indexes[year] = _years[year] = _build_year_index(year, result, fetched_at)
+                continue
+
+            print(f"{year}년 특일 정보 조회 실패: {result}")
+            if stored[year] is None:
+                index = _build_year_index(year, [], 0.0)
+            else:
+                index = _build_year_index(year, stored[year]["days"], stored[year]["fetched_at"])
+            index["retry_at"] = time.time() + FAILURE_RETRY_SECONDS
+            indexes[year] = _years[year] = index
+        return indexes
+
+
+def is_loaded(index: dict) -> bool:
+    """
+    색인이 한 번이라도 조회에 성공한 값인지 (처음 조회에 실패한 연도는 빈 색인)
+    Args:
+        index: load_years/load_year 결과의 연도 색인
+    Returns:
+        조회된 값이면 True
+    """
+    return index["fetched_at"] > 0
+
+
+def load_year(year: int, force: bool = False) -> dict:
+    """
+    연도 특일 색인 (load_years 참고)
+    Args:
+        year: 연도
+        force: 저장된 값이 있어도 다시 조회
+    Returns:
+        {"year", "fetched_at", "days", "dates", "holidays", "holiday_dates"}
+    """
+    return load_years([year], force)[year]
+
+
+def prefetch_years(today: arrow.Arrow = None) -> list:
+    """
+    올해와 내년 특일 색인 로드
+    Args:
+        today: 기준 날짜 (기본값: 오늘)
+    Returns:
+        [올해 색인, 내년 색인]
+    """
+    today = today or arrow.now('Asia/Seoul')
+    indexes = load_years([today.year, today.year + 1])
+    return [indexes[today.year], indexes[today.year + 1]]
+
+
+def refresh_special_days(today: arrow.Arrow = None) -> list:
+    """
+    올해와 내년 특일을 다시 조회해서 저장 (daemon 작업, 실패하면 저장된 값 유지)
+    Args:
+        today: 기준 날짜 (기본값: 오늘)
+    Returns:
+        [올해 색인, 내년 색인]
+    """
+    today = today or arrow.now('Asia/Seoul')
+    indexes = load_years([today.year, today.year + 1], force=True)
+    return [indexes[today.year], indexes[today.year + 1]]
+
+
+def find_special_days(start: str, end: str) -> list:
+    """
+    기간 안의 특일 (연도 색인을 bisect로 검색)
+    Args:
+        start: 시작 날짜 'YYYYMMDD' (포함)
+        end: 끝 날짜 'YYYYMMDD' (포함)
+    Returns:
+        날짜순 특일 리스트
+    """
+    result = []
+    years = list(range(int(start[:4]), int(end[:4]) + 1))
+    indexes = load_years(years)
+    for year in years:
+        index = indexes[year]
+        dates = index["dates"]
+        result.extend(index["days"][bisect.bisect_left(dates, start):bisect.bisect_right(dates, end)])
+    return result
+
+
 def fetch_holidays(year: str, month: str) -> list:
     """
     특정 연월의 공휴일 목록 조회 (하위 호환용)
@@ -88,15 +357,11 @@ def is_holiday(date: arrow.Arrow = None) -> tuple:
     if date is None:
         date = arrow.now('Asia/Seoul')
 
-    year = date.format('YYYY')
-    month = date.format('MM')
     date_str = date.format('YYYYMMDD')
-
-    holidays = fetch_holidays(year, month)
-
-    for holiday in holidays:
-        if holiday['date'] == date_str:
-            return True, holiday['name']
+    index = load_year(date.year)
+    pos = bisect.bisect_left(index["holiday_dates"], date_str)
+    if pos < len(index["holiday_dates"]) and index["holiday_dates"][pos] == date_str:
+        return True, index["holidays"][pos]['name']
 
     return False, None
 
@@ -121,6 +386,7 @@ def is_weekend(date: arrow.Arrow = None) -> tuple:
     return False, weekday_names[weekday]
 
 
+@traced()
 def is_day_off(date: arrow.Arrow = None) -> tuple:
     """
     특정 날짜가 쉬는 날(주말 또는 공휴일)인지 확인
@@ -145,6 +411,7 @@ def is_day_off(date: arrow.Arrow = None) -> tuple:
     return False, None
 
 
+@traced()
 def get_upcoming_special_days(n: int = 7) -> list:
     """
     오늘부터 n일 후까지의 특일 정보(24절기, 잡절, 공휴일) 조회
@@ -156,34 +423,8 @@ def get_upcoming_special_days(n: int = 7) -> list:
     """
     today = arrow.now('Asia/Seoul')
     end_date = today.shift(days=n)
-
-    # 조회할 연월 목록 생성
-    months_to_query = set()
-    current = today
-    while current <= end_date:
-        months_to_query.add((current.format('YYYY'), current.format('MM')))
-        current = current.shift(months=1).replace(day=1)
-
-    # 모든 특일 정보 수집
-    all_special_days = []
-    for year, month in months_to_query:
-        for api_type in ['holiday', 'division', 'sundry']:
-            days = fetch_special_days(year, month, api_type)
-            all_special_days.extend(days)
-
-    # 날짜 범위 필터링
-    start_str = today.format('YYYYMMDD')
-    end_str = end_date.format('YYYYMMDD')
-
-    filtered = [
-        day for day in all_special_days
-        if start_str <= day['date'] <= end_str
-    ]
-
-    # 날짜순 정렬
-    filtered.sort(key=lambda x: x['date'])
-
-    return filtered
+    prefetch_years(today)
+    return find_special_days(today.format('YYYYMMDD'), end_date.format('YYYYMMDD'))
 
 
 def get_today_info() -> str:
@@ -211,7 +452,7 @@ def main():
 
     print("\n=== 이번 달 공휴일 목록 ===")
     today = arrow.now('Asia/Seoul')
-    holidays = fetch_holidays(today.format('YYYY'), today.format('MM'))
+    holidays = [day for day in load_year(today.year)["holidays"] if day['date'][4:6] == today.format('MM')]
 
     if holidays:
         for h in holidays:
@@ -221,7 +462,7 @@ def main():
 
     print("\n=== 앞으로 30일간 특일 정보 ===")
     type_names = {'holiday': '공휴일', 'division': '24절기', 'sundry': '잡절'}
-    upcoming = get_upcoming_special_days(7)
+    upcoming = get_upcoming_special_days(30)
 
     if upcoming:
         for day in upcoming:
@@ -0,0 +1,247 @@
+"""
+파이프라인 단계별 트레이싱
+- span() 컨텍스트 매니저 / traced() 데코레이터로 중첩 구간 기록
+- 실행마다 Chrome trace 형식(JSON) 파일 저장 (chrome://tracing, Perfetto에서 열기)
+- 최근 N회 실행의 단계별 p50/p95 요약표
+
+사용법:
+    start_run("daily_briefing")
+    with span("gather"):
+        ...
+    finish_run()
+
+    python -m util.trace --last 20    # 최근 20회 실행 요약
+"""
+
+import argparse
+import contextvars
+import functools
+import glob
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_DIR = os.path.join(BASE_DIR, "logs", "traces")
+
+# 보관할 trace 파일 수 (오래된 것부터 삭제)
+MAX_TRACE_FILES = 500
+
+_lock = threading.Lock()
+_run = None
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def start_run(name: str):
+    """
+    새 실행(trace) 시작. 이후 span 기록은 이 실행에 모임
+    Args:
+        name: 실행 이름 (파일명 접두사로 사용)
+    """
+    global _run
+    with _lock:
+        _run = {
+            "name": name,
+            "started_at": time.time(),
+            "origin": time.perf_counter(),
+            "events": [],
+            "threads": {},
+        }
+
+
+def _thread_id(run: dict) -> int:
+    """현재 스레드의 trace용 tid (실행 내에서 0부터 순서대로 부여)"""
+    thread = threading.current_thread()
+    threads = run["threads"]
+    if thread.ident not in threads:
+        threads[thread.ident] = (len(threads), thread.name)
+    return threads[thread.ident][0]
+
+
+@contextmanager
+def span(name: str, **args):
+    """
+    구간 기록. 실행 중이 아니면 아무것도 하지 않음
+    Args:
+        name: 구간(단계) 이름
+        **args: trace에 함께 기록할 속성
+    """
+    if _run is None:
+        yield
+        return
+
+    run = _run
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        _current_span.reset(token)
+        event_args = dict(args)
+        if parent:
+            event_args["parent"] = parent
+        if error:
+            event_args["error"] = error
+        with _lock:
+            run["events"].append({
+                "name": name,
+                "ph": "X",
+                "ts": round((start - run["origin"]) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": _thread_id(run),
+                "args": event_args,
+            })
+
+
+def traced(name: str = None):
+    """
+    함수 호출 전체를 span으로 기록하는 데코레이터
+    Args:
+        name: 구간 이름 (기본값: 모듈명.함수명)
+    """
+    def decorator(func):
+        span_name = name or f"{func.__module__.split('.')[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def finish_run(trace_dir: str = None) -> str:
+    """
+    현재 실행을 종료하고 Chrome trace JSON 파일로 저장
+    Args:
+        trace_dir: trace 파일 저장 디렉토리 (기본값: TRACE_DIR)
+    Returns:
+        저장한 파일 경로 (실행 중이 아니면 None)
+    """
+    global _run
+    trace_dir = trace_dir or TRACE_DIR
+    with _lock:
+        run, _run = _run, None
+    if run is None:
+        return None
+
+    events = list(run["events"])
+    for ident, (tid, thread_name) in run["threads"].items():
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+            "args": {"name": thread_name},
+        })
+
+    os.makedirs(trace_dir, exist_ok=True)
+    started_at = run["started_at"]
+    stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(started_at))
+    stamp += f"_{int(started_at * 1000) % 1000:03d}"
+    path = os.path.join(trace_dir, f"{run['name']}_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "metadata": {"name": run["name"], "started_at": run["started_at"]},
+        }, f, ensure_ascii=False)
+
+    # 오래된 trace 정리
+    old_files = _run_files(trace_dir, run["name"])
+    for old in old_files[:-MAX_TRACE_FILES]:
+        os.remove(old)
+
+    return path
+
+
+def _run_files(trace_dir: str, name: str) -> list:
+    """실행 이름의 trace 파일 (시각순, 'daily_briefing_replay_...'처럼 이름이 이어지는 다른 실행은 제외)"""
+    pattern = re.compile(rf"{re.escape(name)}_\d{{8}}_\d{{6}}_\d{{3}}\.json")
+    return sorted(path for path in glob.glob(os.path.join(trace_dir, f"{name}_*.json"))
+                  if pattern.fullmatch(os.path.basename(path)))
+
+
+def _percentile(values: list, q: float) -> float:
+    """정렬된 값 리스트의 q 분위수 (선형 보간)"""
+    if len(values) == 1:
+        return values[0]
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def summarize(last: int = 20, name: str = "daily_briefing", trace_dir: str = None) -> list:
+    """
+    최근 N회 실행의 단계별 지연시간 통계
+    Args:
+        last: 집계할 최근 실행 수
+        name: 실행 이름
+        trace_dir: trace 파일 디렉토리 (기본값: TRACE_DIR)
+    Returns:
+        단계별 통계 리스트 [{"name", "count", "p50", "p95", "max"}] (ms, p95 내림차순)
+    """
+    trace_dir = trace_dir or TRACE_DIR
+    files = _run_files(trace_dir, name)[-last:]
+    durations = {}
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            trace = json.load(f)
+        for event in trace["traceEvents"]:
+            if event.get("ph") == "X":
+                durations.setdefault(event["name"], []).append(event["dur"] / 1000)
+
+    stats = []
+    for stage, values in durations.items():
+        values.sort()
+        stats.append({
+            "name": stage,
+            "count": len(values),
+            "p50": _percentile(values, 0.5),
+            "p95": _percentile(values, 0.95),
+            "max": values[-1],
+        })
+    stats.sort(key=lambda s: s["p95"], reverse=True)
+    return stats
+
+
+def format_summary(stats: list) -> str:
+    """
+    summarize 결과를 표 형식 문자열로 반환
+    Args:
+        stats: summarize가 반환한 통계 리스트
+    Returns:
+        단계별 count/p50/p95/max 표
+    """
+    width = max([len(s["name"]) for s in stats] + [len("stage")])
+    lines = [f"{'stage':<{width}}  {'count':>5}  {'p50(ms)':>9}  {'p95(ms)':>9}  {'max(ms)':>9}"]
+    for s in stats:
+        lines.append(f"{s['name']:<{width}}  {s['count']:>5}  {s['p50']:>9.1f}  {s['p95']:>9.1f}  {s['max']:>9.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    """최근 실행 trace 요약 출력"""
+    parser = argparse.ArgumentParser(description='단계별 지연시간 요약')
+    parser.add_argument('--last', type=int, default=20, help='집계할 최근 실행 수')
+    parser.add_argument('--name', default='daily_briefing', help='실행 이름')
+    args = parser.parse_args()
+
+    stats = summarize(args.last, args.name)
+    if not stats:
+        print(f"trace 파일이 없습니다: {TRACE_DIR}")
+        return
+    print(f"=== 최근 {args.last}회 {args.name} 단계별 지연시간 ===\n")
+    print(format_summary(stats))
+
+
+if __name__ == "__main__":
+    main()
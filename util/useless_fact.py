@@ -3,7 +3,10 @@ Useless Facts API 클라이언트
 https://uselessfacts.jsph.pl/ API를 사용하여 무작위 잡학사실을 조회합니다.
 """
 
-import requests
+from util.clients import get_session
+from util.trace import traced
+
+BASE_URL = "https://uselessfacts.jsph.pl/api/v2/facts"
 
 
 class UselessFact:
@@ -15,9 +18,10 @@ class UselessFact:
         Args:
             language: 언어 설정 (en: 영어, de: 독일어)
         """
-        self.base_url = "https://uselessfacts.jsph.pl/api/v2/facts"
+        self.base_url = BASE_URL
         self.language = language
 
+    @traced()
     def get_random(self) -> dict:
         """
         무작위 잡학사실 조회
@@ -26,7 +30,7 @@ class UselessFact:
         """
         url = f"{self.base_url}/random"
         params = {"language": self.language}
-        response = requests.get(url, params=params)
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -38,7 +42,7 @@ class UselessFact:
         """
         url = f"{self.base_url}/today"
         params = {"language": self.language}
-        response = requests.get(url, params=params)
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -1,21 +1,55 @@
 import requests
 import os
+import sys
 import arrow
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from util.clients import get_session
+from util import snapshot
+from util.location import resolve_location
+from util.cache import JsonFileCache
+from util.trace import traced
 
 load_dotenv()
 
 GONGGONG_API_KEY = os.environ.get("GONGGONG_API_KEY", "")
 
 api_url = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+# 초단기실황 (매시 정시 관측, 약 40분 후 조회 가능) / 초단기예보 (매시 30분 발표, 6시간 예보, 약 45분 후 조회 가능)
+ultra_ncst_url = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+ultra_fcst_url = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
 
-# 관측 위치 : 서울특별시 서초구 양재1동
+# 기본 관측 위치 : 서울특별시 서초구 양재1동 (다른 위치는 util.location으로 격자 좌표 변환)
 NX = '61'
 NY = '125'
 
 # 기상청 단기예보 발표 시각 (3시간 간격)
 BASE_TIMES = ['0200', '0500', '0800', '1100', '1400', '1700', '2000', '2300']
 
+# 발표 시각 이후 API에서 조회 가능해지기까지 걸리는 시간 (분)
+PUBLISH_DELAY_MINUTES = 10
+
+# 초단기 발표가 API에 반영되는 시각 (매시 분)
+ULTRA_READY_MINUTE = {'ncst': 40, 'fcst': 45}
+
+# 초단기실황/예보는 매시 발표되므로 발표 단위로 캐시 (하루 지난 파일은 삭제)
+ultra_cache = JsonFileCache("kma_ultra", max_age_days=1)
+
+# 비 시작 알림 기본 확인 범위 (분)
+RAIN_ALERT_WINDOW_MINUTES = 60
+
+# 예보 페이지 크기와 남은 페이지를 동시에 요청할 수
+# (발표 하나의 3일치 예보는 약 800~1000개, 첫 페이지에 오늘 예보가 모두 들어가는 크기)
+PAGE_SIZE = 300
+MAX_PAGE_WORKERS = 3
+
+# 여러 위치 조회시 동시에 조회할 격자 수
+MAX_GRID_WORKERS = 8
+
+# 발표된 예보는 바뀌지 않으므로 (base_date, base_time, nx, ny) 키로 다음 실행에서도 재사용
+forecast_cache = JsonFileCache("kma_forecast", max_age_days=3)
+
 '''
 category: 예보 항목
 - TMN : 최저 기온 - 오전 6시
@@ -30,22 +64,58 @@ category: 예보 항목
 '''
 
 STATUS_OF_SKY = {
-    '1': '맑음 ☀️',
-    '3': '구름많음 ☁️',
-    '4': '흐림 ⛅️',
+    1: '맑음 ☀️',
+    3: '구름많음 ☁️',
+    4: '흐림 ⛅️',
 }
 
 STATUS_OF_PRECIPITATION = {
-    '0': '없음',
-    '1': '비 🌧️',
-    '2': '비/눈 🌨️',
-    '3': '눈 ❄️',
-    '4': '소나기 ☔️'
+    0: '없음',
+    1: '비 🌧️',
+    2: '비/눈 🌨️',
+    3: '눈 ❄️',
+    4: '소나기 ☔️',
+    # 초단기실황/초단기예보에만 있는 코드
+    5: '빗방울 💧',
+    6: '빗방울눈날림 🌨️',
+    7: '눈날림 🌬️',
+}
+
+# 예보 항목별 값 타입 (없는 항목은 문자열 그대로, 예: PCP "1mm 미만", SNO "적설없음")
+CATEGORY_TYPES = {
+    'TMP': float,   # 1시간 기온
+    'TMN': float,   # 최저 기온
+    'TMX': float,   # 최고 기온
+    'UUU': float,   # 동서 바람성분
+    'VVV': float,   # 남북 바람성분
+    'WSD': float,   # 풍속
+    'WAV': float,   # 파고
+    'VEC': int,     # 풍향
+    'POP': int,     # 강수확률
+    'REH': int,     # 습도
+    'SKY': int,     # 하늘 상태 코드
+    'PTY': int,     # 강수 형태 코드
+    'T1H': float,   # 기온 (초단기)
+    'LGT': int,     # 낙뢰 (초단기예보)
+}
+
+# 초단기예보 항목 → 단기예보 항목 (단기예보 표에 합칠 때 사용)
+ULTRA_TO_VILLAGE = {
+    'T1H': 'TMP',
+    'RN1': 'PCP',
+    'SKY': 'SKY',
+    'PTY': 'PTY',
+    'REH': 'REH',
+    'UUU': 'UUU',
+    'VVV': 'VVV',
+    'VEC': 'VEC',
+    'WSD': 'WSD',
 }
 
 
 def get_latest_base_time(current_time_kst):
-    """현재 시간 기준으로 가장 최근 발표된 base_time과 base_date를 반환"""
+    """현재 시간 기준으로 가장 최근 발표된(API에 반영된) base_time과 base_date를 반환"""
+    current_time_kst = current_time_kst.shift(minutes=-PUBLISH_DELAY_MINUTES)
     current_hour = current_time_kst.hour
     current_minute = current_time_kst.minute
     current_hhmm = current_hour * 100 + current_minute
@@ -67,100 +137,628 @@ def get_latest_base_time(current_time_kst):
     return base_date, latest_base_time
 
 
-def fetch_weather_data(base_date, base_time):
-    """기상청 API에서 날씨 데이터를 가져옴"""
+def get_previous_base_time(base_date, base_time):
+    """
+    직전 발표의 base_date, base_time
+    Args:
+        base_date: 발표 날짜 (YYYYMMDD)
+        base_time: 발표 시각 (BASE_TIMES 중 하나)
+    Returns:
+        (base_date, base_time)
+    """
+    index = BASE_TIMES.index(base_time)
+    if index > 0:
+        return base_date, BASE_TIMES[index - 1]
+    return arrow.get(base_date, "YYYYMMDD").shift(days=-1).format("YYYYMMDD"), BASE_TIMES[-1]
+
+
+def get_grid(location=None):
+    """
+    위치를 기상청 격자 좌표로 변환
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: 양재1동)
+    Returns:
+        (nx, ny) 문자열 튜플
+    """
+    if location is None:
+        return NX, NY
+    resolved = resolve_location(location)
+    return str(resolved['nx']), str(resolved['ny'])
+
+
+@traced()
+def fetch_weather_page(base_date, base_time, nx=NX, ny=NY, page_no=1):
+    """
+    기상청 API에서 예보 한 페이지를 가져옴
+    Args:
+        base_date, base_time: 발표 날짜/시각
+        nx, ny: 격자 좌표
+        page_no: 페이지 번호 (1부터)
+    Returns:
+        (items, totalCount) (실패시 (None, 0))
+    """
     params = {
         'serviceKey': GONGGONG_API_KEY,
-        'numOfRows': '300',
+        'numOfRows': str(PAGE_SIZE),
         'dataType': 'JSON',
         'base_date': base_date,
         'base_time': base_time,
-        'nx': NX,
-        'ny': NY,
-        'pageNo': '1'
+        'nx': nx,
+        'ny': ny,
+        'pageNo': str(page_no)
     }
 
     try:
-        response = requests.get(api_url, params=params)
+        response = get_session().get(api_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
 
         if 'body' not in data.get('response', {}):
-            return None
+            return None, 0
 
-        return data['response']['body']['items']['item']
+        body = data['response']['body']
+        return body['items']['item'], int(body.get('totalCount', 0))
 
-    except requests.exceptions.RequestException as err:
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as err:
         print(f"API 요청 오류: {err}")
+        return None, 0
+
+
+def fetch_weather_pages(base_date, base_time, nx=NX, ny=NY):
+    """
+    발표 하나의 전체 예보 (첫 페이지의 totalCount로 남은 페이지를 동시에 요청해서 합침)
+    Args:
+        base_date, base_time: 발표 날짜/시각
+        nx, ny: 격자 좌표
+    Returns:
+        (items, 완전한지 여부) (첫 페이지 실패시 (None, False))
+    """
+    items, total_count = fetch_weather_page(base_date, base_time, nx, ny, 1)
+    if items is None:
+        return None, False
+
+    page_count = -(-total_count // PAGE_SIZE)
+    if page_count <= 1:
+        return items, True
+
+    pages = range(2, page_count + 1)
+    with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, len(pages))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run,
+                                   fetch_weather_page, base_date, base_time, nx, ny, page)
+                   for page in pages]
+        results = [future.result()[0] for future in futures]
+
+    complete = all(page_items is not None for page_items in results)
+    for page_items in results:
+        items = items + (page_items or [])
+    if not complete:
+        print(f"예보 일부 페이지 조회 실패 ({len(items)}/{total_count}개)")
+    return items, complete
+
+
+def fetch_weather_data(base_date, base_time, nx=NX, ny=NY):
+    """기상청 API에서 날씨 데이터를 가져옴 (nx, ny: 격자 좌표, 전체 페이지)"""
+    return fetch_weather_pages(base_date, base_time, nx, ny)[0]
+
+
+def get_forecast_items(base_date, base_time, nx=NX, ny=NY):
+    """
+    발표 하나의 예보 items (캐시에 있으면 API 요청 없음)
+    Args:
+        base_date: 발표 날짜 (YYYYMMDD)
+        base_time: 발표 시각
+        nx, ny: 격자 좌표
+    Returns:
+        예보 items (실패시 None)
+    """
+    key = f"{base_date}_{base_time}_{nx}_{ny}"
+    items = forecast_cache.get(key)
+    if items is None:
+        items, complete = fetch_weather_pages(base_date, base_time, nx, ny)
+        # 일부 페이지가 빠진 예보는 다음 실행에서 다시 조회하도록 캐시하지 않음
+        if items and complete:
+            forecast_cache.put(key, items)
+    return items
+
+
+def _parse_value(category, value):
+    """예보 값 문자열을 항목별 타입으로 변환 (변환할 수 없으면 문자열 그대로)"""
+    value_type = CATEGORY_TYPES.get(category)
+    if value_type is None:
+        return value
+    try:
+        return value_type(float(value)) if value_type is int else value_type(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class ForecastTable:
+    """기상청 예보 items를 (fcstDate, fcstTime, category) 키로 색인한 표 (값은 항목별 타입)"""
+
+    def __init__(self, items=None):
+        """
+        초기화
+        Args:
+            items: 기상청 예보 items (한번만 순회해서 색인)
+        """
+        # {(fcstDate, category): {fcstTime: 값}}
+        self.cells = {}
+        if items:
+            self.add(items)
+
+    def add(self, items, overwrite=True):
+        """
+        예보 items 추가
+        Args:
+            items: 기상청 예보 items
+            overwrite: 이미 있는 값을 덮어쓸지 여부 (이전 발표로 빈 항목만 채울 때는 False)
+        """
+        for item in items:
+            category = item['category']
+            times = self.cells.setdefault((item['fcstDate'], category), {})
+            if overwrite or item['fcstTime'] not in times:
+                times[item['fcstTime']] = _parse_value(category, item['fcstValue'])
+
+    @property
+    def dates(self):
+        """예보가 있는 날짜 리스트 (YYYYMMDD, 오름차순)"""
+        return sorted({date for date, _ in self.cells})
+
+    def get(self, category, fcst_date, fcst_time=None, default=None):
+        """
+        예보 값 조회
+        Args:
+            category: 예보 항목 (TMP, SKY 등)
+            fcst_date: 예보 날짜 (YYYYMMDD)
+            fcst_time: 예보 시각 (HHMM, 생략하면 그 날짜에서 가장 이른 시각의 값 - TMN/TMX용)
+            default: 값이 없을 때 반환할 값
+        Returns:
+            항목별 타입의 값
+        """
+        times = self.cells.get((fcst_date, category))
+        if not times:
+            return default
+        if fcst_time is None:
+            return times[min(times)]
+        return times.get(fcst_time, default)
+
+    def series(self, category, fcst_date):
+        """
+        하루 동안의 항목 값
+        Args:
+            category: 예보 항목
+            fcst_date: 예보 날짜 (YYYYMMDD)
+        Returns:
+            [(fcstTime, 값), ...] (시각 오름차순)
+        """
+        return sorted(self.cells.get((fcst_date, category), {}).items())
+
+    def __len__(self):
+        return sum(len(times) for times in self.cells.values())
+
+
+def build_forecast_table(items, items_0200=None):
+    """
+    최신 발표 items로 예보 표를 만들고, 최신 발표에 없는 항목(TMN 등)을 0200 발표로 채움
+    Args:
+        items: 최신 발표 예보 items
+        items_0200: 0200 발표 예보 items
+    Returns:
+        ForecastTable (items가 없으면 None)
+    """
+    if items is None:
+        return None
+    table = ForecastTable(items)
+    if items_0200:
+        table.add(items_0200, overwrite=False)
+    return table
+
+
+def get_ultra_base_time(current_time_kst, kind):
+    """
+    초단기실황/예보의 가장 최근 발표(API에 반영된) base_date, base_time
+    Args:
+        current_time_kst: 기준 시각 (arrow, KST)
+        kind: 'ncst' (실황, HH00) 또는 'fcst' (예보, HH30)
+    Returns:
+        (base_date, base_time)
+    """
+    issued = current_time_kst.shift(minutes=-ULTRA_READY_MINUTE[kind]).floor('hour')
+    return issued.format("YYYYMMDD"), issued.format("HH") + ('00' if kind == 'ncst' else '30')
+
+
+@traced()
+def fetch_ultra_items(kind, base_date, base_time, nx=NX, ny=NY):
+    """
+    기상청 API에서 초단기실황/예보 items를 가져옴 (한 번 발표는 최대 60개라 한 페이지)
+    Args:
+        kind: 'ncst' 또는 'fcst'
+        base_date, base_time: 발표 날짜/시각
+        nx, ny: 격자 좌표
+    Returns:
+        items (실패시 None)
+    """
+    params = {
+        'serviceKey': GONGGONG_API_KEY,
+        'numOfRows': '100',
+        'dataType': 'JSON',
+        'base_date': base_date,
+        'base_time': base_time,
+        'nx': nx,
+        'ny': ny,
+        'pageNo': '1'
+    }
+    url = ultra_ncst_url if kind == 'ncst' else ultra_fcst_url
+    try:
+        response = get_session().get(url, params=params, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        return data['response']['body']['items']['item']
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as err:
+        print(f"초단기 API 요청 오류: {err}")
         return None
 
 
-def find_forecast_value(items, category, fcst_time=None):
-    """예보 항목에서 특정 카테고리 값을 찾음"""
-    for item in items:
-        if item['category'] == category:
-            if fcst_time is None or item['fcstTime'] == fcst_time:
-                return item['fcstValue']
+def get_ultra_items(kind, current_time_kst, nx=NX, ny=NY):
+    """
+    가장 최근 초단기실황/예보 items (같은 발표는 캐시 재사용, 최신 발표가 없으면 한 시간 전 발표)
+    Args:
+        kind: 'ncst' 또는 'fcst'
+        current_time_kst: 기준 시각 (arrow, KST)
+        nx, ny: 격자 좌표
+    Returns:
+        items (실패시 None)
+    """
+    for hours_ago in (0, 1):
+        base_date, base_time = get_ultra_base_time(current_time_kst.shift(hours=-hours_ago), kind)
+        key = f"{kind}_{base_date}_{base_time}_{nx}_{ny}"
+        items = ultra_cache.get(key)
+        if items is None:
+            items = fetch_ultra_items(kind, base_date, base_time, nx, ny)
+            if items:
+                ultra_cache.put(key, items)
+        if items:
+            return items
     return None
 
 
-def get_today_weather():
-    # 현재 날짜 (KST 기준)
-    current_time_kst = arrow.now('Asia/Seoul')
+def get_nowcast(current_time_kst, nx=NX, ny=NY):
+    """
+    초단기실황/예보를 동시에 조회
+    Args:
+        current_time_kst: 기준 시각 (arrow, KST)
+        nx, ny: 격자 좌표
+    Returns:
+        {"ncst": items, "ultra_fcst": items}
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ncst_future = executor.submit(contextvars.copy_context().run,
+                                      get_ultra_items, 'ncst', current_time_kst, nx, ny)
+        fcst_future = executor.submit(contextvars.copy_context().run,
+                                      get_ultra_items, 'fcst', current_time_kst, nx, ny)
+        return {"ncst": ncst_future.result(), "ultra_fcst": fcst_future.result()}
+
+
+def parse_nowcast(items):
+    """
+    초단기실황 items를 항목별 값으로 변환
+    Args:
+        items: 초단기실황 items
+    Returns:
+        {category: 값} (items가 없으면 None)
+    """
+    if not items:
+        return None
+    return {item['category']: _parse_value(item['category'], item['obsrValue']) for item in items}
+
+
+def ultra_to_village_items(items):
+    """
+    초단기예보 items를 단기예보 항목 이름으로 변환 (ForecastTable.add로 합치기 위함)
+    Args:
+        items: 초단기예보 items
+    Returns:
+        단기예보 형식 items (대응하는 항목이 없는 LGT 등은 제외)
+    """
+    return [dict(item, category=ULTRA_TO_VILLAGE[item['category']])
+            for item in items or [] if item['category'] in ULTRA_TO_VILLAGE]
+
+
+def find_rain_onset(ncst_items, ultra_fcst_items, current_time_kst, within_minutes=RAIN_ALERT_WINDOW_MINUTES):
+    """
+    지금은 비/눈이 오지 않고 within_minutes 안에 시작될 예정인지 확인
+    Args:
+        ncst_items: 초단기실황 items
+        ultra_fcst_items: 초단기예보 items
+        current_time_kst: 기준 시각 (arrow, KST)
+        within_minutes: 확인 범위 (분)
+    Returns:
+        {"time": 시작 시각(arrow), "minutes": 남은 분, "pty": 강수 형태, "rn1": 1시간 강수량} (없으면 None)
+    """
+    current = parse_nowcast(ncst_items)
+    if current and current.get('PTY'):
+        return None  # 이미 오는 중
+
+    table = ForecastTable(ultra_fcst_items or [])
+    limit = current_time_kst.shift(minutes=within_minutes)
+    for (fcst_date, category), times in sorted(table.cells.items()):
+        if category != 'PTY':
+            continue
+        for fcst_time, pty in sorted(times.items()):
+            onset = arrow.get(fcst_date + fcst_time, "YYYYMMDDHHmm", tzinfo='Asia/Seoul')
+            if pty and current_time_kst < onset <= limit:
+                return {
+                    "time": onset,
+                    "minutes": int((onset - current_time_kst).total_seconds() // 60),
+                    "pty": STATUS_OF_PRECIPITATION.get(pty, str(pty)),
+                    "rn1": table.get('RN1', fcst_date, fcst_time),
+                }
+    return None
+
 
+@traced()
+def check_rain_onset(location=None, within_minutes=RAIN_ALERT_WINDOW_MINUTES):
+    """
+    곧 비/눈이 시작되는지 확인 (초단기실황/예보만 조회, 단기예보는 조회하지 않음)
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: 양재1동)
+        within_minutes: 확인 범위 (분)
+    Returns:
+        find_rain_onset 결과
+    """
+    nx, ny = get_grid(location)
+    current_time_kst = arrow.now('Asia/Seoul')
+    nowcast = get_nowcast(current_time_kst, nx, ny)
+    return find_rain_onset(nowcast["ncst"], nowcast["ultra_fcst"], current_time_kst, within_minutes)
+
+
+def _get_issues(base_date, base_times, nx, ny):
+    """
+    같은 날 여러 발표의 예보 items (캐시에 없는 발표는 동시에 요청)
+    Args:
+        base_date: 발표 날짜
+        base_times: 발표 시각 리스트 (중복 가능)
+        nx, ny: 격자 좌표
+    Returns:
+        base_times 순서대로 items 리스트
+    """
+    unique = list(dict.fromkeys(base_times))
+    cached = {bt: forecast_cache.get(f"{base_date}_{bt}_{nx}_{ny}") for bt in unique}
+    missing = [bt for bt in unique if cached[bt] is None]
+    if len(missing) == 1:
+        cached[missing[0]] = get_forecast_items(base_date, missing[0], nx, ny)
+    elif missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            futures = {bt: executor.submit(contextvars.copy_context().run,
+                                           get_forecast_items, base_date, bt, nx, ny)
+                       for bt in missing}
+            for bt, future in futures.items():
+                cached[bt] = future.result()
+    return [cached[bt] for bt in base_times]
+
+
+def _get_cell_forecast(nx, ny, current_time_kst, nowcast=True):
+    """
+    격자 하나의 최신 발표 + 0200 발표 items (+ 초단기실황/예보)
+    Args:
+        nx, ny: 격자 좌표
+        current_time_kst: 기준 시각 (arrow, KST)
+        nowcast: 초단기실황/예보도 조회할지 여부
+    Returns:
+        {"base_date", "base_time", "nx", "ny", "latest": items, "0200": items,
+         "ncst": items, "ultra_fcst": items}
+    """
+    if not nowcast:
+        return _get_village_forecast(nx, ny, current_time_kst)
+
+    # 초단기실황/예보 요청은 바로 pool에 넣고, 단기예보는 이 스레드에서 동시에 조회
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ncst_future = executor.submit(contextvars.copy_context().run,
+                                      get_ultra_items, 'ncst', current_time_kst, nx, ny)
+        fcst_future = executor.submit(contextvars.copy_context().run,
+                                      get_ultra_items, 'fcst', current_time_kst, nx, ny)
+        forecast = _get_village_forecast(nx, ny, current_time_kst)
+        forecast.update({"ncst": ncst_future.result(), "ultra_fcst": fcst_future.result()})
+    return forecast
+
+
+def _get_village_forecast(nx, ny, current_time_kst):
+    """격자 하나의 최신 발표 + 0200 발표 items"""
     # 가장 최근 발표 시각 계산
     base_date, base_time = get_latest_base_time(current_time_kst)
 
-    # 날씨 데이터 가져오기
-    items = fetch_weather_data(base_date, base_time)
+    # 날씨 데이터 가져오기 (캐시에 없는 발표만 요청)
+    # TMN은 0200 발표에만 포함되므로, 0200 데이터를 최신 발표와 동시에 미리 요청 (하루 동안 캐시 재사용)
+    items, items_0200 = _get_issues(base_date, [base_time, '0200'], nx, ny)
+    if base_time == '0200':
+        items_0200 = None
 
+    # 최신 발표가 아직 반영되지 않았으면 직전 발표 사용
     if items is None:
+        base_date, base_time = get_previous_base_time(base_date, base_time)
+        print(f"최신 예보 조회 실패, 직전 발표({base_date} {base_time}) 사용")
+        items = get_forecast_items(base_date, base_time, nx, ny)
+
+    return {"base_date": base_date, "base_time": base_time, "nx": nx, "ny": ny,
+            "latest": items, "0200": items_0200}
+
+
+@traced()
+def get_today_weather(location=None, outlook_days=0):
+    """
+    오늘 날씨 요약
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: 양재1동)
+        outlook_days: 내일부터 며칠 전망을 추가할지 (0이면 생략)
+    Returns:
+        날씨 문자열
+    """
+    nx, ny = get_grid(location)
+
+    # 현재 날짜 (KST 기준)
+    current_time_kst = arrow.now('Asia/Seoul')
+
+    forecast = _get_cell_forecast(nx, ny, current_time_kst)
+    snapshot.record("kma_items", forecast)
+    return summarize_forecast(forecast, current_time_kst.format("YYYYMMDD"), outlook_days)
+
+
+def get_forecast_table(location=None):
+    """
+    최신 발표의 전체 기간(오늘~3일 후) 예보 표
+    Args:
+        location: 행정구역 이름, (위도, 경도), location dict (기본값: 양재1동)
+    Returns:
+        ForecastTable (조회 실패시 None)
+    """
+    nx, ny = get_grid(location)
+    forecast = _get_cell_forecast(nx, ny, arrow.now('Asia/Seoul'), nowcast=False)
+    return build_forecast_table(forecast["latest"], forecast["0200"])
+
+
+@traced()
+def get_weather_for_locations(locations, max_workers=MAX_GRID_WORKERS):
+    """
+    여러 위치의 오늘 날씨 요약 (같은 격자에 속한 위치는 한번만 조회)
+    - 격자별 조회는 max_workers개씩 동시에 실행 (격자 안의 발표/페이지 요청까지 합친 기상청 동시 요청 수는
+      공유 세션의 커넥션 풀 크기 clients.POOL_MAXSIZE로 제한)
+    - 위치 이름을 찾지 못하거나 격자 조회에 실패하면 그 위치만 실패 문구
+    Args:
+        locations: 위치 리스트 (행정구역 이름, (위도, 경도), location dict)
+        max_workers: 동시에 조회할 격자 수
+    Returns:
+        locations 순서대로 날씨 문자열 리스트
+    """
+    grids = []
+    for location in locations:
+        try:
+            grids.append(get_grid(location))
+        except Exception as e:
+            print(f"위치 {location} 격자 변환 실패: {e}")
+            grids.append(None)
+    cells = list(dict.fromkeys(grid for grid in grids if grid is not None))
+    current_time_kst = arrow.now('Asia/Seoul')
+    fcst_date = current_time_kst.format("YYYYMMDD")
+
+    summaries = {}
+    forecasts = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cells)))) as executor:
+        futures = {cell: executor.submit(contextvars.copy_context().run,
+                                         _get_cell_forecast, cell[0], cell[1], current_time_kst)
+                   for cell in cells}
+        for cell, future in futures.items():
+            try:
+                forecast = future.result()
+            except Exception as e:
+                print(f"격자 {cell} 날씨 조회 실패: {e}")
+                summaries[cell] = "날씨 정보를 가져오지 못했습니다. 😢"
+                continue
+            forecasts[f"{cell[0]},{cell[1]}"] = forecast
+            summaries[cell] = summarize_forecast(forecast, fcst_date)
+
+    snapshot.record("kma_cells", forecasts)
+    return [summaries.get(grid, "날씨 정보를 가져오지 못했습니다. 😢") for grid in grids]
+
+
+def summarize_forecast(forecast, fcst_date=None, outlook_days=0):
+    """
+    _get_cell_forecast 결과를 브리핑용 날씨 문자열로 변환
+    - 단기예보 표에 초단기예보(6시간)를 덮어써서 가까운 시간대는 최신 예보 사용
+    - 초단기실황이 있으면 현재 기온 표시
+    - outlook_days가 있으면 다음 날부터 며칠 전망을 한 줄 추가
+    Args:
+        forecast: _get_cell_forecast 결과 (스냅샷에 기록된 kma_items)
+        fcst_date: 요약할 날짜 (YYYYMMDD)
+        outlook_days: 전망 일수 (0이면 생략)
+    Returns:
+        날씨 문자열
+    """
+    table = build_forecast_table(forecast["latest"], forecast.get("0200"))
+    if table is not None and forecast.get("ultra_fcst"):
+        table.add(ultra_to_village_items(forecast["ultra_fcst"]))
+    if not table:
+        return format_weather(table)
+
+    # numpy는 예보 요약 단계에서만 로드 (시작 시간에 포함하지 않음)
+    from util.weather_series import WeatherSeries, format_outlook
+
+    series = WeatherSeries(table)
+    weather_msg = format_weather(table, fcst_date, parse_nowcast(forecast.get("ncst")), series)
+
+    if outlook_days:
+        start = arrow.get(fcst_date or table.dates[0], "YYYYMMDD").shift(days=1).format("YYYYMMDD")
+        outlook = format_outlook(series.outlook(outlook_days, start))
+        if outlook:
+            weather_msg += f"\n{outlook}"
+    return weather_msg
+
+
+def format_weather(table, fcst_date=None, current=None, series=None):
+    """
+    예보 표를 브리핑용 날씨 문자열로 변환
+    Args:
+        table: ForecastTable (최신 발표 + 0200 발표로 TMN 보충)
+        fcst_date: 요약할 날짜 (YYYYMMDD, 기본값: 예보의 첫 날짜, 표에 없는 날짜면 시간대별 예보 생략)
+        current: 초단기실황 값 (parse_nowcast 결과, 있으면 현재 기온 표시)
+        series: table로 만든 WeatherSeries (없으면 생성)
+    Returns:
+        날씨 문자열
+    """
+    if not table:
         return "날씨 정보를 가져오지 못했습니다. 😢"
+    if fcst_date is None:
+        fcst_date = table.dates[0]
+    elif fcst_date not in table.dates:
+        # 다른 날짜의 예보를 오늘 예보처럼 보여주지 않도록 기온/시간대별 예보 생략
+        print(f"WARNING: {fcst_date} 예보가 없어 시간대별 예보를 생략합니다 (예보 날짜: {', '.join(table.dates)})")
 
     # 최저/최고 기온
-    lowest_temp = find_forecast_value(items, 'TMN')
-    highest_temp = find_forecast_value(items, 'TMX')
+    lowest_temp = table.get('TMN', fcst_date)
+    highest_temp = table.get('TMX', fcst_date)
+
+    from util.weather_series import WeatherSeries, sky_label
 
-    # TMN은 0200 발표에만 포함되므로, 없으면 0200 데이터에서 가져오기
-    if lowest_temp is None and base_time != '0200':
-        items_0200 = fetch_weather_data(base_date, '0200')
-        if items_0200:
-            lowest_temp = find_forecast_value(items_0200, 'TMN')
+    if series is None:
+        series = WeatherSeries(table)
+
+    # 시각별 하늘 상태 구간 (비/눈이면 강수 형태, 아니면 SKY)
+    runs = [(start.item().strftime('%H%M'), end.item().strftime('%H%M'), code)
+            for start, end, code in series.sky_runs(fcst_date)]
 
     # 시간대별 예보: 오전(09), 낮(12), 오후(15), 저녁(18)
     SLOTS = [('0900', '오전'), ('1200', '낮'), ('1500', '오후'), ('1800', '저녁')]
     slot_parts = []
-    prev_sky_key = None
+    prev_run = None
     for fcst_time, label in SLOTS:
-        sky = find_forecast_value(items, 'SKY', fcst_time)
-        pty = find_forecast_value(items, 'PTY', fcst_time)
-        tmp = find_forecast_value(items, 'TMP', fcst_time)
-        pop = find_forecast_value(items, 'POP', fcst_time)
-        if sky is None:
+        run = next((i for i, (start, end, _) in enumerate(runs) if start <= fcst_time <= end), None)
+        if run is None or table.get('SKY', fcst_date, fcst_time) is None:
             continue
-
-        sky_key = pty if pty and pty != '0' else sky
-        sky_str = STATUS_OF_PRECIPITATION.get(pty, '') if pty and pty != '0' else STATUS_OF_SKY.get(sky, sky)
-
-        parts = [f"{label} {sky_str} {tmp}°C"]
-        if pop and int(pop) >= 20:
+        tmp = table.get('TMP', fcst_date, fcst_time)
+        pop = table.get('POP', fcst_date, fcst_time)
+
+        # 이전 시간대부터 하늘 상태가 이어지면 기온만 표시 (TMP가 없으면 기온 생략)
+        parts = [label] if run == prev_run else [label, sky_label(runs[run][2])]
+        if tmp is not None:
+            parts.append(f"{tmp:g}°C")
+        if pop is not None and pop >= 20:
             parts.append(f"강수{pop}%")
-        slot_str = ' '.join(parts)
-
-        # 하늘상태가 이전 슬롯과 같으면 기온만 표시
-        if sky_key == prev_sky_key:
-            slot_str = f"{label} {tmp}°C"
-            if pop and int(pop) >= 20:
-                slot_str += f" 강수{pop}%"
-
-        slot_parts.append(slot_str)
-        prev_sky_key = sky_key
+        if len(parts) > 1:
+            slot_parts.append(' '.join(parts))
+        prev_run = run
 
     temp_range = ""
-    if lowest_temp and highest_temp:
-        temp_range = f"🌡 {lowest_temp}°C → {highest_temp}°C"
-    elif highest_temp:
-        temp_range = f"🌡 최고 {highest_temp}°C"
+    if lowest_temp is not None and highest_temp is not None:
+        temp_range = f"🌡 {lowest_temp:g}°C → {highest_temp:g}°C"
+    elif highest_temp is not None:
+        temp_range = f"🌡 최고 {highest_temp:g}°C"
+
+    if current and current.get('T1H') is not None:
+        now_parts = [f"현재 {current['T1H']:g}°C"]
+        pty_str = STATUS_OF_PRECIPITATION.get(current.get('PTY'))
+        if current.get('PTY') and pty_str:
+            now_parts.append(pty_str)
+        now_str = ', '.join(now_parts)
+        temp_range = f"{temp_range} ({now_str})" if temp_range else f"🌡 {now_str}"
 
     forecast_line = " / ".join(slot_parts)
 
@@ -174,8 +772,13 @@ def get_today_weather():
 
 
 def main():
-    msg = get_today_weather()
-    print(msg)
+    # 사용법: python -m util.weather ["행정구역 이름" ...]
+    locations = sys.argv[1:]
+    if len(locations) <= 1:
+        print(get_today_weather(locations[0] if locations else None, outlook_days=3))
+        return
+    for location, msg in zip(locations, get_weather_for_locations(locations)):
+        print(f"[{location}]\n{msg}\n")
 
 if __name__ == "__main__":
     main()
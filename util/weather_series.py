@@ -0,0 +1,199 @@
+"""
+기상청 예보 열(column) 단위 시계열
+- ForecastTable을 예보 시각 축 하나와 항목별 NumPy 배열로 변환 (값이 없는 칸은 NaN)
+- 일별 최저/최고 기온, 강수확률 최고치, 하늘 상태 구간(run-length), 며칠 치 전망을 배열 연산으로 계산
+- numpy는 import 비용이 커서 이 모듈은 날씨를 요약할 때만 import (util.weather에서 지연 import)
+
+사용법:
+    series = WeatherSeries(get_forecast_table())
+    series.daily_extremes()        # 날짜별 (최저, 최고)
+    series.outlook(days=3)         # 내일부터 3일 전망
+"""
+
+import numpy as np
+
+from util.weather import CATEGORY_TYPES, STATUS_OF_PRECIPITATION, STATUS_OF_SKY
+
+WEEKDAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+
+# 하늘 상태 구간을 나눌 때 강수 형태 코드에 더하는 값 (SKY 코드 1~4와 겹치지 않도록)
+PTY_CODE_OFFSET = 10
+
+
+class WeatherSeries:
+    """예보 시각 축과 항목별 float 배열"""
+
+    def __init__(self, table):
+        """
+        초기화
+        Args:
+            table: util.weather.ForecastTable
+        """
+        slots = sorted({(date, time) for (date, _), times in table.cells.items() for time in times})
+        position = {slot: i for i, slot in enumerate(slots)}
+
+        self.times = np.array([f"{d[:4]}-{d[4:6]}-{d[6:]}T{t[:2]}:{t[2:]}" for d, t in slots],
+                              dtype='datetime64[m]')
+        self.days = self.times.astype('datetime64[D]')
+        self.columns = {}
+        for (date, category), times in table.cells.items():
+            if category not in CATEGORY_TYPES:
+                continue
+            column = self.columns.get(category)
+            if column is None:
+                column = self.columns[category] = np.full(len(slots), np.nan)
+            for time, value in times.items():
+                if isinstance(value, (int, float)):
+                    column[position[(date, time)]] = value
+
+        # 날짜별 구간 (times가 정렬되어 있으므로 날짜도 정렬됨)
+        self.dates, self.day_starts, self.day_index = np.unique(self.days, return_index=True,
+                                                                return_inverse=True)
+
+    def __len__(self):
+        return len(self.times)
+
+    def column(self, category):
+        """항목 배열 (없는 항목은 전부 NaN)"""
+        return self.columns.get(category, np.full(len(self), np.nan))
+
+    def _daily_reduce(self, values, func, fill):
+        """날짜별 reduce (NaN은 fill로 바꿔서 무시, 값이 하나도 없는 날은 NaN)"""
+        present = np.add.reduceat(~np.isnan(values), self.day_starts) > 0
+        reduced = func.reduceat(np.where(np.isnan(values), fill, values), self.day_starts)
+        return np.where(present, reduced, np.nan)
+
+    def daily_extremes(self):
+        """
+        날짜별 최저/최고 기온 (예보된 TMN/TMX 우선, 없으면 1시간 기온 TMP의 최저/최고)
+        Returns:
+            (dates, 최저 배열, 최고 배열)
+        """
+        tmp = self.column('TMP')
+        low = self._daily_reduce(self.column('TMN'), np.minimum, np.inf)
+        high = self._daily_reduce(self.column('TMX'), np.maximum, -np.inf)
+        low = np.where(np.isnan(low), self._daily_reduce(tmp, np.minimum, np.inf), low)
+        high = np.where(np.isnan(high), self._daily_reduce(tmp, np.maximum, -np.inf), high)
+        return self.dates, low, high
+
+    def pop_peaks(self):
+        """
+        날짜별 강수확률 최고치와 그 시각
+        Returns:
+            (dates, 최고 강수확률 배열, 최고치 시각 배열 (datetime64, 값이 없으면 NaT))
+        """
+        pop = self.column('POP')
+        peaks = self._daily_reduce(pop, np.maximum, -np.inf)
+        # 날짜별로 최고치와 같은 첫 시각
+        is_peak = pop == peaks[self.day_index]
+        peak_days, first = np.unique(self.day_index[is_peak], return_index=True)
+        peak_times = np.full(len(self.dates), np.datetime64('NaT'), dtype='datetime64[m]')
+        peak_times[peak_days] = self.times[is_peak][first]
+        return self.dates, peaks, peak_times
+
+    def sky_codes(self):
+        """시각별 하늘 상태 코드 (비/눈이 오면 PTY_CODE_OFFSET + 강수 형태, 아니면 SKY, 없으면 0)"""
+        sky = np.nan_to_num(self.column('SKY'), nan=0)
+        pty = np.nan_to_num(self.column('PTY'), nan=0)
+        return np.where(pty > 0, PTY_CODE_OFFSET + pty, sky).astype(int)
+
+    def sky_runs(self, date=None):
+        """
+        하늘 상태가 같은 연속 구간 (run-length)
+        Args:
+            date: 'YYYYMMDD' 또는 datetime64 날짜 (기본값: 전체 기간)
+        Returns:
+            [(시작 시각, 끝 시각, 코드), ...] (코드는 sky_codes와 같은 규칙)
+        """
+        codes = self.sky_codes()
+        times = self.times
+        if date is not None:
+            mask = self.days == _to_day(date)
+            codes, times = codes[mask], times[mask]
+        if len(codes) == 0:
+            return []
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+        ends = np.concatenate((starts[1:], [len(codes)])) - 1
+        return list(zip(times[starts], times[ends], codes[starts].tolist()))
+
+    def dominant_sky(self):
+        """
+        날짜별 가장 오래 지속된 하늘 상태 코드 (비/눈이 있으면 비/눈 우선)
+        Returns:
+            (dates, 코드 배열)
+        """
+        codes = self.sky_codes()
+        size = PTY_CODE_OFFSET + 10
+        counts = np.bincount(self.day_index * size + codes,
+                             minlength=len(self.dates) * size).reshape(len(self.dates), size)
+        counts[:, 0] = 0  # 값 없음
+        rain = counts[:, PTY_CODE_OFFSET + 1:]
+        has_rain = rain.sum(axis=1) > 0
+        rain_code = PTY_CODE_OFFSET + 1 + rain.argmax(axis=1)
+        return self.dates, np.where(has_rain, rain_code, counts.argmax(axis=1))
+
+    def outlook(self, days=3, start=None):
+        """
+        날짜별 전망
+        Args:
+            days: 날짜 수
+            start: 시작 날짜 ('YYYYMMDD' 또는 datetime64, 기본값: 예보 첫 날짜의 다음 날)
+        Returns:
+            [{"date": 'YYYYMMDD', "weekday": '화', "low", "high", "pop", "pop_time": 'HHMM', "sky": 코드}, ...]
+            (예보가 없는 날짜는 제외)
+        """
+        if len(self.dates) == 0:
+            return []
+        start = _to_day(start) if start is not None else self.dates[0] + 1
+        _, low, high = self.daily_extremes()
+        _, pops, pop_times = self.pop_peaks()
+        _, skies = self.dominant_sky()
+
+        selected = np.flatnonzero((self.dates >= start) & (self.dates < start + days))
+        rows = []
+        for i in selected.tolist():
+            date = self.dates[i].item()
+            rows.append({
+                "date": date.strftime("%Y%m%d"),
+                "weekday": WEEKDAY_NAMES[date.weekday()],
+                "low": None if np.isnan(low[i]) else float(low[i]),
+                "high": None if np.isnan(high[i]) else float(high[i]),
+                "pop": None if np.isnan(pops[i]) else int(pops[i]),
+                "pop_time": None if np.isnat(pop_times[i]) else pop_times[i].item().strftime("%H%M"),
+                "sky": int(skies[i]),
+            })
+        return rows
+
+
+def _to_day(date):
+    """'YYYYMMDD' 문자열이나 datetime64를 datetime64[D]로 변환"""
+    if isinstance(date, str):
+        return np.datetime64(f"{date[:4]}-{date[4:6]}-{date[6:]}", 'D')
+    return np.datetime64(date, 'D')
+
+
+def sky_label(code):
+    """sky_codes 코드를 표시 문자열로 변환"""
+    if code > PTY_CODE_OFFSET:
+        return STATUS_OF_PRECIPITATION.get(code - PTY_CODE_OFFSET, '')
+    return STATUS_OF_SKY.get(code, '')
+
+
+def format_outlook(rows):
+    """
+    전망을 한 줄 문자열로 변환
+    Args:
+        rows: WeatherSeries.outlook 결과
+    Returns:
+        "📅 화 12~20°C 맑음 ☀️ / 수 11~18°C 비 🌧️ 60%" (전망이 없으면 빈 문자열)
+    """
+    parts = []
+    for row in rows:
+        part = row["weekday"]
+        if row["low"] is not None and row["high"] is not None:
+            part += f" {row['low']:g}~{row['high']:g}°C"
+        part += f" {sky_label(row['sky'])}"
+        if row["pop"] is not None and row["pop"] >= 20:
+            part += f" {row['pop']}%"
+        parts.append(part)
+    return f"📅 {' / '.join(parts)}" if parts else ""